@@ -1,3 +1,6 @@
+from story_bundle import open_bundle
+
+
 class StoryImages:
     """Class to handle story mode images"""
     def __init__(self):
@@ -39,6 +42,8 @@ class StoryImages:
             }
         ]
         self.current_level = 0
+        # Prebuilt decoded/analyzed levels (python story_bundle.py); None falls back to the image files
+        self.bundle = open_bundle(self.story_levels)
 
     def get_current_level(self):
         """Get the current story level"""
@@ -51,4 +56,20 @@ class StoryImages:
 
     def reset_levels(self):
         """Reset to first level"""
-        self.current_level = 0
\ No newline at end of file
+        self.current_level = 0
+
+    def get_level_assets(self):
+        """Bundled layers for the current level, or None without a bundle.
+
+        Returns a dict with the resized "image", its "complexity" map and "blurred"
+        copies keyed by blur level, all served from the memory-mapped bundle.
+        """
+        if self.bundle is None:
+            return None
+        index = self.current_level
+        blur_levels = [int(name[5:]) for name in self.bundle.levels[index]["layers"] if name.startswith("blur_")]
+        return {
+            "image": self.bundle.image(index),
+            "complexity": self.bundle.complexity(index),
+            "blurred": {level: self.bundle.blurred(index, level) for level in blur_levels},
+        }
\ No newline at end of file
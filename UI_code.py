@@ -1,11 +1,33 @@
+import logging
+import time
 import pygame
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk, ImageFilter, ImageDraw
-from game_functions import GameLogic
+from game_functions import POWERUP_COSTS, GameLogic, round_seconds
+from game_log import configure as configure_logging, get_logger
+from image_analysis import analyze_image
+from image_scan import ImageCache
+from perf_hud import PerfHud
+from puzzle_queue import GENERATED, PuzzleQueue, describe as describe_queue
 from StoryImages_Class import StoryImages
+from canvas_overlay import CanvasOverlay
+from rendering import TkBackend, preview_image, reblur_regions, reveal_renderer, reveal_settings
+from scheduler import Scheduler
+from search_trail import SearchTrail
+from screen_manager import ScreenManager
+from score_store import ScoreStore
 pygame.mixer.init()
 
+log = get_logger("ui")
+
+# Endless time attack: one clock for the whole run, puzzles prepared ahead in a queue
+TIME_ATTACK_SECONDS = 180
+TIME_ATTACK_NEXT_MS = 500  # Long enough to see the last find highlighted
+TIME_ATTACK_QUEUE = 3
+TIME_ATTACK_PRODUCERS = 1  # Producers share the GIL with Tk; one keeps well ahead of a player
+
 class GameUI:
     def __init__(self, window):
         self.sound_on = True 
@@ -26,16 +48,35 @@ class GameUI:
         self.current_story_difficulty = "Easy"
         self.points = 0
         self.shop_visible = False
+        self.recorder = None  # Optional InputRecorder capturing canvas input
+        self.puzzle_seed = None  # Seed for the next round; None picks a fresh one
+        self.attack = None  # PuzzleQueue feeding a running time attack
+        self.attack_sources = None  # Sources of the last time attack, for Replay
+        self.attack_cleared = 0
+        self.attack_played = 0
+        
+        # Rounds, points, story progress and purchases persist between sessions
+        self.scores = ScoreStore()
+        self.points = self.scores.points
+        self.resume_story_progress()
+        
+        # Every timed task (round clock, fades, message clears, story transitions) runs here
+        self.scheduler = Scheduler(self.window)
         
         # Timer variables
         self.timer_running = False
-        self.time_left = 0
-        self.timer_id = None
+        self.round_clock = None  # Countdown for the current round
+        self._time_left = 0
         self.paused = False
+        self.message_clear = None  # Pending clear of the top-left message
         
         # Blur variables
         self.original_image = None
         self.blurred_image = None
+        self.trail = None  # SearchTrail for the current round
+        self.reveal_style = "hard"  # "hard" or "feathered", see rendering.REVEAL_STYLES
+        self.reveal = reveal_renderer(self.reveal_style)
+        self.local_camouflage = False  # Per-pixel camouflage on Easy/Medium/Hard, see GameLogic.local_camouflage
         self.current_display_image = None
         self.clear_radius = 100  # Radius of clear area
         self.blur_level = 5  # Blur intensity
@@ -64,9 +105,38 @@ class GameUI:
         except:
             self.frame.configure(bg="#ADD8E6")
             
+        # Frame presentation backend (PhotoImage for the Tk canvas)
+        self.renderer = TkBackend()
+        
+        # Puzzles are built off the Tk thread while a preview is on screen
+        self.round_builder = ThreadPoolExecutor(max_workers=1)
+        self.round_token = 0  # Bumped per round so a stale build is dropped
+        self.preparing = False
+        self.prepare_started = 0.0
+        self.blur_errors = 0  # Failed reveal redraws this round
+        self.level_assets = None  # Bundled story layers for the current round, if any
+        self.image_analysis = None  # (file, analyze_image result) for the uploaded image
+        self.image_cache = ImageCache()  # Results of image_scan.py; only touched on the round_builder thread
+        
+        # Pooled indicators/highlights shared by every round
+        self.overlay = CanvasOverlay(self.scheduler)
+
+        # Frame-time/latency overlay for the game canvas, F3 to toggle
+        self.hud = PerfHud(self.scheduler)
+        self.hud.extra_lines = self.attack_hud_lines
+        self.window.bind("<F3>", self.toggle_hud)
+        
         # Create game logic manager
         self.game_logic = GameLogic(self)
-        
+
+        # Screens are built once and then only shown/hidden
+        self.screens = ScreenManager(self.frame)
+        self.screens.register("start", self.build_start_screen, self.update_start_screen)
+        self.screens.register("story_intro", self.build_story_intro)
+        self.screens.register("level_intro", self.build_story_level_intro, self.update_story_level_intro)
+        self.screens.register("story_complete", self.build_story_complete, self.update_story_complete)
+        self.screens.register("game", self.build_game_screen, self.update_game_screen)
+
         # Start with the main menu
         self.make_start_screen()
 
@@ -84,8 +154,12 @@ class GameUI:
 
     def resize_image_proportionally(self, image, target_size):
         """Resize image to fit within target size while maintaining aspect ratio"""
+        return image.resize(self.proportional_size(image.size, target_size), Image.LANCZOS)
+
+    def proportional_size(self, size, target_size):
+        """Largest size with the same aspect ratio as size that fits within target_size"""
         target_width, target_height = target_size
-        original_width, original_height = image.size
+        original_width, original_height = size
         
         # Calculate the scaling factor to fit within the target size
         scale_width = target_width / original_width
@@ -96,19 +170,19 @@ class GameUI:
         new_width = int(original_width * scale_factor)
         new_height = int(original_height * scale_factor)
         
-        return image.resize((new_width, new_height), Image.LANCZOS)
+        return new_width, new_height
 
     def make_start_screen(self):
-        # Clear the frame
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    continue
-                
+        """Show the main menu, building it on first use"""
+        self.screens.show("start")
+
+    def update_start_screen(self):
+        self.feedback = self.start_feedback
+        self.feedback.config(text="")
+
+    def build_start_screen(self, screen):
         # Title frame 
-        title_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        title_frame = tk.Frame(screen, bg="#ADD8E6")
         title_frame.pack(pady=30)
         
         # Title
@@ -124,7 +198,7 @@ class GameUI:
         chameleon_icon.pack(pady=10)
 
         # Buttons frame
-        buttons_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        buttons_frame = tk.Frame(screen, bg="#ADD8E6")
         buttons_frame.pack(pady=15)
 
         # Story Mode button
@@ -141,10 +215,25 @@ class GameUI:
 
         story_btn.bind("<Enter>", lambda e: self.animate_button(story_btn, "#FF1493"))
         story_btn.bind("<Leave>", lambda e: self.animate_button(story_btn, "#FF69B4"))
+
+        # Time Attack button
+        attack_btn = tk.Button(
+            buttons_frame,
+            text="Time Attack",
+            command=self.start_time_attack,
+            bg="#FF8C00",  # Dark orange
+            fg="white",
+            font=("Arial", 18, "bold"),
+            relief="raised"
+        )
+        attack_btn.pack(side=tk.LEFT, padx=10, ipadx=20, ipady=10)
+
+        attack_btn.bind("<Enter>", lambda e: self.animate_button(attack_btn, "#FF4500"))
+        attack_btn.bind("<Leave>", lambda e: self.animate_button(attack_btn, "#FF8C00"))
         
         # Upload button
         upload_btn = tk.Button(
-            self.frame, 
+            screen, 
             text="Upload Image", 
             command=self.upload_pic,
             bg="#FFFF00",  
@@ -158,15 +247,15 @@ class GameUI:
         upload_btn.bind("<Leave>", lambda e: self.animate_button(upload_btn, "#FFFF00", shrink=True))
         
         # Difficulty label
-        diff_label = tk.Label(self.frame, text="Pick Difficulty:", font=("Arial", 16, "bold"), bg="#ADD8E6", fg="#800080")
+        diff_label = tk.Label(screen, text="Pick Difficulty:", font=("Arial", 16, "bold"), bg="#ADD8E6", fg="#800080")
         diff_label.pack(pady=10)
         
         # Difficulty options
-        diffs = ["Easy", "Medium", "Hard"]
-        diff_colors = {"Easy": "#DDA0DD", "Medium": "#BA55D3", "Hard": "#9932CC"}
+        diffs = ["Easy", "Medium", "Hard", "Mimic"]
+        diff_colors = {"Easy": "#DDA0DD", "Medium": "#BA55D3", "Hard": "#9932CC", "Mimic": "#4B0082"}
         for d in diffs:
             rb = tk.Radiobutton(
-                self.frame, 
+                screen, 
                 text=d, 
                 value=d, 
                 variable=self.difficulty, 
@@ -179,7 +268,7 @@ class GameUI:
             
         # Start button
         start_btn = tk.Button(
-            self.frame, 
+            screen, 
             text="Start Game", 
             command=self.start_game, 
             bg="#FFFF00", 
@@ -193,12 +282,12 @@ class GameUI:
         start_btn.bind("<Leave>", lambda e: self.animate_button(start_btn, "#FFFF00", shrink=True))
         
         # Create feedback label
-        self.feedback = tk.Label(self.frame, text="", font=("Arial", 16), bg="#ADD8E6", fg="#FF0000")
-        self.feedback.pack(pady=15)
+        self.start_feedback = tk.Label(screen, text="", font=("Arial", 16), bg="#ADD8E6", fg="#FF0000")
+        self.start_feedback.pack(pady=15)
         
         # Sound toggle button (top-right corner)
         self.sound_btn = tk.Button(
-        self.frame,
+        screen,
         text="🔊 Sound On",  # Initial label
         command=self.toggle_sound,
         bg="#32CD32",        # Green = sound on
@@ -211,6 +300,36 @@ class GameUI:
          )
         self.sound_btn.place(relx=0.99, rely=0.02, anchor="ne")  # Top-right corner
         
+        # Reveal style toggle, under the sound button
+        self.reveal_btn = tk.Button(
+        screen,
+        text=self.reveal_label(),
+        command=self.toggle_reveal_style,
+        bg="#9370DB",
+        fg="white",
+        font=("Arial", 14, "bold"),
+        relief="raised",
+        bd=3,
+        padx=10,
+        pady=5
+         )
+        self.reveal_btn.place(relx=0.99, rely=0.11, anchor="ne")
+
+        # Camouflage toggle, under the reveal button
+        self.camouflage_btn = tk.Button(
+        screen,
+        text=self.camouflage_label(),
+        command=self.toggle_camouflage,
+        bg="#2E8B57",
+        fg="white",
+        font=("Arial", 14, "bold"),
+        relief="raised",
+        bd=3,
+        padx=10,
+        pady=5
+         )
+        self.camouflage_btn.place(relx=0.99, rely=0.20, anchor="ne")
+        
     def toggle_shop_menu(self):
          """Toggle the visibility of the shop menu"""
          if self.shop_visible:
@@ -219,47 +338,47 @@ class GameUI:
              self.shop_visible = False
          else:
              self.shop_visible = True
-             self.shop_frame = tk.Frame(self.frame, bg="#ADD8E6", width=200)
+             self.shop_frame = tk.Frame(self.game_screen, bg="#ADD8E6", width=200)
              # Use place() for precise control
              self.shop_frame.place(x=0, y=0, relheight=1, width=200)
              self.shop_frame.lift()  # Bring to front
              tk.Label(self.shop_frame, text="Shop", font=("Arial", 14, "bold"), bg="#ADD8E6").pack(pady=5)
              tk.Label(self.shop_frame, text=f"Points: {self.points}", font=("Arial", 12), bg="#ADD8E6").pack(pady=5)
         
-             if self.points >= 20:
-                 buy_time_btn = tk.Button(self.shop_frame, text="Buy Add Time (20 pts)", 
-                                         command=lambda: self.buy_powerup("time"), 
-                                         bg="#32CD32", fg="black", font=("Arial", 10, "bold"))
-                 buy_time_btn.pack(pady=5)
-             else:
-                  tk.Label(self.shop_frame, text="Add Time (20 pts)\nInsufficient Points", 
-                        fg="red", bg="#ADD8E6").pack(pady=5)
-            
-             if self.points >= 15:
-                 buy_steps_btn = tk.Button(self.shop_frame, text="Buy Add Steps (15 pts)", 
-                                    command=lambda: self.buy_powerup("steps"), 
-                                    bg="#FF69B4", fg="black", font=("Arial", 10, "bold"))
-                 buy_steps_btn.pack(pady=5)
-             else:
-                 tk.Label(self.shop_frame, text="Add Steps (15 pts)\nInsufficient Points", 
-                        fg="red", bg="#ADD8E6").pack(pady=5)
+             for kind, name, color in (("time", "Add Time", "#32CD32"), ("steps", "Add Steps", "#FF69B4"),
+                                       ("scout", "Scout", "#DA70D6")):
+                 cost = POWERUP_COSTS[kind]
+                 if self.preparing:
+                     # Powerups are reset when the round starts, so a purchase now would be lost
+                     tk.Label(self.shop_frame, text=f"{name} ({cost} pts)\nWait for the round",
+                              fg="#800080", bg="#ADD8E6").pack(pady=5)
+                 elif self.points >= cost:
+                     tk.Button(self.shop_frame, text=f"Buy {name} ({cost} pts)",
+                               command=lambda kind=kind: self.buy_powerup(kind),
+                               bg=color, fg="black", font=("Arial", 10, "bold")).pack(pady=5)
+                 else:
+                     tk.Label(self.shop_frame, text=f"{name} ({cost} pts)\nInsufficient Points",
+                              fg="red", bg="#ADD8E6").pack(pady=5)
             
              tk.Button(self.shop_frame, text="Close", command=self.toggle_shop_menu, 
                      bg="#FFA500", fg="black", font=("Arial", 10)).pack(pady=5)
         
     def buy_powerup(self, powerup_type):
         """Handle powerup purchases"""
-        if powerup_type == "time" and self.points >= 20:
-             self.points -= 20
-             self.game_logic.add_time_uses += 1
-             self.show_message("Purchased Add Time!", True)
-        elif powerup_type == "steps" and self.points >= 15:
-            self.points -= 15
-            self.game_logic.add_steps_uses += 1
-            self.show_message("Purchased Add Steps!", True)
-        else:
+        cost = POWERUP_COSTS[powerup_type]
+        if self.preparing:
+           self.show_message("Wait for the round to start!", False)
+           return
+        if self.points < cost:
            self.show_message("Not enough points!", False)
            return
+        if self.recorder:
+            self.recorder.purchase(powerup_type)
+        self.points -= cost
+        self.game_logic.grant_powerup(powerup_type)
+        self.scores.record_purchase(powerup_type, cost)
+        names = {"time": "Add Time", "steps": "Add Steps", "scout": "Scout"}
+        self.show_message(f"Purchased {names[powerup_type]}!", True)
     
         self.update_points_display()
         self.update_powerup_buttons()
@@ -269,6 +388,8 @@ class GameUI:
         """Update the points display label"""
         if hasattr(self, 'points_display'):
            self.points_display.config(text=f"Points: {self.points}")
+        if not self.game_logic.story_mode:  # Story rounds zero the points on screen only
+            self.scores.save_points(self.points)
     
     
     def safe_update_widget(self, widget, **kwargs):
@@ -280,56 +401,19 @@ class GameUI:
                 pass
     
     def start_story_mode(self):
-        """Start the story mode"""
+        """Start the story mode at the first expedition not yet completed"""
         self.show_story_intro()
-        self.story_images.reset_levels()
+        self.resume_story_progress()
         self.show_story_level_intro()
 
-    def show_story_level_intro(self):
-        """Show introduction for current story level"""
-        level = self.story_images.get_current_level()
-
-        # Clear the frame
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    pass
-
-        # Create intro frame
-        intro_frame = tk.Frame(self.frame, bg="#ADD8E6", relief="raised", bd=3)
-        intro_frame.pack(expand=True, fill="both", padx=50, pady=50)
-
-        # Level title
-        title = tk.Label(intro_frame, text=f"Level {self.story_images.current_level + 1}: {level['name']}",
-                        font=("Arial", 24, "bold"), fg="#800080", bg="#ADD8E6")
-        title.pack(pady=20)
-
-        # Level description
-        desc = tk.Label(intro_frame, text=level['description'],
-                       font=("Arial", 16, "italic"), fg="#008000", bg="#ADD8E6")
-        desc.pack(pady=10)
-
-        # Difficulty display - show the level's difficulty, not the general setting
-        diff_text = f"Difficulty: {level['difficulty']}"
-        diff_label = tk.Label(intro_frame, text=diff_text,
-                             font=("Arial", 14, "bold"), fg="#FF6347", bg="#ADD8E6")
-        diff_label.pack(pady=10)
-
-        # Start level button
-        start_btn = tk.Button(intro_frame, text="Start Level",
-                             command=self.start_story_level,
-                             bg="#32CD32", fg="white",
-                             font=("Arial", 18, "bold"), relief="raised")
-        start_btn.pack(pady=20, ipadx=30, ipady=15)
-
-        # Back to menu button
-        back_btn = tk.Button(intro_frame, text="Back to Menu",
-                            command=self.make_start_screen,
-                            bg="#FF6347", fg="white",
-                            font=("Arial", 14, "bold"), relief="raised")
-        back_btn.pack(pady=10, ipadx=20, ipady=10)
+    def resume_story_progress(self):
+        """Pick up the story where the saved progress left it; a finished story starts over"""
+        completed = self.scores.story_levels_completed()
+        if completed < len(self.story_images.story_levels):
+            self.story_images.current_level = completed
+        else:
+            self.story_images.reset_levels()
+            self.scores.save_story_progress(0)  # A new playthrough, saved from its first win on
 
     def start_story_level(self):
         """Start the current story level"""
@@ -354,9 +438,13 @@ class GameUI:
         self.image_file = level['image_data']  # Set the image file path
 
         try:
-           # Try to open the story image file
-           self.original_image = Image.open(level['image_data'])
-           print(f"Successfully loaded {level['image_data']}")
+           # Use the prebuilt bundle when there is one; otherwise open the story image file
+           self.level_assets = self.story_images.get_level_assets()
+           if self.level_assets:
+               self.original_image = self.level_assets["image"]
+           else:
+               self.original_image = Image.open(level['image_data'])
+           log.debug("Loaded story level %s from %s", level['image_data'], "bundle" if self.level_assets else "file")
         
            # Create or reset game logic with the new image
            if not hasattr(self, 'game_logic') or self.game_logic is None:
@@ -369,7 +457,8 @@ class GameUI:
            self.start_game_with_image()
     
         except Exception as e:
-           print(f"Error loading image: {e}")
+           log.error("Error loading story image %s: %s", level['image_data'], e)
+           self.level_assets = None
            # Create a placeholder image if loading fails
            placeholder_color = level['placeholder_color']
            self.original_image = Image.new('RGB', (800, 600), placeholder_color)
@@ -385,85 +474,109 @@ class GameUI:
 
     def start_game_with_image(self):
         """Start game with the loaded image"""
-        # Clear the frame
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    continue
-        # Wait a moment to ensure all widgets are destroyed
-        self.window.update_idletasks()
-        # Create new canvas and feedback label
-        self.game_canvas = tk.Canvas(self.frame, bg="white", highlightthickness=2, highlightbackground="#00CED1")
-        self.game_canvas.pack(fill="both", expand=True)
-
-        # Add timer frame at the top
-        self.timer_frame = tk.Frame(self.frame, bg="#ADD8E6")
-        self.timer_frame.pack(before=self.game_canvas, pady=5)
-
-        # Add timer display
-        self.timer_display = tk.Label(self.timer_frame, text="Time: 0:00", font=("Arial", 18, "bold"), bg="#ADD8E6", fg="#FF5733")
-        self.timer_display.pack(padx=10)
+        # Reuse the cached game screen instead of rebuilding it
+        self.screens.show("game", story=self.game_logic.story_mode)
 
         # Set difficulty-specific blur settings
         self.set_blur_difficulty()
         self.initial_clear_radius = self.clear_radius
 
-        # Set time based on difficulty and start the timer automatically
+        # Set time based on difficulty; the timer starts once the puzzle is ready
         self.set_timer_difficulty()
-        self.start_timer()
-
-        self.feedback = tk.Label(self.frame, text="", font=("Arial", 16), bg="#ADD8E6", fg="#FF0000")
-        self.feedback.pack(pady=15)
 
-        # Process the image
         try:
             # Ensure we have an original image
             if not hasattr(self, 'original_image') or self.original_image is None:
                 raise ValueError("No original image loaded")
-        
-            # Resize image if needed
-            self.original_image.thumbnail((800, 600))
-
-            # Process the image in game logic FIRST - this sets up chameleons
-            self.game_logic.img_width, self.game_logic.img_height = self.original_image.size
-        
-            # Reset game state for new round - this will place chameleons
-            success = self.game_logic.reset_game()
-            if not success:
-                raise ValueError("Failed to reset game")
-
-            # Create blurred version - use the image WITH chameleons for story mode
-            if self.game_logic.story_mode:
-                # For story mode, blur the image WITH chameleons
-                self.blurred_image = self.game_logic.game_image_with_chameleons.filter(ImageFilter.GaussianBlur(self.blur_level))
-            else:
-                # For normal mode, keep original behavior (blur without chameleons)
-                self.blurred_image = self.original_image.filter(ImageFilter.GaussianBlur(self.blur_level))
-
-            # Set initial display as blurred
-            self.current_display_image = self.blurred_image.copy()
-            self.game_image = ImageTk.PhotoImage(self.current_display_image)
-            self.image_on_canvas = self.game_canvas.create_image(0, 0, image=self.game_image, anchor="nw")
-
-            # Feedback
-            if self.game_logic.story_mode:
-               level = self.story_images.get_current_level()
-               self.feedback.config(text=f"Find the chameleon in {level['name']}! Move mouse to reveal.", fg="#800080")
-            else:
-               self.feedback.config(text="Move your mouse to reveal parts of the image! Click to guess the chameleon location!", fg="#800080")
-
-            # Mouse event handlers
-            self.game_canvas.bind("<Motion>", self.update_blur)
-            self.game_canvas.bind("<Button-1>", self.game_logic.handle_click)
+            self.begin_round(self.original_image)
 
         except Exception as e:
-          print(f"Error in start_game_with_image: {e}")
+          log.error("Error in start_game_with_image: %s", e)
           messagebox.showerror("Error", f"Image didn't load: {e}")
           self.make_start_screen()
 
-        
+    def begin_round(self, source):
+        """Paint a cheap blurred preview of source, then build the puzzle on a worker thread"""
+        self.round_token += 1
+        self.preparing = True
+        self.prepare_started = time.perf_counter()
+        self.blur_errors = 0
+        self.overlay.clear()
+        
+        # Bundled story levels come pre-blurred and pre-analyzed
+        assets = self.level_assets if self.game_logic.story_mode else None
+        background_blur = assets["blurred"].get(self.blur_level) if assets else None
+        complexity = assets["complexity"] if assets else None
+        self.show_canvas_image(background_blur if background_blur is not None else preview_image(source))
+        self.feedback.config(text="Preparing the hunt...", fg="#800080")
+        self.update_powerup_buttons()
+
+        # Read everything from the UI here; the worker only touches the image and game logic
+        logic = self.game_logic
+        image, difficulty, seed = logic.round_request()
+        blur_level = self.blur_level
+        image_file = None if logic.story_mode else self.image_file
+        image_cache = self.image_cache
+
+        def build():
+            # Uploads scanned by image_scan.py come with their complexity map
+            complexity_map = complexity if image_file is None else image_cache.complexity_map(image_file)
+            composite = logic.prepare_round(image, difficulty, seed=seed, complexity_map=complexity_map)
+            if background_blur is not None:
+                return reblur_regions(background_blur, composite, logic.chameleon_positions, blur_level)
+            return composite.filter(ImageFilter.GaussianBlur(blur_level))
+
+        self.poll_round(self.round_builder.submit(build), self.round_token)
+
+    def poll_round(self, future, token):
+        if token != self.round_token:
+            return  # The player left or another round started meanwhile
+        if not future.done():
+            self.scheduler.call_later(15, self.poll_round, future, token, group="round")
+            return
+        self.preparing = False
+        prepare_ms = (time.perf_counter() - self.prepare_started) * 1000
+        if self.hud.enabled:
+            self.hud.record_prepare(prepare_ms)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Round prepared", extra={"fields": {"ms": round(prepare_ms, 2), "story": self.game_logic.story_mode}})
+        try:
+            self.blurred_image = future.result()
+        except Exception as e:
+            self.game_logic.last_error = str(e)
+            log.error("Error preparing round: %s", e)
+            messagebox.showerror("Error", f"Image didn't load: {e}")
+            self.make_start_screen()
+            return
+        self.finish_round()
+
+    def finish_round(self):
+        """Swap in the real puzzle, then start the clock and accept input"""
+        self.game_logic.present_round()
+        self.record_round()
+        self.original_image = self.game_logic.game_image_with_chameleons
+
+        # Set initial display as blurred, with a fresh search trail
+        self.trail = SearchTrail(self.blurred_image.size)
+        self.current_display_image = self.blurred_image.copy()
+        self.show_canvas_image(self.current_display_image)
+
+        # Feedback
+        if self.game_logic.story_mode:
+           level = self.story_images.get_current_level()
+           self.feedback.config(text=f"Find the chameleon in {level['name']}! Move mouse to reveal.", fg="#800080")
+        else:
+           self.feedback.config(text="Move your mouse to reveal parts of the image! Click to guess the chameleon location!", fg="#800080")
+
+        # Refresh powerup buttons for the new round
+        self.update_powerup_buttons()
+
+        # Mouse event handlers
+        self.game_canvas.bind("<Motion>", self.update_blur)
+        self.game_canvas.bind("<Button-1>", self.on_canvas_click)
+
+        # Start the timer
+        self.start_timer()
 
     def animate_button(self, button, color, shrink=False):
         """Animate button hover effect"""
@@ -476,13 +589,53 @@ class GameUI:
         file = filedialog.askopenfilename(filetypes=[("Image files", "*.png *.jpg *.jpeg")])
         if file:
             self.image_file = file
+            self.image_analysis = None
             if hasattr(self, 'feedback') and self.feedback and self.feedback.winfo_exists():
-                self.feedback.config(text="Image loaded! Ready to hunt!", fg="#008000")
+                self.feedback.config(text="Image loaded! Checking the hiding spots...", fg="#800080")
+            # Analyze a downscaled copy in the background so the dialog returns at once
+            self.poll_analysis(self.round_builder.submit(self.analyze_upload, file), file)
         else:
             if hasattr(self, 'feedback') and self.feedback and self.feedback.winfo_exists():
                 self.feedback.config(text="No image picked.", fg="#FF0000")
     
     
+    def analyze_upload(self, file):
+        """Runs on the round builder: the scanned result if image_scan.py cached one, else a fresh analysis"""
+        return self.image_cache.analysis(file) or analyze_image(file)
+
+    def poll_analysis(self, future, file):
+        """Report the upload pre-analysis once it finishes, unless another image was picked meanwhile"""
+        if file != self.image_file:
+            return
+        if not future.done():
+            self.scheduler.call_later(30, self.poll_analysis, future, file, widget=self.start_feedback)
+            return
+        try:
+            analysis = future.result()
+        except Exception as e:
+            log.warning("Could not analyze %s: %s", file, e)
+            self.image_file = None
+            self.safe_update_widget(self.start_feedback, text="That file isn't an image we can read.", fg="#FF0000")
+            return
+        self.image_analysis = (file, analysis)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Analyzed upload", extra={"fields": {"file": file, "suggested": analysis["suggested"],
+                                                           "texture": analysis["texture"], "ms": analysis["ms"]}})
+
+        suggested = analysis["suggested"]
+        chosen = self.difficulty.get()
+        warnings = " ".join(analysis["warnings"])
+        if suggested is None:
+            text, color = warnings, "#FF0000"
+        elif not analysis["difficulties"].get(chosen, {}).get("fits", True):
+            self.difficulty.set(suggested)  # The chosen difficulty would fail placement
+            text, color = f"Too small for {chosen}, switched to {suggested}. {warnings}", "#FF8C00"
+        elif warnings:
+            text, color = f"{warnings} Suggested difficulty: {suggested}.", "#FF8C00"
+        else:
+            text, color = f"Image loaded! Ready to hunt! Suggested difficulty: {suggested}.", "#008000"
+        self.safe_update_widget(self.start_feedback, text=text.strip(), fg=color)
+
     def start_game(self):
         
         # Clean up any existing widgets first
@@ -492,59 +645,32 @@ class GameUI:
           messagebox.showerror("Error", "Upload an image first!")
           return
         
-    # Clear the frame
-        for widget in self.frame.winfo_children():
-          if widget != getattr(self, "bg_label", None):
-            try:
-                widget.destroy()
-            except tk.TclError:
-                pass  # Widget already destroyed
-    
+    # Refuse difficulties the upload analysis showed cannot be placed
+        if self.image_analysis and self.image_analysis[0] == self.image_file and not self.game_logic.story_mode:
+            analysis = self.image_analysis[1]
+            chosen = self.difficulty.get()
+            if not analysis["difficulties"].get(chosen, {}).get("fits", True):
+                hint = f" Try {analysis['suggested']}." if analysis["suggested"] else ""
+                messagebox.showerror("Error", f"This image is too small for {chosen}.{hint}")
+                return
+        
     # Reset pause state
         self.paused = False
     
-    # Create new canvas
-        self.game_canvas = tk.Canvas(self.frame, bg="white", highlightthickness=2, highlightbackground="#00CED1")
-        self.game_canvas.pack(fill="both", expand=True)
-    
-    # Create control frames
-        self.timer_frame = tk.Frame(self.frame, bg="#ADD8E6")
-        self.timer_frame.pack(before=self.game_canvas, pady=5)
-    
-        self.powerup_frame = tk.Frame(self.frame, bg="#ADD8E6")
-        self.powerup_frame.pack(before=self.game_canvas, pady=5)
-    
-        self.button_frame = tk.Frame(self.frame, bg="#ADD8E6")
-        self.button_frame.pack(before=self.game_canvas, pady=5)
-    
-    # Add timer display
-        self.timer_display = tk.Label(self.timer_frame, text="Time: 0:00", font=("Arial", 18, "bold"), bg="#ADD8E6", fg="#FF5733")
-        self.timer_display.pack(padx=10)
-        
-        # Only add points and shop for normal mode
+    # Story levels show zero points; bring back the saved total
         if not self.game_logic.story_mode:
-            self.points_display = tk.Label(self.timer_frame, text=f"Points: {self.points}", 
-                                  font=("Arial", 14), bg="#ADD8E6", fg="#0000FF")
-            self.points_display.pack(padx=10)
-        
-            shop_btn = tk.Button(self.frame, text="$", command=self.toggle_shop_menu, 
-                        bg="#FFD700", fg="black", font=("Arial", 24, "bold"), 
-                        relief="raised", width=2, height=1)
-            shop_btn.place(x=750, y=10)
+            self.points = self.scores.points
+            self.level_assets = None
+    
+    # Reuse the cached game screen (canvas, timer, powerup and control buttons)
+        self.screens.show("game", story=self.game_logic.story_mode)
     
     # Set difficulty-specific blur settings
         self.set_blur_difficulty()
     
-    # Set time based on difficulty and start the timer automatically
+    # Set time based on difficulty; the timer starts once the puzzle is ready
         self.set_timer_difficulty()
     
-        self.feedback = tk.Label(self.frame, text="Move your mouse to reveal parts of the image! Click to guess the chameleon location!", fg="#800080", font=("Arial", 16), bg="#ADD8E6")
-        self.feedback.pack(pady=15)
-    
-    # Add top-left message label for powerup feedback
-        self.top_left_message = tk.Label(self.frame, text="", font=("Arial", 14, "bold"), bg="#ADD8E6", fg="#800080")
-        self.top_left_message.place(x=10, y=10)
-    
     # Load the image with standardized scaling
         try:
         # Load original image
@@ -553,62 +679,100 @@ class GameUI:
             # Determine the appropriate standardized size based on orientation
             target_size = self.get_standardized_size(raw_image)
             
-            # Resize the image proportionally to fit the standardized size
-            self.original_image = self.resize_image_proportionally(raw_image, target_size)
-            
-            # Update canvas size to match the image
-            img_width, img_height = self.original_image.size
+            # Update canvas size to match the standardized image size
+            img_width, img_height = self.proportional_size(raw_image.size, target_size)
             self.game_canvas.config(width=img_width, height=img_height)
         
-        # Let GameLogic place chameleons first
-        # Process the image in game logic
-            self.game_logic.img_width, self.game_logic.img_height = self.original_image.size
-        
-        # Reset game state for new round
-            self.game_logic.reset_game()
-        
-        # IMPORTANT CHANGE: Now we get the image with chameleons from game_logic
-            self.original_image = self.game_logic.game_image_with_chameleons  
-        
-        # Create blurred version AFTER chameleons are placed
-            self.blurred_image = self.original_image.filter(ImageFilter.GaussianBlur(self.blur_level))
-        
-        # Set initial display as blurred
-            self.current_display_image = self.blurred_image.copy()
-            self.game_image = ImageTk.PhotoImage(self.current_display_image)
-            self.image_on_canvas = self.game_canvas.create_image(0, 0, image=self.game_image, anchor="nw")
-        
-        # Create powerup buttons
-            self.create_powerup_buttons()
-        
-        # Create game control buttons
-            self.create_game_buttons()
-        
-        # Mouse event handlers
-            self.game_canvas.bind("<Motion>", self.update_blur)
-            self.game_canvas.bind("<Button-1>", self.game_logic.handle_click)
-
-        # Start the timer
-            self.start_timer()
+        # Preview now; chameleons are placed in the background and the timer starts once they are
+            self.begin_round(self.image_file)
 
         except Exception as e:
             messagebox.showerror("Error", f"Image didn't load: {e}")
-            self.replay()
+            # Retrying the same image would fail the same way; go back to pick another
+            self.make_start_screen()
     
+    def build_game_screen(self, screen):
+        """Build the game screen once; rounds reuse its canvas and controls"""
+        self.game_screen = screen
+
+        # Timer and points at the top
+        self.timer_frame = tk.Frame(screen, bg="#ADD8E6")
+        self.timer_frame.pack(pady=5)
+        self.timer_display = tk.Label(self.timer_frame, text="Time: 0:00", font=("Arial", 18, "bold"), bg="#ADD8E6", fg="#FF5733")
+        self.timer_display.pack(padx=10)
+        self.points_display = tk.Label(self.timer_frame, text=f"Points: {self.points}", 
+                                  font=("Arial", 14), bg="#ADD8E6", fg="#0000FF")
+
+        # Control frames (normal mode only)
+        self.powerup_frame = tk.Frame(screen, bg="#ADD8E6")
+        self.button_frame = tk.Frame(screen, bg="#ADD8E6")
+        self.create_powerup_buttons()
+        self.create_game_buttons()
+
+        # Canvas and feedback label
+        self.game_canvas = tk.Canvas(screen, bg="white", highlightthickness=2, highlightbackground="#00CED1")
+        self.game_canvas.pack(fill="both", expand=True)
+        self.overlay.attach(self.game_canvas)
+        self.image_on_canvas = None
+        self.game_feedback = tk.Label(screen, text="", font=("Arial", 16), bg="#ADD8E6", fg="#FF0000")
+        self.game_feedback.pack(pady=15)
+
+        # Top-left message label for powerup feedback
+        self.top_left_message = tk.Label(screen, text="", font=("Arial", 14, "bold"), bg="#ADD8E6", fg="#800080")
+        self.top_left_message.place(x=10, y=10)
+
+        self.shop_btn = tk.Button(screen, text="$", command=self.toggle_shop_menu, 
+                        bg="#FFD700", fg="black", font=("Arial", 24, "bold"), 
+                        relief="raised", width=2, height=1)
+
+    def update_game_screen(self, story=False):
+        """Reset the cached game screen for a new round"""
+        self.stop_timer()
+        if self.shop_visible:
+            self.toggle_shop_menu()
+        if hasattr(self, "pause_overlay") and self.pause_overlay.winfo_exists():
+            self.pause_overlay.destroy()
+        if self.current_button_frame:
+            try:
+                self.current_button_frame.destroy()
+            except tk.TclError:
+                pass
+            self.current_button_frame = None
+
+        self.feedback = self.game_feedback
+        self.feedback.config(text="", fg="#FF0000")
+        self.top_left_message.config(text="")
+        self.pause_btn.config(text="Pause")
+
+        # Only show points, shop, powerups and controls in normal mode
+        if story:
+            self.points_display.pack_forget()
+            self.powerup_frame.pack_forget()
+            self.button_frame.pack_forget()
+            self.shop_btn.place_forget()
+            self.game_canvas.config(width="10c", height="7c")  # Tk's default request, as before
+        else:
+            self.points_display.pack(padx=10)
+            self.powerup_frame.pack(after=self.timer_frame, pady=5)
+            self.button_frame.pack(after=self.powerup_frame, pady=5)
+            self.shop_btn.place(x=750, y=10)
+            self.update_points_display()
+
+    def show_canvas_image(self, image):
+        """Show an image on the game canvas, reusing a single image item"""
+        self.game_image = self.renderer.photo(image)
+        if self.image_on_canvas is None:
+            self.image_on_canvas = self.game_canvas.create_image(0, 0, image=self.game_image, anchor="nw")
+            self.game_canvas.tag_lower(self.image_on_canvas)
+        else:
+            self.game_canvas.itemconfig(self.image_on_canvas, image=self.game_image)
+
     def create_powerup_buttons(self):
         """Create powerup buttons based on available uses"""
-        if self.game_logic.story_mode:
-              return  # Skip entirely for story mode
-        
-        self.top_left_message = tk.Label(self.frame, text="", 
-                                        font=("Arial", 14, "bold"), 
-                                        bg="#ADD8E6", fg="#800080")
-        self.top_left_message.place(x=10, y=10)
-    
         self.add_time_btn = tk.Button(
            self.powerup_frame, 
            text=f"Add Time ({self.game_logic.add_time_uses})", 
-           command=self.game_logic.use_add_time, 
+           command=lambda: self.use_powerup("time"), 
            bg="#32CD32", 
            fg="black", 
            font=("Arial", 12, "bold"), 
@@ -621,7 +785,7 @@ class GameUI:
         self.add_steps_btn = tk.Button(
             self.powerup_frame, 
            text=f"Add Steps ({self.game_logic.add_steps_uses})", 
-            command=self.game_logic.use_add_steps, 
+            command=lambda: self.use_powerup("steps"), 
             bg="#FF69B4", 
             fg="black", 
             font=("Arial", 12, "bold"), 
@@ -631,6 +795,19 @@ class GameUI:
         self.add_steps_btn.bind("<Enter>", lambda e: self.add_steps_btn.config(bg="#FF1493"))
         self.add_steps_btn.bind("<Leave>", lambda e: self.add_steps_btn.config(bg="#FF69B4"))
     
+        self.scout_btn = tk.Button(
+            self.powerup_frame, 
+            text=f"Scout ({self.game_logic.scout_uses})", 
+            command=lambda: self.use_powerup("scout"), 
+            bg="#DA70D6", 
+            fg="black", 
+            font=("Arial", 12, "bold"), 
+            relief="raised"
+        )
+        self.scout_btn.pack(side="left", padx=5)
+        self.scout_btn.bind("<Enter>", lambda e: self.scout_btn.config(bg="#BA55D3"))
+        self.scout_btn.bind("<Leave>", lambda e: self.scout_btn.config(bg="#DA70D6"))
+    
     def create_game_buttons(self):
         """Create game control buttons"""
         self.pause_btn = tk.Button(
@@ -679,6 +856,28 @@ class GameUI:
         else:
            self.sound_btn.config(text="🔇 Sound Off", bg="#A9A9A9")
     
+    def reveal_label(self):
+        return "✨ Soft Reveal" if self.reveal_style == "feathered" else "⭕ Hard Reveal"
+
+    def toggle_reveal_style(self):
+        self.set_reveal_style("hard" if self.reveal_style == "feathered" else "feathered")
+        if hasattr(self, 'reveal_btn') and self.reveal_btn.winfo_exists():
+            self.reveal_btn.config(text=self.reveal_label())
+
+    def camouflage_label(self):
+        return "🎨 Local Camouflage" if self.local_camouflage else "🟫 Average Camouflage"
+
+    def toggle_camouflage(self):
+        """Blend chameleons toward the pixels underneath them instead of one average color"""
+        self.local_camouflage = not self.local_camouflage
+        self.game_logic.local_camouflage = self.local_camouflage  # New GameLogics pick it up from the UI
+        if hasattr(self, 'camouflage_btn') and self.camouflage_btn.winfo_exists():
+            self.camouflage_btn.config(text=self.camouflage_label())
+
+    def set_reveal_style(self, style):
+        self.reveal_style = style
+        self.reveal = reveal_renderer(style)
+    
     def toggle_pause(self):
         """Toggle game pause state"""
         if self.game_logic.found:
@@ -688,7 +887,8 @@ class GameUI:
         
         if self.paused:
             self.pause_btn.config(text="Resume")
-            self.stop_timer()
+            self.timer_running = False
+            self.scheduler.pause("round")
             self.pause_overlay = tk.Canvas(self.game_canvas, bg="gray", highlightthickness=0)
             self.pause_overlay.place(relx=0.5, rely=0.5, anchor="center", relwidth=1, relheight=1)
             self.pause_overlay.create_text(self.game_canvas.winfo_width()//2, 
@@ -698,45 +898,34 @@ class GameUI:
             self.game_canvas.unbind("<Button-1>")
         else:
             self.pause_btn.config(text="Pause")
-            self.start_timer()
+            self.scheduler.resume("round")  # Also resumes a round still being prepared
+            if not self.preparing:
+                self.start_timer()
+                self.game_canvas.bind("<Button-1>", self.on_canvas_click)
             self.update_powerup_buttons()
             if hasattr(self, "pause_overlay") and self.pause_overlay.winfo_exists():
                self.pause_overlay.destroy()
             self.feedback.config(text="Move your mouse to reveal parts of the image! Click to guess the chameleon location!", fg="#800080")
     
     def clean_up_game_widgets(self):
-        """Safely destroy game widgets"""
+        """Detach input from the reused game canvas between rounds"""
         if hasattr(self, 'game_canvas') and self.game_canvas.winfo_exists():
             try:
                 self.game_canvas.unbind("<Motion>")
                 self.game_canvas.unbind("<Button-1>")
-                self.game_canvas.destroy()
-            except:
-                pass
-            
-        if hasattr(self, 'powerup_frame') and self.powerup_frame.winfo_exists():
-            try:
-                self.powerup_frame.destroy()
-            except:
-                pass
-            
-        if hasattr(self, 'button_frame') and self.button_frame.winfo_exists():
-            try:
-                self.button_frame.destroy()
-            except:
+            except tk.TclError:
                 pass
     
-    
-    
-    
-    
     def return_to_main_menu(self):
         """Go back to the main menu"""
-        # Cancel any running timer
-        if self.timer_id:
-            self.window.after_cancel(self.timer_id)
-            self.timer_id = None
-        self.timer_running = False
+        # Cancel the round clock and any pending story transitions
+        self.stop_timer()
+        self.stop_time_attack()
+        self.attack_sources = None
+        
+        # Drop a round still being prepared
+        self.round_token += 1
+        self.preparing = False
         
         # Clean up widgets
         self.clean_up_game_widgets()
@@ -746,6 +935,7 @@ class GameUI:
         self.original_image = None
         self.blurred_image = None
         self.current_display_image = None
+        self.trail = None
         
         self.image_file = None
         self.paused = False
@@ -754,11 +944,16 @@ class GameUI:
     
     def update_powerup_buttons(self):
         """Update the state and appearance of powerup buttons"""
+        # Nothing is usable while a round is being prepared; starting it resets the powerups
         time_state = "normal" if (self.game_logic.add_time_uses > 0 and not self.paused 
-                                and not self.game_logic.found and self.timer_running) else "disabled"
+                                and not self.game_logic.found and self.timer_running
+                                and not self.preparing) else "disabled"
         
         steps_state = "normal" if (self.game_logic.add_steps_uses > 0 and not self.paused 
-                                and not self.game_logic.found) else "disabled"
+                                and not self.game_logic.found and not self.preparing) else "disabled"
+        
+        scout_state = "normal" if (self.game_logic.scout_uses > 0 and not self.paused 
+                                and not self.game_logic.found and not self.preparing) else "disabled"
     
         if hasattr(self, 'add_time_btn') and self.add_time_btn.winfo_exists():
              self.add_time_btn.config(
@@ -774,6 +969,13 @@ class GameUI:
                 bg="#FF69B4" if steps_state == "normal" else "#A9A9A9"
             )
     
+        if hasattr(self, 'scout_btn') and self.scout_btn.winfo_exists():
+            self.scout_btn.config(
+                text=f"Scout ({self.game_logic.scout_uses})", 
+                state=scout_state,
+                bg="#DA70D6" if scout_state == "normal" else "#A9A9A9"
+            )
+    
         self.update_points_display()
     
     def set_blur_difficulty(self):
@@ -782,18 +984,146 @@ class GameUI:
            difficulty_value = self.current_story_difficulty
         else:
            difficulty_value = self.difficulty.get()
-        if difficulty_value == "Easy":
-            self.blur_level = 5
-            self.clear_radius = 100
-        elif difficulty_value == "Medium":
-            self.blur_level = 8
-            self.clear_radius = 75
-        else:  # Hard
-            self.blur_level = 12
-            self.clear_radius = 50
+        settings = reveal_settings(difficulty_value)
+        self.blur_level = settings["blur_level"]
+        self.clear_radius = settings["clear_radius"]
     
+    def record_round(self):
+        """Write the new round's seed to the input trace when recording"""
+        if self.recorder:
+            self.recorder.round(self.game_logic.round_seed,
+                                self.current_story_difficulty if self.game_logic.story_mode else self.difficulty.get(),
+                                self.image_file, self.game_logic.story_mode, self.story_images.current_level,
+                                self.points)
+
+    def record_result(self, result):
+        """Queue a finished round for the score store; story wins also save progress"""
+        self.scores.record_round(result)
+        if result["story"] and result["won"]:
+            self.scores.save_story_progress(self.story_images.current_level + 1)
+        if self.attack is not None and not result["story"]:
+            # Time attack moves straight on to the next puzzle, won or not
+            self.attack_played += 1
+            self.attack_cleared += int(result["won"])
+            self.update_timer_display()
+            if self.time_left > 0:
+                self.clean_up_game_widgets()
+                self.scheduler.call_later(TIME_ATTACK_NEXT_MS, self.next_attack_puzzle, group="round",
+                                          widget=self.game_canvas)
+
+    def start_time_attack(self, sources=None):
+        """Endless mode: clear prepared puzzles one after another before the clock runs out"""
+        self.clean_up_game_widgets()
+        self.stop_time_attack()
+        if sources is None:
+            # Story images, the uploaded image if any, and fresh generated backgrounds
+            sources = [level["image_data"] for level in self.story_images.story_levels]
+            if self.image_file:
+                sources.insert(0, self.image_file)
+            sources.append(GENERATED)
+        self.attack_sources = sources
+        self.game_logic = GameLogic(self)
+        self.game_logic.story_mode = False
+        self.level_assets = None
+        self.paused = False
+        self.points = self.scores.points
+        self.screens.show("game", story=False)
+        self.set_blur_difficulty()
+        self.initial_clear_radius = self.clear_radius
+
+        self.attack = PuzzleQueue(sources, self.difficulty.get(), depth=TIME_ATTACK_QUEUE,
+                                  producers=TIME_ATTACK_PRODUCERS, blur_level=self.blur_level,
+                                  local_camouflage=self.local_camouflage)
+        self.attack_cleared = 0
+        self.attack_played = 0
+        self.time_left = TIME_ATTACK_SECONDS
+        self.total_time = TIME_ATTACK_SECONDS
+        self.update_timer_display()
+        self.show_canvas_image(Image.new("RGB", (800, 600), "#ADD8E6"))
+        self.next_attack_puzzle()
+
+    def next_attack_puzzle(self):
+        """Show the next prepared puzzle; if none is ready, hold the clock and poll the queue"""
+        if self.attack is None or self.time_left <= 0:
+            return
+        puzzle = None if self.paused else self.attack.get_nowait()
+        if puzzle is None:
+            # Waiting on the generator is not the player's time (unpausing the game resumes the clock)
+            self.scheduler.pause("round")
+            if not self.preparing:
+                self.preparing = True
+                self.clean_up_game_widgets()
+                self.feedback.config(text="Preparing the next puzzle...", fg="#800080")
+            self.scheduler.call_later(15, self.next_attack_puzzle, group="attack", widget=self.game_canvas)
+            return
+
+        self.preparing = False
+        if not self.paused:
+            self.scheduler.resume("round")  # Held while the queue was empty; start_timer would add to a paused group
+        logic = self.game_logic
+        logic.load_puzzle(puzzle["state"])
+        logic.game_image_with_chameleons = puzzle["composite"]
+        self.image_file = puzzle["source"]
+        self.blurred_image = puzzle["blurred"]
+        self.game_canvas.config(width=logic.img_width, height=logic.img_height)
+        self.finish_round()  # Also starts the clock the first time and resumes it after a wait
+
+    def finish_time_attack(self):
+        """Report the run and the generator's throughput once the clock runs out"""
+        stats = self.attack.stats()
+        self.stop_time_attack()
+        self.clean_up_game_widgets()
+        log.info("Time attack finished", extra={"fields": dict(stats, cleared=self.attack_cleared,
+                                                                played=self.attack_played)})
+        self.show_message(f"Time's up! You cleared {self.attack_cleared} of {self.attack_played} puzzles.",
+                          self.attack_cleared > 0)
+        self.top_left_message.config(text=f"Puzzle generator: {stats['per_minute']:.0f}/min, "
+                                          f"{stats['build_p50_ms']:.0f} ms each, longest wait {stats['wait_max_ms']:.0f} ms")
+
+    def stop_time_attack(self):
+        """Stop the producers and anything waiting on them"""
+        self.scheduler.cancel_group("attack")
+        if self.attack is not None:
+            self.attack.close()
+            self.attack = None
+
+    def attack_hud_lines(self):
+        """Generator stats for the performance overlay while a time attack runs"""
+        if self.attack is None:
+            return []
+        return ["queue " + describe_queue(self.attack.stats())]
+
+    def mark_trail(self, x, y, color):
+        """Add a click to the search trail and redraw the frame around the cursor"""
+        if self.trail is None:
+            return
+        self.trail.splat(x, y, color)
+        self.reveal.invalidate()  # The trail frame changed in place
+        self.apply_dynamic_blur(self.last_mouse_x, self.last_mouse_y)
+
+    def on_canvas_click(self, event):
+        """Forward canvas clicks to the game logic, recording them first"""
+        if self.recorder:
+            self.recorder.click(event.x, event.y)
+        self.game_logic.handle_click(event)
+
+    def use_powerup(self, kind):
+        """Use a powerup from its button, recording it first"""
+        if self.recorder:
+            self.recorder.powerup(kind)
+        if kind == "time":
+            self.game_logic.use_add_time()
+        elif kind == "steps":
+            self.game_logic.use_add_steps()
+        elif kind == "scout":
+            self.game_logic.use_scout()
+
     def update_blur(self, event):
         """Update the dynamic blur based on mouse position"""
+        if self.recorder:
+            self.recorder.motion(event.x, event.y)
+        if self.hud.enabled:
+            self.hud.record_event(event)
         if self.paused or self.game_logic.found:
             return
             
@@ -807,7 +1137,7 @@ class GameUI:
     def apply_dynamic_blur(self, x, y):
         
        """Apply dynamic blurring with a clear area around cursor position"""
-      
+       started = time.perf_counter() if self.hud.enabled else None
         
        try:
            # Check if required components still exist
@@ -817,47 +1147,47 @@ class GameUI:
            if not hasattr(self, 'blurred_image') or self.blurred_image is None:
                return
             
-           if not hasattr(self, 'image_on_canvas'):
+           if getattr(self, 'image_on_canvas', None) is None:
                return
            
-           self.current_display_image = self.blurred_image.copy()
-           mask = Image.new('L', self.blurred_image.size, 0)
-           draw = ImageDraw.Draw(mask)
-           draw.ellipse((x-self.clear_radius, y-self.clear_radius, 
-                     x+self.clear_radius, y+self.clear_radius), 
-                    fill=255)
-        
               # Story mode vs normal mode:
            if self.game_logic.story_mode:
                # Story Mode: Reveal image WITH chameleons
-               if hasattr(self.game_logic, 'game_image_with_chameleons'):
-                self.current_display_image.paste(self.game_logic.game_image_with_chameleons, (0,0), mask)
+               sharp = getattr(self.game_logic, 'game_image_with_chameleons', None)
            else:
               # Normal Mode: Original behavior
-              if hasattr(self, 'original_image') and self.original_image is not None:
-                  self.current_display_image.paste(self.original_image, (0,0), mask)
+              sharp = getattr(self, 'original_image', None)
+           base = self.trail.render(self.blurred_image) if self.trail else self.blurred_image
+           self.current_display_image = self.reveal.render(base, sharp, x, y, self.clear_radius)
 
             
             # Only update if canvas still exists
            if self.game_canvas.winfo_exists():
-               self.game_image = ImageTk.PhotoImage(self.current_display_image)
+               self.game_image = self.renderer.photo(self.current_display_image)
                self.game_canvas.itemconfig(self.image_on_canvas, image=self.game_image)
+               if started is not None:
+                   self.hud.record_frame(started)
         
        except Exception as e:
-           print(f"Error applying dynamic blur: {e}")
+           # Runs on every motion event: report the first failure, keep the rest at debug
+           self.blur_errors += 1
+           log.log(logging.WARNING if self.blur_errors == 1 else logging.DEBUG,
+                   "Error applying dynamic blur: %s", e, extra={"fields": {"count": self.blur_errors}})
     
+    def toggle_hud(self, event=None):
+        """Show or hide the performance overlay on the game canvas"""
+        canvas = getattr(self, 'game_canvas', None)
+        if canvas is None or not canvas.winfo_exists():
+            return  # Nothing to draw on until the game screen exists
+        log.info("Performance overlay %s", "on" if self.hud.toggle(canvas) else "off")
+
     def set_timer_difficulty(self):
         """Set timer duration based on difficulty"""
         if self.game_logic.story_mode:
            difficulty_value = self.current_story_difficulty
         else:  
            difficulty_value = self.difficulty.get()
-        if difficulty_value == "Easy":
-            self.time_left = 90  # 1:30
-        elif difficulty_value == "Medium":
-            self.time_left = 60  # 1:00
-        else:  # Hard
-            self.time_left = 30  # 0:30
+        self.time_left = round_seconds(difficulty_value)
         
         self.total_time = self.time_left#  Store it for dynamic blur scaling
         self.update_timer_display()
@@ -870,6 +1200,8 @@ class GameUI:
          minutes = self.time_left // 60
          seconds = self.time_left % 60
          time_string = f"Time: {minutes}:{seconds:02d}"
+         if self.attack is not None:
+             time_string += f"   Cleared: {self.attack_cleared}"
     
          # Change color based on time left
          if self.time_left > 20:
@@ -882,61 +1214,63 @@ class GameUI:
          self.safe_update_widget(self.timer_display, text=time_string, fg=color)
     
     def start_timer(self):
-        """Start the timer"""
+        """Start (or resume) the round countdown"""
         if self.paused:
             return
             
-        self.timer_running = True
-        self.tick_timer()
+        if self.round_clock is not None:
+            self.timer_running = True
+            self.scheduler.resume("round")
+        elif self._time_left > 0:
+            self.timer_running = True
+            self.initial_clear_radius = self.clear_radius
+            self.round_clock = self.scheduler.countdown(self._time_left, self.tick_timer, self.time_up, group="round")
     
     def stop_timer(self):
-        """Stop the timer"""
+        """Stop the timer and drop everything scheduled for the round"""
         self.timer_running = False
-        if self.timer_id:
-            self.window.after_cancel(self.timer_id)
-            self.timer_id = None
+        self.scheduler.cancel_group("round")
+        if self.round_clock is not None:
+            self._time_left = self.round_clock.left()
+            self.round_clock = None
+
+    @property
+    def time_left(self):
+        """Whole seconds left on the round clock"""
+        if self.round_clock is not None:
+            return self.round_clock.left()
+        return self._time_left
+
+    @time_left.setter
+    def time_left(self, seconds):
+        self._time_left = seconds
+        if self.round_clock is not None:
+            self.round_clock.set_left(seconds)
     
-    def tick_timer(self):
-        
-       """Update timer each second and reduce clear radius over time"""
-       if self.timer_running and self.time_left > 0:
-          self.time_left -= 1
-
-        # Dynamically adjust blur clear radius
-          min_radius = 20
-          if not hasattr(self, 'initial_clear_radius'):
-             self.initial_clear_radius = self.clear_radius
-
-             if self.game_logic.story_mode:
-              difficulty_value = self.current_story_difficulty
-             else:
-              difficulty_value = self.difficulty.get()
-            
-             if difficulty_value == "Easy":
-              total_time = 90
-             elif difficulty_value == "Medium":
-              total_time = 60
-             else:
-              total_time = 30
-
-          ratio = max(self.time_left / self.total_time, 0)
-          self.clear_radius = int(min_radius + (self.initial_clear_radius - min_radius) * ratio)
-
-          self.update_timer_display()
-          self.apply_dynamic_blur(self.last_mouse_x, self.last_mouse_y)
-
-          self.timer_id = self.window.after(1000, self.tick_timer)
-
-       elif self.timer_running and self.time_left <= 0:
+    def tick_timer(self, seconds_left):
+       """Called by the round clock each second: shrink the clear radius and refresh the display"""
+       min_radius = 20
+       ratio = max(seconds_left / self.total_time, 0)
+       self.clear_radius = int(min_radius + (self.initial_clear_radius - min_radius) * ratio)
+
+       self.update_timer_display()
+       self.apply_dynamic_blur(self.last_mouse_x, self.last_mouse_y)
+
+    def time_up(self):
+             """Called by the round clock when it reaches zero"""
+             if self.recorder:
+                 self.recorder.time_up()
              self.timer_running = False
+             self.round_clock = None
+             self._time_left = 0
              self.timer_display.config(text="Time's Up!", fg="#FF0000")
-
-             
+             if not self.game_logic.found:
+                 self.game_logic.report_round(False)
 
              if not self.game_logic.found:
                  if self.original_image:
                     # Show unblurred image
-                    self.game_image = ImageTk.PhotoImage(self.game_logic.game_image_with_chameleons)
+                    self.game_image = self.renderer.photo(self.game_logic.game_image_with_chameleons)
                     self.game_canvas.itemconfig(self.image_on_canvas, image=self.game_image)
                 
                     # Story mode handling
@@ -951,6 +1285,9 @@ class GameUI:
                       if self.sound_on:
                          self.gameover_sound.play()
 
+             if self.attack is not None:
+                 self.finish_time_attack()
+
     def show_story_success(self):
         level = self.story_images.get_current_level()
         level_num = self.story_images.current_level + 1
@@ -965,7 +1302,7 @@ class GameUI:
         
         message = success_messages.get(level_num, f"Color Ghost found in {level['name']}!")
         self.show_message(message, True)
-        self.window.after(2500, self.show_story_completion)
+        self.scheduler.call_later(2500, self.show_story_completion, group="round")
 
     def show_story_failure(self):
         level = self.story_images.get_current_level()
@@ -1002,7 +1339,7 @@ class GameUI:
                        width=self.game_canvas.winfo_width()-40)
     
         # Schedule the retry menu to appear
-        self.window.after(2500, lambda: self.show_story_retry(overlay))
+        self.scheduler.call_later(2500, self.show_story_retry, overlay, group="round", widget=overlay)
 
     def show_story_completion(self):
         # Destroy existing button frame if it exists
@@ -1013,7 +1350,7 @@ class GameUI:
               pass
     
         # Create new button frame
-        self.current_button_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        self.current_button_frame = tk.Frame(self.game_screen, bg="#ADD8E6")
         self.current_button_frame.pack(pady=10)
 
         if self.story_images.current_level < len(self.story_images.story_levels) - 1:
@@ -1055,7 +1392,7 @@ class GameUI:
                 pass
     
         # Create new button frame
-        self.current_button_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        self.current_button_frame = tk.Frame(self.game_screen, bg="#ADD8E6")
         self.current_button_frame.place(relx=0.5, rely=0.8, anchor="center")
     
         retry_btn = tk.Button(self.current_button_frame, text="Try Again",
@@ -1079,15 +1416,14 @@ class GameUI:
 
     def show_story_complete(self):
         """Enhanced story completion with the trust narrative"""
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    pass
+        self.screens.show("story_complete")
 
+    def update_story_complete(self):
+        self.story_stats_label.config(text=f"Expeditions Completed: {len(self.story_images.story_levels)}")
+
+    def build_story_complete(self, screen):
         # Title
-        title = tk.Label(self.frame, text="🎉 EXPEDITION COMPLETE! 🎉",
+        title = tk.Label(screen, text="🎉 EXPEDITION COMPLETE! 🎉",
                         font=("Arial", 26, "bold"), fg="#00CED1", bg="#ADD8E6")
         title.pack(pady=20)
 
@@ -1104,23 +1440,23 @@ class GameUI:
     waiting for researchers who show the same dedication
     and respect for nature that you have demonstrated."""
 
-        conclusion_label = tk.Label(self.frame, text=conclusion_text,
+        conclusion_label = tk.Label(screen, text=conclusion_text,
                                   font=("Arial", 12), fg="#000080", bg="#ADD8E6",
                                   justify=tk.CENTER, wraplength=700)
         conclusion_label.pack(pady=20)
 
         # Achievement
-        achievement = tk.Label(self.frame, text="🏆 ACHIEVEMENT UNLOCKED: Color Ghost Whisperer",
+        achievement = tk.Label(screen, text="🏆 ACHIEVEMENT UNLOCKED: Color Ghost Whisperer",
                              font=("Arial", 14, "bold"), fg="#FFD700", bg="#ADD8E6")
         achievement.pack(pady=15)
 
         # Stats
-        stats = tk.Label(self.frame, text=f"Expeditions Completed: {len(self.story_images.story_levels)}",
+        self.story_stats_label = tk.Label(screen, text="",
                         font=("Arial", 12), fg="#008000", bg="#ADD8E6", justify=tk.CENTER)
-        stats.pack(pady=10)
+        self.story_stats_label.pack(pady=10)
 
         # Create a button frame at the bottom center
-        button_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        button_frame = tk.Frame(screen, bg="#ADD8E6")
         button_frame.pack(side=tk.BOTTOM, pady=25)
 
         # New expedition button
@@ -1139,16 +1475,11 @@ class GameUI:
 
     def show_story_intro(self):
         """Display the story introduction before starting story mode"""
-        # Clear the frame
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    pass
+        self.screens.show("story_intro")
 
+    def build_story_intro(self, screen):
         # Create a main container frame
-        main_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        main_frame = tk.Frame(screen, bg="#ADD8E6")
         main_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
         # Title
@@ -1211,30 +1542,17 @@ class GameUI:
         """Start the actual story mode gameplay"""
         self.game_logic.story_mode = True
         self.story_images.reset_levels()
+        self.scores.save_story_progress(0)  # Begin Expedition starts a fresh playthrough
         self.show_story_level_intro()
 
     def show_story_level_intro(self):
         """Enhanced level intro with expedition context"""
+        self.screens.show("level_intro")
+
+    def update_story_level_intro(self):
+        """Fill the level intro labels for the current story level"""
         level = self.story_images.get_current_level()
         level_num = self.story_images.current_level + 1
-        
-        # Clear the frame
-        for widget in self.frame.winfo_children():
-            if widget != getattr(self, "bg_label", None):
-                try:
-                    widget.destroy()
-                except tk.TclError:
-                    pass
-
-        # Expedition header
-        header = tk.Label(self.frame, text=f"🔍 EXPEDITION {level_num}/5",
-                         font=("Arial", 22, "bold"), fg="#000080", bg="#ADD8E6")
-        header.pack(pady=15)
-
-        # Location title
-        location_title = tk.Label(self.frame, text=f"📍 Location: {level['name']}",
-                                 font=("Arial", 18, "bold"), fg="#8B0000", bg="#ADD8E6")
-        location_title.pack(pady=10)
 
         # Expedition context based on level
         expedition_texts = {
@@ -1245,33 +1563,48 @@ class GameUI:
             5: "Final expedition. The Color Ghost has reached peak\nadaptation, but trust may be building..."
         }
 
-        context_text = expedition_texts.get(level_num, "Continue the expedition...")
-        context_label = tk.Label(self.frame, text=context_text,
+        if level_num == 1:
+            difficulty_level = "Easy"
+        elif level_num in [2, 3]:
+            difficulty_level = "Medium"
+        else:  # levels 4 and 5
+            difficulty_level = "Hard"
+
+        self.level_header.config(text=f"🔍 EXPEDITION {level_num}/5")
+        self.level_location.config(text=f"📍 Location: {level['name']}")
+        self.level_context.config(text=expedition_texts.get(level_num, "Continue the expedition..."))
+        self.level_notes.config(text=f"Research Notes:\n{level['description']}")
+        self.level_difficulty.config(text=f"Difficulty: {difficulty_level}")
+
+    def build_story_level_intro(self, screen):
+        # Expedition header
+        self.level_header = tk.Label(screen, text="",
+                         font=("Arial", 22, "bold"), fg="#000080", bg="#ADD8E6")
+        self.level_header.pack(pady=15)
+
+        # Location title
+        self.level_location = tk.Label(screen, text="",
+                                 font=("Arial", 18, "bold"), fg="#8B0000", bg="#ADD8E6")
+        self.level_location.pack(pady=10)
+
+        # Expedition context
+        self.level_context = tk.Label(screen, text="",
                                 font=("Arial", 14), fg="#000080", bg="#ADD8E6",
                                 justify=tk.CENTER)
-        context_label.pack(pady=20)
+        self.level_context.pack(pady=20)
 
         # Research notes
-        notes_text = f"Research Notes:\n{level['description']}"
-        notes_label = tk.Label(self.frame, text=notes_text,
+        self.level_notes = tk.Label(screen, text="",
                               font=("Arial", 12), fg="#006400", bg="#ADD8E6",
                               justify=tk.CENTER)
-        notes_label.pack(pady=15)
+        self.level_notes.pack(pady=15)
 
-        if level_num == 1:
-            difficulty_level = "Easy"
-        elif level_num in [2, 3]:
-            difficulty_level = "Medium"
-        else:  # levels 4 and 5
-            difficulty_level = "Hard"
-    
-        difficulty_text = f"Difficulty: {difficulty_level}"
-        difficulty_label = tk.Label(self.frame, text=difficulty_text,
+        self.level_difficulty = tk.Label(screen, text="",
                                    font=("Arial", 12, "bold"), fg="#FF6347", bg="#ADD8E6")
-        difficulty_label.pack(pady=5)
+        self.level_difficulty.pack(pady=5)
 
         # Button frame
-        button_frame = tk.Frame(self.frame, bg="#ADD8E6")
+        button_frame = tk.Frame(screen, bg="#ADD8E6")
         button_frame.pack(pady=25)
 
         # Start tracking button
@@ -1302,12 +1635,15 @@ class GameUI:
         
         message = success_messages.get(level_num, f"Color Ghost found in {level['name']}!")
         self.show_message(message, True)
-        self.window.after(2500, self.show_story_completion)
+        self.scheduler.call_later(2500, self.show_story_completion, group="round")
 
     def show_message_in_game(self, message):
         """Show a temporary message in the game area"""
         self.top_left_message.config(text=message)
-        self.top_left_message.after(3000, lambda: self.top_left_message.config(text=""))
+        # A newer message restarts the clear delay instead of being wiped by an older one
+        self.scheduler.cancel(self.message_clear)
+        self.message_clear = self.scheduler.call_later(3000, lambda: self.top_left_message.config(text=""),
+                                                       widget=self.top_left_message)
 
     def show_message(self, msg, success):
             """Show a message in the feedback label"""
@@ -1319,12 +1655,12 @@ class GameUI:
 
     def replay(self):
         """Restart the game with the same image"""
-        # Cancel any running timer
-        if self.timer_id:
-            self.window.after_cancel(self.timer_id)
-            self.timer_id = None
-        self.timer_running = False
+        # Cancel the round clock and anything else scheduled for the round
+        self.stop_timer()
         self.paused = False
+        if self.attack_sources:
+            self.start_time_attack(self.attack_sources)  # A fresh run from the same sources
+            return
         
         # Start a new game
         self.start_game()
@@ -1332,6 +1668,23 @@ class GameUI:
 
 # Main entry point
 if __name__ == "__main__":
+    import sys
+    # Log levels, e.g. --log debug or --log placement=debug,ui=info (else CHAMELEON_LOG)
+    log_levels = sys.argv[sys.argv.index("--log") + 1] if "--log" in sys.argv[1:-1] else None
+    log_file = sys.argv[sys.argv.index("--log-file") + 1] if "--log-file" in sys.argv[1:-1] else None
+    configure_logging(log_levels, file=log_file)
     window = tk.Tk()
     game = GameUI(window)
-    window.mainloop()
\ No newline at end of file
+    # Reveal style: --reveal feathered (soft edge) or hard
+    if "--reveal" in sys.argv[1:-1]:
+        game.set_reveal_style(sys.argv[sys.argv.index("--reveal") + 1])
+    # Optional input capture for replay benchmarks: python UI_code.py --record session.chrt
+    if "--record" in sys.argv[1:-1]:
+        from input_trace import InputRecorder
+        game.recorder = InputRecorder(sys.argv[sys.argv.index("--record") + 1])
+    window.mainloop()
+    game.round_builder.shutdown(wait=False)
+    game.stop_time_attack()
+    game.scores.close()
+    if game.recorder:
+        game.recorder.close()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from PIL import ImageFilter
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # UI_code starts the mixer on import
+
+import scheduler
+import UI_code
+from canvas_overlay import CanvasOverlay
+from game_functions import GameLogic
+from headless import Setting
+from puzzle_factory import generate_background
+from rendering import OffscreenCanvas, reveal_renderer
+from scheduler import Scheduler
+from StoryImages_Class import StoryImages
+
+# Headless check of the time-attack flow in GameUI: start on an empty queue, a
+# puzzle arrives, the clock ticks, the round is won and the next puzzle is
+# served. The Tk widgets are replaced by stand-ins and the scheduler runs on a
+# fake clock, so no display is needed.
+#
+#   python attack_test.py      (or python -m pytest attack_test.py)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Label:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+    def winfo_exists(self):
+        return True
+
+
+class ScriptedQueue:
+    """Stands in for PuzzleQueue: puzzles only appear when the test pushes them"""
+    def __init__(self, sources, difficulty, **options):
+        self.ready = []
+        self.closed = False
+
+    def get_nowait(self):
+        return self.ready.pop(0) if self.ready else None
+
+    def stats(self):
+        return {"per_minute": 0.0, "build_p50_ms": 0.0, "wait_max_ms": 0.0}
+
+    def close(self):
+        self.closed = True
+
+
+class AttackHost(UI_code.GameUI):
+    """GameUI with its Tk surface swapped for offscreen stand-ins"""
+    def __init__(self):
+        self.scheduler = Scheduler(None)
+        self.window = None
+        self.sound_on = False
+        self.recorder = None
+        self.story_images = StoryImages()
+        self.image_file = None
+        self.image_on_canvas = None
+        self.difficulty = Setting("Easy")
+        self.current_story_difficulty = "Easy"
+        self.scores = SimpleNamespace(points=0, record_round=lambda result: None, save_points=lambda points: None)
+        self.screens = SimpleNamespace(show=lambda name, **state: None)
+        self.points = 0
+        self.paused = False
+        self.preparing = False
+        self.round_clock = None
+        self._time_left = 0
+        self.total_time = 0
+        self.timer_running = False
+        self.last_mouse_x = self.last_mouse_y = 0
+        self.game_canvas = OffscreenCanvas()
+        self.overlay = CanvasOverlay(None)
+        self.overlay.attach(self.game_canvas)
+        self.reveal = reveal_renderer("hard")
+        self.local_camouflage = False
+        self.feedback = Label()
+        self.timer_display = Label()
+        self.top_left_message = Label()
+        self.attack = None
+        self.attack_sources = None
+        self.attack_cleared = 0
+        self.attack_played = 0
+        self.game_logic = GameLogic(self)
+
+    def show_canvas_image(self, image):
+        self.shown = image
+
+    def apply_dynamic_blur(self, x, y):
+        pass
+
+
+def make_puzzle(seed):
+    logic = GameLogic(None)
+    composite = logic.prepare_round(generate_background(seed, (400, 300)), "Easy", seed=seed)
+    return {"source": "generated", "state": logic.puzzle_state(), "composite": composite,
+            "blurred": composite.filter(ImageFilter.GaussianBlur(5)), "build_ms": 0.0}
+
+
+def run(host, clock, seconds):
+    """Advance the fake clock in frame steps, running everything that comes due"""
+    for _ in range(max(1, int(seconds / 0.016))):
+        clock.now += 0.016
+        host.scheduler.tick()
+
+
+def test_time_attack_flow():
+    clock = FakeClock()
+    real_time, real_queue = scheduler.time, UI_code.PuzzleQueue
+    scheduler.time, UI_code.PuzzleQueue = clock, ScriptedQueue
+    try:
+        host = AttackHost()
+        first, second = make_puzzle(1), make_puzzle(2)
+
+        host.start_time_attack(["generated"])
+        run(host, clock, 0.1)
+        assert host.preparing, "an empty queue should leave the run waiting"
+        assert host.time_left == UI_code.TIME_ATTACK_SECONDS
+
+        host.attack.ready.append(first)
+        run(host, clock, 0.1)
+        assert not host.preparing, "the queued puzzle should be served"
+        assert not host.scheduler.is_paused("round")
+        run(host, clock, 2.0)
+        assert host.time_left < UI_code.TIME_ATTACK_SECONDS, "the clock should tick once a puzzle is up"
+
+        for x1, y1, x2, y2 in list(host.game_logic.chameleon_positions):
+            host.game_logic.handle_click(SimpleNamespace(x=(x1 + x2) // 2, y=(y1 + y2) // 2))
+        assert host.attack_cleared == 1
+
+        run(host, clock, UI_code.TIME_ATTACK_NEXT_MS / 1000 + 0.1)
+        assert host.preparing, "the next puzzle should be requested after the pause"
+        held = host.time_left
+        run(host, clock, 2.0)
+        assert host.time_left == held, "waiting on the queue should not cost clock time"
+
+        host.attack.ready.append(second)
+        run(host, clock, 0.1)
+        assert not host.preparing
+        assert host.game_logic.chameleon_positions == [tuple(r) for r in second["state"]["positions"]]
+        run(host, clock, 2.0)
+        assert host.time_left < held, "the clock should keep running on the next puzzle"
+        host.stop_time_attack()
+    finally:
+        scheduler.time, UI_code.PuzzleQueue = real_time, real_queue
+
+
+if __name__ == "__main__":
+    test_time_attack_flow()
+    print("Time attack flow: PASS")
+    sys.exit(0)
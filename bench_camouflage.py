@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+from PIL import Image
+
+from camouflage import camouflage_average, camouflage_local, camouflage_mimic
+from game_functions import LOCAL_LOW_PASS
+from headless import HeadlessUI
+
+# Times the camouflage functions place_chameleons_smartly actually calls, per
+# chameleon, at the size each difficulty produces on the story images: the
+# single average color, local blending (sRGB, and Lab with the low-pass the
+# game uses) and mimic. Silhouettes come warm from the cache, as in a round.
+IMAGES = ["Level1.jpg", "Level3.jpg", "Level5.jpeg"]
+REPEATS = 20
+
+
+def best_of(func):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    logic = HeadlessUI().game_logic
+    ratios = []
+    print(f"{'image':<12} {'difficulty':<10} {'size':>9} {'average ms':>11} {'local ms':>9} {'local lab ms':>13} "
+          f"{'mimic ms':>9} {'lab/avg':>8}")
+    for image_file in IMAGES:
+        img = Image.open(image_file).convert("RGB")
+        img.thumbnail((800, 600))
+        canvas = np.asarray(img)
+        for difficulty, settings in logic.difficulty_settings.items():
+            width = int(min(img.size) * settings["size_factor"])
+            height = int(width * logic.chameleon_height / logic.chameleon_width)
+            x, y = (img.width - width) // 2, (img.height - height) // 2
+            underneath = canvas[y:y + height, x:x + width]
+            donor = canvas[:height, :width]
+            silhouette = logic.silhouettes.get(width, height, settings["opacity"], settings["color_match"])
+
+            average_ms = best_of(lambda: camouflage_average(silhouette, underneath.reshape(-1, 3).mean(axis=0)))
+            local_ms = best_of(lambda: camouflage_local(silhouette, underneath, lab=False))
+            lab_ms = best_of(lambda: camouflage_local(silhouette, underneath, low_pass=LOCAL_LOW_PASS))
+            mimic_ms = best_of(lambda: camouflage_mimic(silhouette, donor, underneath, settings["color_match"]))
+            ratios.append(lab_ms / average_ms)
+            print(f"{image_file:<12} {difficulty:<10} {width:>4}x{height:<4} {average_ms:>11.3f} {local_ms:>9.3f} "
+                  f"{lab_ms:>13.3f} {mimic_ms:>9.3f} {lab_ms / average_ms:>7.1f}x")
+
+    print(f"Local Lab camouflage costs {np.median(ratios):.1f}x the average-color path per chameleon (median)")
+
+
+if __name__ == "__main__":
+    main()
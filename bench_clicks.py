@@ -0,0 +1,47 @@
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from headless import HeadlessUI
+
+# Checks that evaluate_clicks agrees with handle_click/award_points/get_feedback
+# on every click and compares the batched call with replaying events one by one.
+CLICKS = 5000
+
+
+def main():
+    ui = HeadlessUI()
+    ui.start_round("Level1.jpg", "Hard", seed=1)
+    logic = ui.game_logic
+    rng = np.random.default_rng(0)
+    xs = rng.integers(0, logic.img_width, CLICKS)
+    ys = rng.integers(0, logic.img_height, CLICKS)
+
+    start = time.perf_counter()
+    batch = logic.evaluate_clicks(xs, ys)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = 0
+    start = time.perf_counter()
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        # Unlimited clicks and a fresh found list so every event takes the normal path
+        logic.click_count = 0
+        logic.found_chameleons = [False] * len(logic.chameleon_positions)
+        logic.found = False
+        ui.points = 0
+        logic.handle_click(SimpleNamespace(x=int(x), y=int(y)))
+        hit = next((j for j, found in enumerate(logic.found_chameleons) if found), -1)
+        if hit != batch["hits"][i] or ui.points != batch["points"][i]:
+            mismatches += 1
+        elif hit < 0 and not ui.last_message.startswith(logic.get_feedback(batch["distances"][i])):
+            mismatches += 1
+    events_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{CLICKS} clicks: evaluate_clicks {batch_ms:.2f} ms, handle_click {events_ms:.1f} ms "
+          f"({events_ms / batch_ms:.0f}x), mismatches {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from headless import HeadlessUI
+
+# Times the blend-and-paste stage of placement (GameLogic.composite_chameleons)
+# on its own as the chameleon count grows, next to the whole of
+# place_chameleons_smartly, whose position selection dominates. Jobs are
+# captured from a real placement so donors and sizes match a round.
+COUNTS = (1, 2, 4, 8, 12, 16)
+REPEATS = 10
+
+
+def best_of(func):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def round_jobs(logic, settings, seed):
+    """The (x, y, width, height, donor) jobs place_chameleons_smartly blends for this seed"""
+    captured = []
+    logic.composite_chameleons = lambda settings, canvas, source, jobs: captured.extend(jobs)
+    try:
+        logic.rng.seed(seed)
+        logic.place_chameleons_smartly(settings)
+    finally:
+        del logic.composite_chameleons  # Back to the class method
+    return captured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chameleon blend-and-paste stage")
+    parser.add_argument("--image", default="Level1.jpg")
+    parser.add_argument("--presets", nargs="+", default=["Easy", "Hard", "Mimic"])
+    args = parser.parse_args()
+
+    logic = HeadlessUI().game_logic
+    img = Image.open(args.image).convert("RGB")
+    img.thumbnail((800, 600))
+    logic.original_image = img
+    logic.img_width, logic.img_height = img.size
+    logic.complexity_map = logic.calculate_complexity_map(img)  # Shared by every run, as prepare_round allows
+    source = np.asarray(img)
+
+    print(f"{'preset':<7} {'count':>5} {'blend ms':>9} {'per cham ms':>12} {'placement ms':>13} {'share':>6}")
+    for preset in args.presets:
+        for count in COUNTS:
+            # Small spacing so even 16 fit
+            settings = dict(logic.difficulty_settings[preset], num_chameleons=count, min_distance_factor=0.05)
+            jobs = round_jobs(logic, settings, count)
+            blend_ms = best_of(lambda: logic.composite_chameleons(settings, source.copy(), source, jobs))
+            blend_ms -= best_of(source.copy)  # The fresh canvas is not part of the stage
+
+            def place():
+                logic.rng.seed(count)
+                logic.place_chameleons_smartly(settings)
+            placement_ms = best_of(place)
+            print(f"{preset:<7} {len(jobs):>5} {blend_ms:>9.2f} {blend_ms / len(jobs):>12.3f} "
+                  f"{placement_ms:>13.2f} {blend_ms / placement_ms:>5.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import sys
+import time
+
+import numpy as np
+from PIL import ImageFilter
+
+from game_functions import FEEDBACK_COLORS
+from headless import HeadlessUI
+from search_trail import SearchTrail
+
+# Checks that the incrementally rendered search trail matches a full redraw and
+# that the cost per click stays flat as clicks pile up in a round.
+CLICKS = 400
+
+
+def main():
+    ui = HeadlessUI()
+    ui.start_round("Level1.jpg", "Medium", seed=1)
+    base = ui.game_logic.game_image_with_chameleons.filter(ImageFilter.GaussianBlur(8))
+    rng = np.random.default_rng(0)
+    trail = SearchTrail(base.size)
+    times = []
+    for i in range(CLICKS):
+        x, y = rng.integers(0, base.width), rng.integers(0, base.height)
+        start = time.perf_counter()
+        trail.splat(x, y, FEEDBACK_COLORS[i % len(FEEDBACK_COLORS)])
+        frame = trail.render(base)
+        times.append((time.perf_counter() - start) * 1000)
+
+    # Redraw everything from the same buffers and compare
+    trail.frame = None
+    full = np.asarray(trail.render(base), dtype=np.int16)
+    worst = int(np.abs(np.asarray(frame, dtype=np.int16) - full).max())
+
+    first, last = np.median(times[:50]), np.median(times[-50:])
+    print(f"{CLICKS} clicks on {base.size[0]}x{base.size[1]}: median ms/click first 50 {first:.2f}, "
+          f"last 50 {last:.2f}, max {max(times):.2f}; worst pixel drift vs full redraw {worst}")
+    # Between full redraws old splats may lag by at most the refresh fraction of their fade
+    sys.exit(1 if worst > 255 * trail.max_alpha * (1 - trail.refresh) + 1 else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# D65 reference white and sRGB <-> XYZ matrices
+WHITE = np.array([0.95047, 1.0, 1.08883])
+RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+XYZ_TO_RGB = np.linalg.inv(RGB_TO_XYZ)
+
+
+def srgb_to_lab(rgb):
+    """Convert an (..., 3) array of 0-255 sRGB values to CIE Lab"""
+    c = rgb / 255.0
+    linear = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = linear @ RGB_TO_XYZ.T / WHITE
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def lab_to_srgb(lab):
+    """Convert an (..., 3) array of CIE Lab values back to 0-255 sRGB"""
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    xyz = np.where(f ** 3 > 216 / 24389, f ** 3, (116 * f - 16) / (24389 / 27)) * WHITE
+    linear = np.clip(xyz @ XYZ_TO_RGB.T, 0, 1)
+    c = np.where(linear > 0.0031308, 1.055 * linear ** (1 / 2.4) - 0.055, 12.92 * linear)
+    return c * 255.0
+
+
+def pick_donor(complexity_map, rect, occupied, rng):
+    """Top-left of a same-sized background patch next to rect whose complexity best matches it.
+
+    Candidates sit one to two chameleon sizes away in eight directions, inside the
+    image and clear of every occupied rectangle. Returns None when none qualifies.
+    """
+    x1, y1, x2, y2 = rect
+    width, height = x2 - x1, y2 - y1
+    img_height, img_width = complexity_map.shape
+    target = complexity_map[y1:y2, x1:x2].mean()
+
+    candidates = []
+    for step in (1.0, 1.5, 2.0):
+        for ox, oy in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)):
+            dx = int(x1 + ox * width * step)
+            dy = int(y1 + oy * height * step)
+            if dx < 0 or dy < 0 or dx + width > img_width or dy + height > img_height:
+                continue
+            if any(dx < ox2 and dx + width > ox1 and dy < oy2 and dy + height > oy1
+                   for ox1, oy1, ox2, oy2 in occupied):
+                continue
+            candidates.append((dx, dy))
+    if not candidates:
+        return None
+
+    # Closest texture complexity wins; a little jitter avoids always copying the same side
+    errors = np.array([abs(complexity_map[dy:dy + height, dx:dx + width].mean() - target) for dx, dy in candidates])
+    errors += np.array([rng.random() for _ in candidates]) * 0.01
+    return candidates[int(np.argmin(errors))]
+
+
+# --- Premultiplied-alpha compositing ---
+#
+# The game composites chameleons as float32 arrays instead of PIL images: every
+# camouflage mode yields a premultiplied color (coverage times color) plus its
+# coverage, and over() lays that onto the background in one pass. The parts
+# that only depend on the silhouette, its size, opacity and color match are
+# computed once and cached, since every chameleon in a round has the same size.
+
+
+def color_match_factor(rgb, color_match):
+    """Per-pixel share of background color: lighter areas take more of it"""
+    return np.where(rgb.mean(axis=2, keepdims=True) > 200, min(1.0, color_match * 1.2), color_match).astype(np.float32)
+
+
+class SilhouetteCache:
+    """Premultiplied-alpha arrays of one silhouette image, cached per size, opacity, color match and feather.
+
+    An entry holds float32 arrays for a width x height silhouette: "alpha" (h, w, 1)
+    coverage after opacity and feathering, "rgb" the resized colors, "factor" the
+    per-pixel color match, "keep" (alpha * (1 - factor) * rgb, the silhouette's own
+    premultiplied share) and "take" (alpha * factor, the background's share).
+    """
+    def __init__(self, chameleon, max_entries=32):
+        self.chameleon = chameleon.convert('RGBA')
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # Blending threads share the cache
+
+    def get(self, width, height, opacity, color_match, feather=0):
+        key = (width, height, opacity, color_match, feather)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+        entry = self.build(width, height, opacity, color_match, feather)
+        with self.lock:
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def build(self, width, height, opacity, color_match, feather):
+        resized = self.chameleon.resize((width, height), Image.Resampling.LANCZOS)
+        alpha = resized.getchannel('A')
+        if feather > 0:
+            alpha = alpha.filter(ImageFilter.GaussianBlur(feather))
+        rgb = np.asarray(resized, dtype=np.float32)[..., :3]
+        alpha = np.asarray(alpha, dtype=np.float32)[..., None] * (min(opacity, 1.0) / 255)
+        factor = color_match_factor(rgb, color_match)
+        return {"alpha": alpha, "rgb": rgb, "factor": factor,
+                "keep": alpha * (1 - factor) * rgb, "take": alpha * factor, "lab": None}
+
+
+def camouflage_average(silhouette, color):
+    """Premultiplied silhouette blended toward one background color"""
+    return silhouette["keep"] + silhouette["take"] * np.asarray(color[:3], dtype=np.float32)
+
+
+def camouflage_local(silhouette, background, low_pass=0, lab=True):
+    """Premultiplied silhouette blended toward the pixels underneath (an RGB uint8 array).
+
+    low_pass blurs the background first (radius in pixels) and lab blends in CIE Lab instead of sRGB.
+    """
+    if low_pass > 0:
+        background = np.asarray(Image.fromarray(background).filter(ImageFilter.GaussianBlur(low_pass)))
+    bg = background.astype(np.float32)
+    if not lab:
+        return silhouette["keep"] + silhouette["take"] * bg
+    if silhouette["lab"] is None:
+        silhouette["lab"] = srgb_to_lab(silhouette["rgb"])  # Same for every chameleon of this size
+    factor = silhouette["factor"]
+    blended = lab_to_srgb(silhouette["lab"] * (1 - factor) + srgb_to_lab(bg) * factor)
+    return np.clip(blended, 0, 255).astype(np.float32) * silhouette["alpha"]
+
+
+def camouflage_mimic(silhouette, donor, background, color_match):
+    """Premultiplied donor patch shifted toward the mean color underneath by color_match"""
+    patch = donor.astype(np.float32)
+    shift = (background.reshape(-1, 3).mean(axis=0) - patch.reshape(-1, 3).mean(axis=0)) * color_match
+    return np.clip(patch + shift, 0, 255) * silhouette["alpha"]
+
+
+def over(region, color, alpha):
+    """region (a uint8 RGB or RGBA array) with premultiplied color of coverage alpha laid over it.
+
+    RGBA regions keep straight alpha: they are premultiplied, composited and divided
+    back out, so translucent uploads stay correct.
+    """
+    under = region[..., :3].astype(np.float32)
+    if region.shape[2] == 3:
+        under *= 1 - alpha
+        under += color
+        return np.clip(under + 0.5, 0, 255).astype(np.uint8)
+    under_alpha = region[..., 3:].astype(np.float32) * (1 / 255)
+    out_alpha = alpha + under_alpha * (1 - alpha)
+    rgb = (color + under * under_alpha * (1 - alpha)) / np.maximum(out_alpha, 1e-6)
+    out = np.empty(region.shape, dtype=np.uint8)
+    out[..., :3] = np.clip(rgb + 0.5, 0, 255)
+    out[..., 3:] = np.clip(out_alpha * 255 + 0.5, 0, 255)
+    return out
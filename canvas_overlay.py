@@ -0,0 +1,160 @@
+import math
+import time
+
+
+class CanvasOverlay:
+    """Pooled canvas items (indicators, highlights, labels) grouped by tag for the current round"""
+
+    # Stipple patterns used as fade steps, from most to least visible
+    FADE_STIPPLES = ("gray75", "gray50", "gray25", "gray12")
+
+    def __init__(self, scheduler, tick_ms=40):
+        self.scheduler = scheduler  # Shared Scheduler, or None when nothing animates (headless)
+        self.canvas = None
+        self.tick_ms = tick_ms
+        self.tick_task = None
+        self.free_items = {}  # kind -> hidden item ids ready for reuse
+        self.active_items = {}  # tag -> list of (kind, item) currently shown
+        self.item_kinds = {}  # item -> kind, for every item this overlay owns
+        self.fades = {}  # item -> fade state dict
+        self.pulses = {}  # item -> running pulse animation task
+
+    def attach(self, canvas):
+        """Bind the overlay to a canvas, dropping pools that belonged to a previous one"""
+        if canvas is self.canvas:
+            self.clear()
+            return
+        self.stop_tick()
+        for item in list(self.pulses):
+            self.stop_pulse(item)
+        self.canvas = canvas
+        self.free_items = {}
+        self.active_items = {}
+        self.item_kinds = {}
+        self.fades = {}
+
+    def canvas_alive(self):
+        if self.canvas is None:
+            return False
+        try:
+            return bool(self.canvas.winfo_exists())
+        except Exception:
+            return False
+
+    def show(self, tag, kind, coords, **options):
+        """Show an item of the given kind ("oval", "rectangle", "text") under a round tag"""
+        if not self.canvas_alive():
+            return None
+
+        pool = self.free_items.get(kind)
+        if pool:
+            item = pool.pop()
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, state="normal", tags=("overlay", tag), **self._reset_stipple(kind), **options)
+            # Reused items may sit below a newer base image
+            self.canvas.tag_raise(item)
+        else:
+            create = getattr(self.canvas, f"create_{kind}")
+            item = create(*coords, tags=("overlay", tag), **options)
+            self.item_kinds[item] = kind
+
+        self.active_items.setdefault(tag, []).append((kind, item))
+        return item
+
+    def fade(self, item, delay_ms=2000, duration_ms=400):
+        """Fade an item out through the stipple steps, then return it to the pool"""
+        if item is None or item not in self.item_kinds:
+            return
+        start = time.monotonic() + delay_ms / 1000.0
+        self.fades[item] = {"start": start, "duration": duration_ms / 1000.0, "step": -1}
+        self.start_tick()
+
+    def release(self, item):
+        """Hide an item and make it available for reuse"""
+        kind = self.item_kinds.get(item)
+        if kind is None:
+            return
+        self.fades.pop(item, None)
+        self.stop_pulse(item)  # The id goes back to the pool; a later indicator must not inherit the pulse
+        for tag, items in self.active_items.items():
+            if (kind, item) in items:
+                items.remove((kind, item))
+                break
+        if self.canvas_alive():
+            self.canvas.itemconfig(item, state="hidden", tags=("overlay",))
+        self.free_items.setdefault(kind, []).append(item)
+
+    def clear(self, tag=None):
+        """Release every item of a tag, or of all tags when no tag is given"""
+        tags = [tag] if tag is not None else list(self.active_items)
+        for t in tags:
+            for kind, item in list(self.active_items.get(t, [])):
+                self.release(item)
+            self.active_items.pop(t, None)
+        if not self.fades:
+            self.stop_tick()
+
+    def item_count(self):
+        """Total number of canvas items owned by the overlay (shown and pooled)"""
+        return len(self.item_kinds)
+
+    def start_tick(self):
+        if self.tick_task is None and self.scheduler is not None:
+            self.tick_task = self.scheduler.every(self.tick_ms, self.tick, group="overlay")
+
+    def stop_tick(self):
+        if self.tick_task is not None:
+            self.scheduler.cancel(self.tick_task)
+            self.tick_task = None
+
+    def tick(self):
+        """Advance every pending fade from one shared timer"""
+        if not self.canvas_alive():
+            self.fades = {}
+            self.stop_tick()
+            return
+
+        now = time.monotonic()
+        steps = len(self.FADE_STIPPLES)
+        for item, state in list(self.fades.items()):
+            elapsed = now - state["start"]
+            if elapsed < 0:
+                continue
+            step = int(elapsed / state["duration"] * steps) if state["duration"] > 0 else steps
+            if step >= steps:
+                self.release(item)
+            elif step != state["step"]:
+                state["step"] = step
+                self.canvas.itemconfig(item, **self._stipple(self.item_kinds[item], self.FADE_STIPPLES[step]))
+
+        if not self.fades:
+            self.stop_tick()
+
+    def pulse(self, item, width=3, amplitude=3, duration_ms=900, beats=3):
+        """Throb an item's outline width a few times, then settle back to width"""
+        if item is None or self.scheduler is None:
+            return
+        self.stop_pulse(item)
+
+        def step(progress):
+            if self.canvas_alive():
+                self.canvas.itemconfig(item, width=width + amplitude * math.sin(progress * math.pi * beats) ** 2)
+
+        def done():
+            self.pulses.pop(item, None)
+            step(1.0)
+
+        self.pulses[item] = self.scheduler.animate(duration_ms, step, done=done, group="overlay")
+
+    def stop_pulse(self, item):
+        task = self.pulses.pop(item, None)
+        if task is not None:
+            self.scheduler.cancel(task)
+
+    def _stipple(self, kind, pattern):
+        if kind == "text":
+            return {"stipple": pattern}
+        return {"outlinestipple": pattern}
+
+    def _reset_stipple(self, kind):
+        return self._stipple(kind, "")
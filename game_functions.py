@@ -1,7 +1,106 @@
+import logging
 import math
 import random
+import time
 import numpy as np
-from PIL import ImageEnhance, Image, ImageFilter, ImageStat,ImageTk
+from PIL import Image, ImageFilter, ImageStat
+from camouflage import (SilhouetteCache, camouflage_average, camouflage_local, camouflage_mimic, over,
+                        pick_donor)
+from game_log import get_logger, timed
+from scout import scout_hints
+
+
+log = get_logger("game")
+placement_log = get_logger("placement")
+
+LOCAL_LOW_PASS = 2  # Blur (px) of the background under opt-in local camouflage
+
+_silhouette_caches = {}  # silhouette file -> SilhouetteCache shared by every GameLogic in the process
+
+
+def silhouette_cache(path, image):
+    """Premultiplied silhouettes of the image loaded from path, kept across rounds and GameLogic instances"""
+    cache = _silhouette_caches.get(path)
+    if cache is None:
+        cache = _silhouette_caches[path] = SilhouetteCache(image)
+    return cache
+
+
+class PlacementError(ValueError):
+    """Raised when an image cannot fit the requested chameleons under the spacing rules"""
+
+
+# Heatmap feedback tiers from closest to farthest. A click falls in the first tier whose band
+# (a multiple of half the average chameleon size) it is inside, else the last one. The
+# messages, miss points and indicator colors below are indexed by tier.
+FEEDBACK_BANDS = (0.5, 1, 2, 4)
+FEEDBACK_MESSAGES = (
+    "🔥 HOT! A chameleon is right under your cursor!",
+    "✨ VERY WARM! You're just pixels away from a chameleon!",
+    "👀 WARM! You're in the right area, look carefully...",
+    "❄️ COOL. You're on the wrong track, try elsewhere.",
+    "🧊 FREEZING! No chameleons hiding anywhere near here.",
+)
+FEEDBACK_POINTS = (20, 15, 10, 5, 0)
+FEEDBACK_COLORS = (
+    "#ff0000",  # Red - very hot
+    "#ff6600",  # Orange - warm
+    "#ffcc00",  # Yellow - getting warmer
+    "#00ccff",  # Light blue - cool
+    "#0066ff",  # Blue - cold
+)
+
+
+# Shop prices in points, and the GameLogic counter each purchase adds a use to
+POWERUP_COSTS = {"time": 20, "steps": 15, "scout": 25}
+POWERUP_USES = {"time": "add_time_uses", "steps": "add_steps_uses", "scout": "scout_uses"}
+
+
+# Seconds on the round timer per difficulty; anything harder gets the Hard time
+ROUND_SECONDS = {"Easy": 90, "Medium": 60, "Hard": 30}
+
+
+def round_seconds(difficulty):
+    return ROUND_SECONDS.get(difficulty, ROUND_SECONDS["Hard"])
+
+
+def feedback_reference(positions):
+    """Half the average chameleon size; the unit the feedback bands are measured in"""
+    return sum(max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in positions) / len(positions) / 2
+
+
+def feedback_tier(distance, ref):
+    for tier, limit in enumerate(FEEDBACK_BANDS):
+        if distance < ref * limit:
+            return tier
+    return len(FEEDBACK_BANDS)
+
+
+def evaluate_clicks(positions, xs, ys):
+    """Score many clicks against one round's chameleon rects at once.
+
+    Returns a dict of arrays, one entry per click: "hits" (index of the rect clicked,
+    or -1), "distances" to the nearest chameleon center, feedback "tiers" and the
+    "points" a miss earns. Uses the same bands as the interactive path.
+    """
+    xs = np.asarray(xs, dtype=np.float64).ravel()
+    ys = np.asarray(ys, dtype=np.float64).ravel()
+    if not positions:
+        return {"hits": np.full(xs.shape, -1), "distances": np.full(xs.shape, np.inf),
+                "tiers": np.full(xs.shape, len(FEEDBACK_BANDS)), "points": np.zeros(xs.shape, dtype=int)}
+    rects = np.asarray(positions, dtype=np.float64)
+    x1, y1, x2, y2 = (rects[:, i] for i in range(4))
+
+    # clicks x rects; the first matching rect wins, as in handle_click
+    inside = (x1 <= xs[:, None]) & (xs[:, None] <= x2) & (y1 <= ys[:, None]) & (ys[:, None] <= y2)
+    hits = np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+    distances = np.hypot(xs[:, None] - (x1 + x2) / 2, ys[:, None] - (y1 + y2) / 2).min(axis=1)
+
+    ref = feedback_reference(positions)
+    tiers = np.searchsorted(np.array([ref * limit for limit in FEEDBACK_BANDS]), distances, side="right")
+    points = np.where(hits >= 0, 0, np.array(FEEDBACK_POINTS)[tiers])  # Hits score through finding, not proximity
+    return {"hits": hits, "distances": distances, "tiers": tiers, "points": points}
+
 
 class GameLogic:
     def __init__(self, game_ui):
@@ -35,7 +134,8 @@ class GameLogic:
                 "complexity_weight": 0.4,
                 "color_weight": 0.3,
                 "edge_weight": 0.3,
-                "min_distance_factor": 0.2
+                "min_distance_factor": 0.2,
+                "scout_fuzz": 1.0  # Scout hint radius in chameleon sizes
             },
             "Medium": {
                 "size_factor": 0.12, 
@@ -45,7 +145,8 @@ class GameLogic:
                 "complexity_weight": 0.5,
                 "color_weight": 0.3,
                 "edge_weight": 0.2,
-                "min_distance_factor": 0.15
+                "min_distance_factor": 0.15,
+                "scout_fuzz": 1.5
             },
             "Hard": {
                 "size_factor": 0.09, 
@@ -55,134 +156,67 @@ class GameLogic:
                 "complexity_weight": 0.6,
                 "color_weight": 0.3,
                 "edge_weight": 0.1,
-                "min_distance_factor": 0.1
+                "min_distance_factor": 0.1,
+                "scout_fuzz": 2.2
+            },
+            "Mimic": {
+                "size_factor": 0.09, 
+                "num_chameleons": 7, 
+                "opacity": 0.9, 
+                "color_match": 0.6,
+                "complexity_weight": 0.7,
+                "color_weight": 0.3,
+                "edge_weight": 0.0,
+                "min_distance_factor": 0.1,
+                "scout_fuzz": 2.2,
+                "camouflage": "mimic",  # Copy the texture of a neighboring patch into the silhouette
+                "mimic_feather": 2
             }
         }
         # Initialize attributes
         self.found = False
         self.add_time_uses = 1
         self.add_steps_uses = 1
+        self.scout_uses = 1
+        self.scout_hints = []  # (x, y, radius) per chameleon, worked out at placement
         self.click_radius = 20
         self.last_click_pos = None  # Track the last click position for heatmap visualization
         self.heatmap_indicators = []  # Initialize for tracking indicators
+        self.rng = random.Random()  # Per-round generator so puzzles can be reproduced from a seed
+        self.placement_strategy = "poisson"  # "poisson" (guaranteed spacing) or "sampled" (legacy)
+        # Opt-in: tiers without their own "camouflage" blend toward the pixels underneath
+        # (low-passed by LOCAL_LOW_PASS) instead of one average color; the start screen toggles it
+        self.local_camouflage = getattr(game_ui, 'local_camouflage', False)
+        self.last_error = None  # Why the last reset_game failed, for the UI
+        self.complexity_map = None  # Complexity map of the current round's image
+        self.round_seed = None
+        self.round_difficulty = None
+        self.round_points = 0  # Points earned this round (normal mode only)
+        self.round_started = 0.0
+        self.round_reported = False  # The finished round has been handed to the UI's score store
         
         self.load_chameleon_image()
 
     def load_chameleon_image(self):
         try:
             self.chameleon_image = Image.open("chameleon_silhouette.png")
+            self.chameleon_image.load()  # Decode now rather than lazily in the first placement
             self.chameleon_width, self.chameleon_height = self.chameleon_image.size
+            self.silhouettes = silhouette_cache("chameleon_silhouette.png", self.chameleon_image)
         except Exception as e:
-            print(f"Error: chameleon_silhouette.png not found. {e}")
+            log.error("chameleon_silhouette.png not found: %s", e)
             
     def reset_game(self):
        try:
-           print("DEBUG: Starting reset_game()")
-           print(f"DEBUG: Story mode: {self.story_mode}")
-        
-           # Handle image loading differently for story mode
-           if self.story_mode:
-               print("DEBUG: Loading image in story mode")
-               # For story mode, use the image already loaded in game_ui
-               if hasattr(self.game_ui, 'original_image') and self.game_ui.original_image is not None:
-                   self.original_image = self.game_ui.original_image
-                   print("DEBUG: Using game_ui.original_image")
-               else:
-                   print("DEBUG: game_ui.original_image not available, trying image_file")
-                   if hasattr(self.game_ui, 'image_file') and self.game_ui.image_file is not None:
-                       self.original_image = Image.open(self.game_ui.image_file)
-                       print(f"DEBUG: Loaded from image_file: {self.game_ui.image_file}")
-                   else:
-                       raise ValueError("No image available in story mode")
-           else:
-               print("DEBUG: Loading image in normal mode")
-               # For normal mode, load from uploaded file
-               if hasattr(self.game_ui, 'image_file') and self.game_ui.image_file is not None:
-                   self.original_image = Image.open(self.game_ui.image_file)
-                   print(f"DEBUG: Loaded from image_file: {self.game_ui.image_file}")
-               else:
-                   raise ValueError("No image file available")
-        
-           if self.original_image is None:
-               raise ValueError("Image is None after loading")
-        
-           print(f"DEBUG: Image loaded, size: {self.original_image.size}")
-        
-           # Resize the image
-           self.original_image.thumbnail((800, 600))
-           self.img_width, self.img_height = self.original_image.size
-           print(f"DEBUG: Image resized to: {self.img_width}x{self.img_height}")
-    
-           # Get difficulty settings
-           if self.story_mode:
-              difficulty = self.game_ui.current_story_difficulty
-           else:
-              difficulty = self.game_ui.difficulty.get()
-        
-           print(f"DEBUG: Difficulty: {difficulty}")
-        
-           if not hasattr(self, 'difficulty_settings') or difficulty not in self.difficulty_settings:
-               print(f"DEBUG: Invalid difficulty or missing settings: {difficulty}")
-               raise ValueError(f"Invalid difficulty settings for: {difficulty}")
-        
-           settings = self.difficulty_settings[difficulty]
-           print(f"DEBUG: Using settings: {settings}")
-    
-           # Reset game state
-           self.click_count = 0
-           self.chameleon_positions = []
-           self.found_chameleons = []
-           self.found = False
-           self.last_click_pos = None
-           self.heatmap_indicators = []
-    
-           # Adjust max clicks based on difficulty
-           self.max_clicks = 10 + settings["num_chameleons"]
-           print(f"DEBUG: Max clicks set to: {self.max_clicks}")
-    
-           # Reset powerup uses
-           self.add_time_uses = 1
-           self.add_steps_uses = 1
-        
-           # Check if chameleon image exists
-           if not hasattr(self, 'chameleon_image') or self.chameleon_image is None:
-               print("DEBUG: chameleon_image not loaded")
-               raise ValueError("Chameleon image not loaded")
-        
-           print("DEBUG: About to place chameleons")
-    
-           # Place chameleons strategically
-           self.game_image_with_chameleons = self.place_chameleons_smartly(settings)
-        
-           if self.game_image_with_chameleons is None:
-               raise ValueError("Failed to place chameleons - returned None")
-        
-           print("DEBUG: Chameleons placed successfully")
-        
-           # Update UI elements
-           try:
-               self.game_ui.game_image = ImageTk.PhotoImage(self.game_image_with_chameleons)
-               self.game_ui.game_canvas.create_image(0, 0, image=self.game_ui.game_image, anchor="nw")
-               self.game_ui.show_message(f"Find {len(self.chameleon_positions)} chameleon{'s' if len(self.chameleon_positions) > 1 else ''}! Clicks left: {self.max_clicks}", False)
-           except Exception as ui_error:
-               print(f"DEBUG: UI update error: {ui_error}")
-               # Continue even if UI update fails
-    
-           # Update powerup buttons
-           if hasattr(self.game_ui, 'update_powerup_buttons'):
-             try:
-                 self.game_ui.update_powerup_buttons()
-             except Exception as powerup_error:
-                 print(f"DEBUG: Powerup button update error: {powerup_error}")
-    
-        
-           print("DEBUG: reset_game completed successfully")
+           self.last_error = None
+           image, difficulty, seed = self.round_request()
+           self.prepare_round(image, difficulty, seed=seed)
+           self.present_round()
            return True
         
        except Exception as e:
-           print(f"ERROR in reset_game: {e}")
-           import traceback
-           traceback.print_exc()
+           self.last_error = str(e)
+           log.exception("reset_game failed: %s", e)
         
            # Show error message to user
            try:
@@ -195,46 +229,150 @@ class GameLogic:
             
         
 
-    def get_average_color(self, image, x, y, width, height):
-        # Crop a region and return the average color for blending
-        crop = image.crop((x, y, x + width, y + height))
-        avg_color = crop.resize((1, 1), Image.Resampling.LANCZOS).getpixel((0, 0))
-        return avg_color[:3] if len(avg_color) == 4 else avg_color
+    def round_request(self):
+        """Read what the UI wants built next: (image, difficulty, seed).
 
-    def blend_chameleon(self, chameleon, bg_color, opacity, color_match):
-        # Blend the chameleon with the background color
-        copy = chameleon.copy()
-        if opacity < 1.0:
-            if len(chameleon.split()) == 4:
-                r, g, b, a = chameleon.split()
-                a = ImageEnhance.Brightness(a).enhance(opacity)
+        Cheap and meant for the Tk thread; the image is opened lazily so the decode
+        happens in prepare_round, which can then run on a worker thread.
+        """
+        # Handle image loading differently for story mode
+        if self.story_mode:
+            # For story mode, use the image already loaded in game_ui
+            if hasattr(self.game_ui, 'original_image') and self.game_ui.original_image is not None:
+                self.original_image = self.game_ui.original_image
             else:
-                r, g, b = chameleon.split()
-                a = Image.new('L', chameleon.size, int(255 * opacity))
-            copy = Image.merge('RGBA', (r, g, b, a))
-
-        # Apply adaptive color matching
-        pixels = copy.load()
-        for x in range(copy.width):
-            for y in range(copy.height):
-                if copy.mode == 'RGBA':
-                    r, g, b, a = pixels[x, y]
-                    if a == 0: continue
-                    
-                    # More sophisticated color blending based on pixel brightness
-                    brightness = (r + g + b) / 3
-                    blend_factor = color_match
-                    
-                    # Lighter areas get more background color
-                    if brightness > 200:
-                        blend_factor = min(1.0, color_match * 1.2)
-                    
-                    r = int(r * (1 - blend_factor) + bg_color[0] * blend_factor)
-                    g = int(g * (1 - blend_factor) + bg_color[1] * blend_factor)
-                    b = int(b * (1 - blend_factor) + bg_color[2] * blend_factor)
-                    
-                    pixels[x, y] = (r, g, b, a)
-        return copy
+                log.debug("No story image on the UI, opening %s", getattr(self.game_ui, 'image_file', None))
+                if hasattr(self.game_ui, 'image_file') and self.game_ui.image_file is not None:
+                    self.original_image = Image.open(self.game_ui.image_file)
+                else:
+                    raise ValueError("No image available in story mode")
+        else:
+            # For normal mode, load from uploaded file
+            if hasattr(self.game_ui, 'image_file') and self.game_ui.image_file is not None:
+                self.original_image = Image.open(self.game_ui.image_file)
+            else:
+                raise ValueError("No image file available")
+     
+        if self.original_image is None:
+            raise ValueError("Image is None after loading")
+     
+        # Get difficulty settings
+        if self.story_mode:
+           difficulty = self.game_ui.current_story_difficulty
+        else:
+           difficulty = self.game_ui.difficulty.get()
+     
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Round requested", extra={"fields": {"story": self.story_mode, "difficulty": difficulty,
+                                                            "size": self.original_image.size}})
+        
+        # Seeded by the UI when it asks for a specific puzzle (e.g. trace replay)
+        return self.original_image, difficulty, getattr(self.game_ui, 'puzzle_seed', None)
+
+    def present_round(self):
+        """Show the prepared round on the UI"""
+        if hasattr(self.game_ui, 'overlay'):
+            self.game_ui.overlay.clear()  # Drop last round's indicators and highlights in one call
+    
+        # Update UI elements
+        try:
+            self.game_ui.show_canvas_image(self.game_image_with_chameleons)
+            self.game_ui.show_message(f"Find {len(self.chameleon_positions)} chameleon{'s' if len(self.chameleon_positions) > 1 else ''}! Clicks left: {self.max_clicks}", False)
+        except Exception as ui_error:
+            log.warning("UI update error: %s", ui_error)
+            # Continue even if UI update fails
+ 
+        # Update powerup buttons
+        if hasattr(self.game_ui, 'update_powerup_buttons'):
+          try:
+              self.game_ui.update_powerup_buttons()
+          except Exception as powerup_error:
+              log.warning("Powerup button update error: %s", powerup_error)
+
+    def prepare_round(self, image, difficulty, seed=None, complexity_map=None):
+        """Set up a round on image without touching the UI and return the composite.
+
+        Seeds the round, resets per-round state and places the chameleons. A precomputed
+        complexity_map for the resized image may be passed to skip that analysis.
+        """
+        # Resize the image
+        self.original_image = image
+        self.original_image.thumbnail((800, 600))
+        self.img_width, self.img_height = self.original_image.size
+        if not hasattr(self, 'difficulty_settings') or difficulty not in self.difficulty_settings:
+            raise ValueError(f"Invalid difficulty settings for: {difficulty}")
+     
+        settings = self.difficulty_settings[difficulty]
+ 
+        # Seed the round: a requested seed or a fresh one
+        self.round_seed = seed if seed is not None else random.randrange(2**32)
+        self.rng.seed(self.round_seed)
+ 
+        # Reset game state
+        self.chameleon_positions = []
+        self.found_chameleons = []
+        self.complexity_map = complexity_map
+        self.round_difficulty = difficulty
+        self.reset_round_state(settings)
+     
+        # Check if chameleon image exists
+        if not hasattr(self, 'chameleon_image') or self.chameleon_image is None:
+            raise ValueError("Chameleon image not loaded")
+ 
+        # Place chameleons strategically
+        with timed(placement_log, "Placed chameleons", difficulty=difficulty, seed=self.round_seed,
+                   size=f"{self.img_width}x{self.img_height}", precomputed=complexity_map is not None) as fields:
+            self.game_image_with_chameleons = self.place_chameleons_smartly(settings)
+            fields["placed"] = len(self.chameleon_positions)
+            fields["max_clicks"] = self.max_clicks
+     
+        if self.game_image_with_chameleons is None:
+            raise ValueError("Failed to place chameleons - returned None")
+        
+        # Scout hints come from the same complexity map, so using one later is a lookup
+        if self.complexity_map is None:
+            self.complexity_map = self.calculate_complexity_map(self.original_image)
+        self.scout_hints = scout_hints(self.complexity_map, self.chameleon_positions, settings["scout_fuzz"], self.rng)
+        self.round_started = time.monotonic()
+        return self.game_image_with_chameleons
+
+    def reset_round_state(self, settings):
+        """Clear clicks, finds, points and powerups for a new round"""
+        self.click_count = 0
+        self.found = False
+        self.last_click_pos = None
+        self.heatmap_indicators = []
+        self.round_points = 0
+        self.round_reported = False
+        
+        # Adjust max clicks based on difficulty
+        self.max_clicks = 10 + settings["num_chameleons"]
+        
+        # Reset powerup uses
+        self.add_time_uses = 1
+        self.add_steps_uses = 1
+        self.scout_uses = 1
+
+    def puzzle_state(self):
+        """The placed round as plain data, to share one puzzle between processes or players"""
+        return {
+            "difficulty": self.round_difficulty,
+            "seed": self.round_seed,
+            "size": (self.img_width, self.img_height),
+            "positions": list(self.chameleon_positions),
+            "hints": list(self.scout_hints),
+        }
+
+    def load_puzzle(self, state):
+        """Start a fresh round on a puzzle from puzzle_state without placing anything"""
+        self.round_difficulty = state["difficulty"]
+        self.round_seed = state["seed"]
+        self.img_width, self.img_height = state["size"]
+        self.chameleon_positions = [tuple(rect) for rect in state["positions"]]
+        self.found_chameleons = [False] * len(self.chameleon_positions)
+        self.scout_hints = [tuple(hint) for hint in state.get("hints", [])]
+        self.reset_round_state(self.difficulty_settings[self.round_difficulty])
+        self.round_started = time.monotonic()
 
     def calculate_complexity_map(self, img):
         """Calculate a complexity map for the image (higher values = more complex areas)"""
@@ -279,12 +417,14 @@ class GameLogic:
         # Use complexity to find good positions
         candidates = []
         margin = int(width * 0.2)  # Keep away from image edges
+        if self.img_width - width - margin < margin or self.img_height - height - margin < margin:
+            raise PlacementError("Image is too small for chameleons of this difficulty.")
         
         # Generate random positions weighted by complexity
         for _ in range(num_positions * 4):  # Generate more than needed to select from
             # Generate random position
-            x = random.randint(margin, self.img_width - width - margin)
-            y = random.randint(margin, self.img_height - height - margin)
+            x = self.rng.randint(margin, self.img_width - width - margin)
+            y = self.rng.randint(margin, self.img_height - height - margin)
             
             # Calculate average complexity in this region
             region_complexity = np.mean(complexity_map[y:y+height, x:x+width])
@@ -314,20 +454,102 @@ class GameLogic:
         candidates.sort(key=lambda c: c[4], reverse=True)
         return candidates[:num_positions]
     
-    def place_chameleons_smartly(self, settings):
-        """Place chameleons at smart positions based on image analysis and difficulty"""
-        img = self.original_image.copy()
-        num_chameleons = settings["num_chameleons"]
-        
+    def calculate_score_field(self, settings, width, height, complexity_map, stride):
+        """Hiding score for every stride-aligned chameleon position, computed with summed-area tables"""
+        margin = int(width * 0.2)  # Keep away from image edges
+        max_x = self.img_width - width - margin
+        max_y = self.img_height - height - margin
+        if max_x < margin or max_y < margin:
+            return None, None, None
+        xs = np.arange(margin, max_x + 1, stride)
+        ys = np.arange(margin, max_y + 1, stride)
+
+        def window_means(data):
+            # Mean of data over every width x height window with top-left at (ys, xs)
+            sat = np.zeros((data.shape[0] + 1, data.shape[1] + 1) + data.shape[2:], dtype=np.float64)
+            sat[1:, 1:] = data.cumsum(axis=0).cumsum(axis=1)
+            top, left = ys[:, None], xs[None, :]
+            sums = (sat[top + height, left + width] - sat[top, left + width]
+                    - sat[top + height, left] + sat[top, left])
+            return sums / (width * height)
+
+        # Same terms as find_candidate_positions, for all positions at once
+        region_complexity = window_means(complexity_map)
+        rgb = np.asarray(self.original_image.convert('RGB'), dtype=np.float64)
+        mean = window_means(rgb)
+        variance = np.maximum(window_means(rgb * rgb) - mean * mean, 0)
+        color_variability = np.sqrt(variance).mean(axis=2)
+
+        center_x, center_y = self.img_width / 2, self.img_height / 2
+        dx = xs[None, :] + width / 2 - center_x
+        dy = ys[:, None] + height / 2 - center_y
+        edge_factor = np.sqrt(dx**2 + dy**2) / math.sqrt(center_x**2 + center_y**2)
+
+        score = (
+            region_complexity * settings["complexity_weight"] +
+            (color_variability / 255) * settings["color_weight"] +
+            edge_factor * settings["edge_weight"]
+        )
+        return score, xs, ys
+
+    def select_positions_poisson(self, settings, num_chameleons, min_distance):
+        """Score-weighted Poisson-disk selection: spacing and non-overlap are guaranteed or PlacementError is raised"""
+        width = int(min(self.img_width, self.img_height) * settings["size_factor"])
+        height = int(width * self.chameleon_height / self.chameleon_width)
+        if width < 1 or height < 1:
+            raise PlacementError("Image is too small to hide any chameleons.")
+
+        stride = max(2, width // 10)
+        score, xs, ys = self.calculate_score_field(settings, width, height, self.complexity_map, stride)
+        if score is None:
+            raise PlacementError("Image is too small for chameleons of this difficulty.")
+
+        # Weighted random priorities (Efraimidis-Spirakis keys): higher scores tend to be tried first
+        np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        weights = np.maximum(score.ravel(), 1e-6)
+        keys = np.log(np_rng.random(weights.size)) / weights
+        order = np.argsort(-keys)
+
+        # Greedy acceptance against a spatial hash; any conflict lies in a neighbouring cell
+        cell = max(min_distance, width, height, 1)
+        min_distance_sq = min_distance * min_distance
+        grid = {}
+        selected_positions = []
+        for index in order:
+            row, col = divmod(int(index), len(xs))
+            x, y = int(xs[col]), int(ys[row])
+            gx, gy = int((x + width / 2) // cell), int((y + height / 2) // cell)
+            conflict = False
+            for nx in (gx - 1, gx, gx + 1):
+                for ny in (gy - 1, gy, gy + 1):
+                    for sx, sy in grid.get((nx, ny), ()):
+                        ddx, ddy = sx - x, sy - y
+                        if ddx * ddx + ddy * ddy < min_distance_sq or (abs(ddx) < width and abs(ddy) < height):
+                            conflict = True
+                            break
+                    if conflict:
+                        break
+                if conflict:
+                    break
+            if conflict:
+                continue
+            grid.setdefault((gx, gy), []).append((x, y))
+            selected_positions.append((x, y, width, height))
+            if len(selected_positions) >= num_chameleons:
+                return selected_positions
+
+        raise PlacementError(
+            f"Only {len(selected_positions)} of {num_chameleons} chameleons fit this image with the required spacing. "
+            "Try an easier difficulty or a larger image."
+        )
+
+    def select_positions_sampled(self, settings, num_chameleons, min_distance):
+        """Legacy selection from random candidates; may fall back to positions that break the spacing"""
         # Get candidate positions with difficulty-based parameters
         candidates = self.find_candidate_positions(settings, num_positions=num_chameleons*3)
         
-        # Minimum distance between chameleons (varies by difficulty)
-        min_distance = min(self.img_width, self.img_height) * settings["min_distance_factor"]
-        
         # Select positions ensuring minimum distance between chameleons
         selected_positions = []
-        self.chameleon_positions = []
         
         for x, y, width, height, score in candidates:
             # Check if too close to already selected positions
@@ -340,7 +562,6 @@ class GameLogic:
             
             if not too_close:
                 selected_positions.append((x, y, width, height))
-                self.chameleon_positions.append((x, y, x + width, y + height))
                 
                 if len(selected_positions) >= num_chameleons:
                     break
@@ -350,21 +571,73 @@ class GameLogic:
             for i in range(len(selected_positions), min(num_chameleons, len(candidates))):
                 x, y, width, height, _ = candidates[i]
                 selected_positions.append((x, y, width, height))
-                self.chameleon_positions.append((x, y, x + width, y + height))
+        return selected_positions
+
+    def place_chameleons_smartly(self, settings):
+        """Place chameleons at smart positions based on image analysis and difficulty"""
+        img = self.original_image
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if img.mode in ("LA", "PA") or "transparency" in img.info else "RGB")
+        source = np.asarray(img)  # Donor patches come from the untouched image
+        canvas = source.copy()  # Chameleons are composited into this in place
+        num_chameleons = settings["num_chameleons"]
+        
+        # Minimum distance between chameleons (varies by difficulty)
+        min_distance = min(self.img_width, self.img_height) * settings["min_distance_factor"]
+        
+        # Computed once per round (unless supplied); placement and mimic donors both use it
+        if self.complexity_map is None:
+            self.complexity_map = self.calculate_complexity_map(self.original_image)
+        
+        if self.placement_strategy == "poisson":
+            selected_positions = self.select_positions_poisson(settings, num_chameleons, min_distance)
+        else:
+            selected_positions = self.select_positions_sampled(settings, num_chameleons, min_distance)
+        self.chameleon_positions = [(x, y, x + width, y + height) for x, y, width, height in selected_positions]
         
         # Initialize found_chameleons list based on final number of chameleons
         self.found_chameleons = [False] * len(self.chameleon_positions)
         
-        # Place chameleons at selected positions
+        # Donors draw from the round's rng, so pick them in order before any blending
+        camouflage = self.camouflage_mode(settings)
+        jobs = []
         for x, y, width, height in selected_positions:
-            bg_color = self.get_average_color(img, x, y, width, height)
-            resized = self.chameleon_image.resize((width, height), Image.Resampling.LANCZOS)
-            blended = self.blend_chameleon(resized, bg_color, settings["opacity"], settings["color_match"])
-            img.paste(blended, (x, y), blended)
-            
-            
-                
-        return img
+            donor = None
+            if camouflage == "mimic":
+                donor = pick_donor(self.complexity_map, (x, y, x + width, y + height), self.chameleon_positions, self.rng)
+            jobs.append((x, y, width, height, donor))
+        
+        self.composite_chameleons(settings, canvas, source, jobs)
+        return Image.fromarray(canvas, img.mode)
+
+    def composite_chameleons(self, settings, canvas, source, jobs):
+        """Blend each (x, y, width, height, donor) job and lay it onto canvas in place, in job order"""
+        # Serial on purpose: each blend is well under a millisecond, so a thread pool
+        # only added dispatch overhead (see bench_composite.py)
+        for x, y, width, height, donor in jobs:
+            color, alpha = self.blend_at(settings, canvas, source, x, y, width, height, donor)
+            region = canvas[y:y + height, x:x + width]
+            region[...] = over(region, color, alpha)
+
+    def camouflage_mode(self, settings):
+        return settings.get("camouflage", "local" if self.local_camouflage else "average")
+
+    def blend_at(self, settings, canvas, source, x, y, width, height, donor):
+        """Premultiplied color and coverage of the silhouette camouflaged against canvas at (x, y)"""
+        camouflage = self.camouflage_mode(settings)
+        feather = settings.get("mimic_feather", 2) if donor is not None else 0
+        silhouette = self.silhouettes.get(width, height, settings["opacity"], settings["color_match"], feather)
+        underneath = canvas[y:y + height, x:x + width, :3]
+        if donor is not None:
+            dx, dy = donor
+            color = camouflage_mimic(silhouette, source[dy:dy + height, dx:dx + width, :3], underneath,
+                                     settings["color_match"])
+        elif camouflage in ("local", "mimic"):  # Mimic without a usable donor falls back to local blending
+            low_pass = settings.get("camouflage_blur", LOCAL_LOW_PASS if camouflage == "local" else 0)
+            color = camouflage_local(silhouette, underneath, low_pass=low_pass)
+        else:
+            color = camouflage_average(silhouette, underneath.reshape(-1, 3).mean(axis=0))
+        return color, silhouette["alpha"]
 
     def calculate_distance(self, x, y):
         # Calculate distance from click to nearest chameleon center
@@ -381,22 +654,11 @@ class GameLogic:
         if not self.chameleon_positions:
             return "No chameleons placed yet!"
             
-        # Use the average size of chameleons as reference
-        ref = 0
-        for x1, y1, x2, y2 in self.chameleon_positions:
-            ref += max(x2 - x1, y2 - y1)
-        ref = ref / len(self.chameleon_positions) / 2
-        
-        if distance < ref / 2:
-            return "🔥 HOT! A chameleon is right under your cursor!"
-        elif distance < ref:
-            return "✨ VERY WARM! You're just pixels away from a chameleon!"
-        elif distance < ref * 2:
-            return "👀 WARM! You're in the right area, look carefully..."
-        elif distance < ref * 4:
-            return "❄️ COOL. You're on the wrong track, try elsewhere."
-        else:
-            return "🧊 FREEZING! No chameleons hiding anywhere near here."
+        return FEEDBACK_MESSAGES[feedback_tier(distance, feedback_reference(self.chameleon_positions))]
+
+    def evaluate_clicks(self, xs, ys):
+        """Vectorized hit test and feedback for many clicks on the current round, with no UI side effects"""
+        return evaluate_clicks(self.chameleon_positions, xs, ys)
 
     def handle_click(self, event,):
             # Process a click event: check if chameleon is found or give feedback
@@ -415,6 +677,7 @@ class GameLogic:
                   self.game_ui.show_message(f"Game Over! Found {found_count}/{total_count}", False)
                   if self.game_ui.sound_on:
                        self.game_ui.gameover_sound.play()
+              self.report_round(False)
               return
 
          self.click_count += 1
@@ -441,6 +704,7 @@ class GameLogic:
                         self.found = True
                         clicks_used = self.click_count
                         efficiency = round (len(self.found_chameleons) / clicks_used) * 100
+                        self.report_round(True)
                     
                         # Story Mode success handling
                         if self.story_mode:
@@ -484,6 +748,7 @@ class GameLogic:
             points_earned = self.award_points(dist)
             if points_earned > 0 and not self.story_mode:  # Only award points in normal mode
                 self.game_ui.points += points_earned
+                self.round_points += points_earned
                 self.game_ui.update_points_display()
             msg = self.get_feedback(dist)
             clicks_left = self.max_clicks - self.click_count
@@ -497,75 +762,56 @@ class GameLogic:
         # Early return if no chameleons placed
         if not self.chameleon_positions:
           return
-        # Calculate reference distance from average chameleon size
         try:
-            ref = 0
-            for x1, y1, x2, y2 in self.chameleon_positions:
-               ref += max(x2 - x1, y2 - y1)
-            ref = ref / len(self.chameleon_positions) / 2
-        
-        # Determine color based on distance
-            if distance < ref / 2:
-              color = "#ff0000"  # Red - very hot
-            elif distance < ref:
-              color = "#ff6600"  # Orange - warm
-            elif distance < ref * 2:
-              color = "#ffcc00"  # Yellow - getting warmer
-            elif distance < ref * 4:
-              color = "#00ccff"  # Light blue - cool
-            else:
-              color = "#0066ff"  # Blue - cold
+            color = FEEDBACK_COLORS[feedback_tier(distance, feedback_reference(self.chameleon_positions))]
         
              # Create a pulsing circle effect
             size = 20
+            overlay = self.game_ui.overlay
         
-            # Clean up old indicators
+            # Return old indicators to the pool
             for indicator in self.heatmap_indicators:
-              try:
-                 self.game_ui.game_canvas.delete(indicator)
-              except:
-                pass
-        
-            # Create new indicator
-            indicator = self.game_ui.game_canvas.create_oval(
-            x - size, y - size, x + size, y + size, 
-            outline=color, width=2, fill="", tags="heatmap"
+                overlay.release(indicator)
+        
+            # Show indicator from the pool
+            indicator = overlay.show(
+            "heatmap", "oval", (x - size, y - size, x + size, y + size),
+            outline=color, width=2, fill=""
             )
-            self.heatmap_indicators = [indicator]
+            self.heatmap_indicators = [indicator] if indicator is not None else []
+        
+            # Fade the indicator out through the overlay's shared tick
+            overlay.fade(indicator, delay_ms=2000)
         
-            # Schedule the indicator to fade out
-            self.game_ui.window.after(2000, lambda: self.fade_indicator(indicator))
+            # The click also stays on the search trail under the blur
+            if hasattr(self.game_ui, 'mark_trail'):
+                self.game_ui.mark_trail(x, y, color)
         
         except Exception as e:
-          print(f"Error in heatmap indicator: {e}")
+          log.warning("Error in heatmap indicator: %s", e)
           return
     
     def fade_indicator(self, indicator):
-        """Fade out the heatmap indicator gradually"""
-        try:
-            self.game_ui.game_canvas.delete(indicator)
-            if indicator in self.heatmap_indicators:
-                self.heatmap_indicators.remove(indicator)
-        except:
-            pass  # Indicator might be already deleted
+        """Remove the heatmap indicator and return it to the overlay pool"""
+        self.game_ui.overlay.release(indicator)
+        if indicator in self.heatmap_indicators:
+            self.heatmap_indicators.remove(indicator)
         
     def highlight_chameleons_red(self):
         # Highlight all unfound chameleons with a red border when clicks are over
+        overlay = self.game_ui.overlay
+        overlay.clear("missed")  # Repeated game-over clicks reuse the same items
         for i, (x1, y1, x2, y2) in enumerate(self.chameleon_positions):
             if not self.found_chameleons[i]:
                 # Create a pulsing effect for unfound chameleons
-                outline = self.game_ui.game_canvas.create_rectangle(
-                    x1-3, y1-3, x2+3, y2+3, outline="red", width=4
-                )
-                self.game_ui.game_canvas.create_rectangle(
-                    x1, y1, x2, y2, outline="yellow", width=1
-                )
+                overlay.show("missed", "rectangle", (x1-3, y1-3, x2+3, y2+3), outline="red", width=4)
+                overlay.show("missed", "rectangle", (x1, y1, x2, y2), outline="yellow", width=1)
                 
                 # Create a label showing "Missed!"
                 label_x = (x1 + x2) / 2
                 label_y = y1 - 15
-                self.game_ui.game_canvas.create_text(
-                    label_x, label_y, text="Missed!", fill="red", font=("Arial", 12, "bold")
+                overlay.show(
+                    "missed", "text", (label_x, label_y), text="Missed!", fill="red", font=("Arial", 12, "bold")
                 )
     
     def highlight_chameleon(self, index):
@@ -573,17 +819,24 @@ class GameLogic:
         if not self.chameleon_positions or index >= len(self.chameleon_positions):
             return
         x1, y1, x2, y2 = self.chameleon_positions[index]
+        overlay = self.game_ui.overlay
         
         # Create animated highlight
-        self.game_ui.game_canvas.create_rectangle(x1, y1, x2, y2, outline="lime", width=3)
+        box = overlay.show("found", "rectangle", (x1, y1, x2, y2), outline="lime", width=3)
+        overlay.pulse(box)
         
         # Add a "Found!" label above the chameleon
         label_x = (x1 + x2) / 2
         label_y = y1 - 15
-        self.game_ui.game_canvas.create_text(
-            label_x, label_y, text="Found!", fill="lime", font=("Arial", 12, "bold")
+        overlay.show(
+            "found", "text", (label_x, label_y), text="Found!", fill="lime", font=("Arial", 12, "bold")
         )
         
+    def grant_powerup(self, kind):
+        """One more use of a powerup, bought in the shop"""
+        attr = POWERUP_USES[kind]
+        setattr(self, attr, getattr(self, attr) + 1)
+
     def use_add_time(self):
        if self.add_time_uses <= 0 or self.found or not self.game_ui.timer_running:
            return
@@ -607,23 +860,54 @@ class GameLogic:
        self.game_ui.update_points_display()
        self.game_ui.update_powerup_buttons()
        
+    def use_scout(self):
+       """Circle a region holding one of the unfound chameleons; returns the (x, y, radius) shown"""
+       if self.scout_uses <= 0 or self.found or not self.scout_hints:
+           return None
+       unfound = [i for i, found in enumerate(self.found_chameleons) if not found]
+       if not unfound:
+           return None
+       self.scout_uses -= 1
+       x, y, radius = self.scout_hints[self.rng.choice(unfound)]
+       overlay = self.game_ui.overlay
+       overlay.clear("scout")
+       circle = overlay.show("scout", "oval", (x - radius, y - radius, x + radius, y + radius),
+                             outline="#ff00ff", width=3, fill="")
+       overlay.fade(circle, delay_ms=4000, duration_ms=800)
+       self.game_ui.show_message_in_game("Scout: one is hiding in the circle!")
+       self.game_ui.update_points_display()
+       self.game_ui.update_powerup_buttons()
+       return x, y, radius
+       
+    def round_result(self, won):
+        """Summary of the current round for the score store"""
+        found = sum(self.found_chameleons)
+        return {
+            "image": getattr(self.game_ui, 'image_file', None) or "",
+            "difficulty": self.round_difficulty,
+            "story": self.story_mode,
+            "seed": self.round_seed,
+            "found": found,
+            "total": len(self.found_chameleons),
+            "clicks": self.click_count,
+            "max_clicks": self.max_clicks,
+            "won": won,
+            "points": self.round_points,
+            "efficiency": found / self.click_count * 100 if self.click_count else 0.0,
+            "duration_ms": int((time.monotonic() - self.round_started) * 1000),
+        }
+
+    def report_round(self, won):
+        """Hand the finished round to the UI once, if it keeps scores"""
+        if self.round_reported:
+            return
+        self.round_reported = True
+        if hasattr(self.game_ui, 'record_result'):
+            self.game_ui.record_result(self.round_result(won))
+
     def award_points(self, distance):
          """Award points based on how close the click was to a chameleon"""
          if not self.chameleon_positions:
           return 0
     
-        # Use the average size of chameleons as reference
-         ref = 0
-         for x1, y1, x2, y2 in self.chameleon_positions:
-             ref += max(x2 - x1, y2 - y1)
-         ref = ref / len(self.chameleon_positions) / 2
-    
-         if distance < ref / 2:
-             return 20  # Max points for very close
-         elif distance < ref:
-             return 15
-         elif distance < ref * 2:
-             return 10
-         elif distance < ref * 4:
-             return 5
-         return 0  # Too far away
\ No newline at end of file
+         return FEEDBACK_POINTS[feedback_tier(distance, feedback_reference(self.chameleon_positions))]
\ No newline at end of file
@@ -0,0 +1,130 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+# Logging for the game, one logger per subsystem under "chameleon":
+#   game (round flow), placement, ui, scheduler, scores, bundle, server
+#
+# Nothing below WARNING is emitted unless asked for, and every call site passes
+# %-style arguments, so a disabled debug line costs one cached level check.
+# Levels come from configure() or the CHAMELEON_LOG environment variable, e.g.
+#   CHAMELEON_LOG=debug                  everything at DEBUG
+#   CHAMELEON_LOG=placement=debug,ui=info
+# Extra key=value fields (timings, seeds, sizes) go in extra={"fields": {...}}.
+
+ROOT = "chameleon"
+ENV_VAR = "CHAMELEON_LOG"
+FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s%(fields_text)s"
+
+_listener = None
+
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+class FieldsFormatter(logging.Formatter):
+    """Appends a record's structured fields as key=value pairs"""
+    def format(self, record):
+        fields = getattr(record, "fields", None)
+        record.fields_text = " " + " ".join(f"{k}={v}" for k, v in fields.items()) if fields else ""
+        return super().format(record)
+
+
+def parse_levels(spec):
+    """"debug" or "placement=debug,ui=info" -> {subsystem or "": level}"""
+    levels = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure(levels=None, file=None, console=True, queued=True):
+    """Set subsystem levels and outputs; safe to call again to reconfigure.
+
+    levels is a spec string or dict as parse_levels returns ("" is every subsystem);
+    it falls back to CHAMELEON_LOG and then to WARNING. With queued=True records
+    are handed to a background thread, so slow disks and terminals never block
+    the caller.
+    """
+    global _listener
+    shutdown()
+    if levels is None:
+        levels = os.environ.get(ENV_VAR, "")
+    if isinstance(levels, str):
+        levels = parse_levels(levels)
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(levels.get("", "WARNING"))
+    for name, level in levels.items():
+        if name:
+            get_logger(name).setLevel(level)
+
+    handlers = []
+    formatter = FieldsFormatter(FORMAT)
+    if console:
+        handlers.append(logging.StreamHandler())
+    if file:
+        handlers.append(logging.FileHandler(file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if handlers and queued:
+        records = queue.SimpleQueue()
+        root.addHandler(logging.handlers.QueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            root.addHandler(handler)
+    root.propagate = False
+    return root
+
+
+def shutdown():
+    """Flush and stop the background writer, if one is running"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
+
+
+class timed:
+    """Context manager that logs how long its block took, with extra fields.
+
+    When the level is disabled it skips the clock entirely.
+        with timed(log, "placement", seed=seed) as fields:
+            ...
+            fields["placed"] = n
+    """
+    def __init__(self, logger, event, level=logging.DEBUG, **fields):
+        self.logger = logger
+        self.event = event
+        self.level = level
+        self.fields = fields
+        self.start = None
+
+    def __enter__(self):
+        if self.logger.isEnabledFor(self.level):
+            self.start = time.perf_counter()
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.start is not None:
+            self.fields["ms"] = round((time.perf_counter() - self.start) * 1000, 2)
+            if exc_type is not None:
+                self.fields["error"] = exc_type.__name__
+            self.logger.log(self.level, "%s", self.event, extra={"fields": self.fields})
+        return False
@@ -0,0 +1,184 @@
+from PIL import Image, ImageFilter
+from game_functions import POWERUP_COSTS, GameLogic
+from canvas_overlay import CanvasOverlay
+from rendering import OffscreenBackend, OffscreenCanvas, reveal_renderer, reveal_settings
+from search_trail import SearchTrail
+
+
+class Setting:
+    """Minimal stand-in for tk.StringVar used by GameLogic outside of Tk"""
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessUI:
+    """UI host exposing the surface GameLogic uses, rendering offscreen without Tk or sound"""
+    def __init__(self, difficulty="Medium", reveal_style="hard"):
+        self.sound_on = False
+        self.window = None
+        self.image_file = None
+        self.original_image = None
+        self.difficulty = Setting(difficulty)
+        self.current_story_difficulty = difficulty
+        self.points = 0
+        self.puzzle_seed = None
+        self.timer_running = False
+        self.time_left = 0
+        self.paused = False
+        self.last_mouse_x = 0
+        self.last_mouse_y = 0
+        self.last_message = ""
+        self.outcome = None  # "success" / "failure" once a story round ends
+        self.blur_level = 5
+        self.clear_radius = 100
+        self.blurred_image = None
+        self.trail = None
+        self.reveal_style = reveal_style
+        self.reveal = reveal_renderer(reveal_style)
+        self.current_display_image = None
+        self.game_image = None
+        self.image_on_canvas = None
+        self.renderer = OffscreenBackend()
+        self.game_canvas = OffscreenCanvas()
+        self.overlay = CanvasOverlay(None)
+        self.overlay.attach(self.game_canvas)
+        self.game_logic = GameLogic(self)
+
+    def start_round(self, image_file, difficulty, story=False, seed=None):
+        """Prepare a new round the way GameUI.start_game / start_story_level do"""
+        self.image_file = image_file
+        self.difficulty.set(difficulty)
+        self.current_story_difficulty = difficulty
+        self.puzzle_seed = seed
+        self.outcome = None
+        self.paused = False
+        self.game_logic = GameLogic(self)
+        self.game_logic.story_mode = story
+        if story:
+            self.original_image = Image.open(image_file)
+        settings = reveal_settings(difficulty)
+        self.blur_level = settings["blur_level"]
+        self.clear_radius = settings["clear_radius"]
+        try:
+            success = self.game_logic.reset_game()
+        finally:
+            self.puzzle_seed = None
+        self.timer_running = success
+        if not success:
+            return False
+
+        # Same layers as GameUI: blurred composite with a reveal circle on top
+        composite = self.game_logic.game_image_with_chameleons
+        self.game_canvas.config(width=composite.width, height=composite.height)
+        self.blurred_image = composite.filter(ImageFilter.GaussianBlur(self.blur_level))
+        self.trail = SearchTrail(self.blurred_image.size)
+        self.current_display_image = self.blurred_image.copy()
+        self.show_canvas_image(self.current_display_image)
+        return True
+
+    def return_to_menu(self):
+        """Drop the round the way GameUI.return_to_main_menu does"""
+        self.timer_running = False
+        self.paused = False
+        self.original_image = None
+        self.blurred_image = None
+        self.current_display_image = None
+        self.trail = None
+        self.image_file = None
+        self.game_logic = GameLogic(self)
+
+    def show_canvas_image(self, image):
+        """Show an image on the canvas, reusing a single image item like GameUI"""
+        self.game_image = self.renderer.photo(image)
+        if self.image_on_canvas is None:
+            self.image_on_canvas = self.game_canvas.create_image(0, 0, image=self.game_image, anchor="nw")
+        else:
+            self.game_canvas.itemconfig(self.image_on_canvas, image=self.game_image)
+
+    # --- Input handlers mirrored from GameUI ---
+
+    def update_blur(self, event):
+        if self.paused or self.game_logic.found:
+            return
+        self.last_mouse_x, self.last_mouse_y = event.x, event.y
+        self.apply_dynamic_blur(event.x, event.y)
+
+    def apply_dynamic_blur(self, x, y):
+        if self.blurred_image is None or self.image_on_canvas is None:
+            return
+        base = self.trail.render(self.blurred_image) if self.trail else self.blurred_image
+        self.current_display_image = self.reveal.render(base, self.game_logic.game_image_with_chameleons,
+                                                        x, y, self.clear_radius)
+        self.game_image = self.renderer.photo(self.current_display_image)
+        self.game_canvas.itemconfig(self.image_on_canvas, image=self.game_image)
+
+    def mark_trail(self, x, y, color):
+        if self.trail is None:
+            return
+        self.trail.splat(x, y, color)
+        self.reveal.invalidate()
+        self.apply_dynamic_blur(self.last_mouse_x, self.last_mouse_y)
+
+    def frame(self):
+        """The fully composited frame (reveal, indicators, highlights) as an RGB image"""
+        return self.game_canvas.render()
+
+    def buy_powerup(self, kind):
+        cost = POWERUP_COSTS[kind]
+        if self.points >= cost:
+            self.points -= cost
+            self.game_logic.grant_powerup(kind)
+
+    def time_up(self):
+        """The round clock ran out, as in GameUI.time_up"""
+        self.timer_running = False
+        self.time_left = 0
+        if not self.game_logic.found:
+            self.game_logic.report_round(False)
+            if self.game_logic.game_image_with_chameleons is not None:
+                # Unblurred composite with the missed chameleons outlined
+                self.show_canvas_image(self.game_logic.game_image_with_chameleons)
+                self.game_logic.highlight_chameleons_red()
+                if self.game_logic.story_mode:
+                    self.show_story_failure()
+                else:
+                    self.show_message("Time's up! You missed some chameleons!", False)
+
+    def use_powerup(self, kind):
+        if kind == "time":
+            self.game_logic.use_add_time()
+        elif kind == "steps":
+            self.game_logic.use_add_steps()
+        elif kind == "scout":
+            self.game_logic.use_scout()
+
+    # --- Display callbacks used by GameLogic ---
+
+    def show_message(self, msg, success):
+        self.last_message = msg
+
+    def show_message_in_game(self, message):
+        self.last_message = message
+
+    def show_story_success(self):
+        self.outcome = "success"
+        self.timer_running = False
+
+    def show_story_failure(self):
+        self.outcome = "failure"
+        self.timer_running = False
+
+    def update_points_display(self):
+        pass
+
+    def update_powerup_buttons(self):
+        pass
+
+    def update_timer_display(self):
+        pass
@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import base64
+import copy
+import io
+import itertools
+import json
+import logging
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from canvas_overlay import CanvasOverlay
+from game_functions import GameLogic, PlacementError, feedback_reference, feedback_tier, round_seconds
+from game_log import configure as configure_logging, get_logger
+from headless import Setting
+from puzzle_factory import generate_background
+
+# Local multiplayer server: many players hunt on shared puzzles at once.
+#
+# Clients speak newline-delimited JSON over TCP. Every request may carry an "id"
+# that is echoed back. Requests:
+#   {"op": "join", "hunt": name, "image": file or "generated", "difficulty": d}
+#     (files only with --image-dir, named relative to that directory)
+#   {"op": "click", "x": x, "y": y}
+#   {"op": "powerup", "kind": "time" | "steps" | "scout"}  -> scout replies carry a "hint" circle
+#   {"op": "image"}       -> the puzzle composite as base64 PNG
+#   {"op": "standings"}   -> every player in the hunt
+# Each player gets a GameLogic forked from the hunt's puzzle, so clicks, points
+# and powerups follow exactly the same rules as the desktop game.
+
+_worker_logic = None
+log = get_logger("server")
+
+
+def init_worker(log_levels=None):
+    global _worker_logic
+    configure_logging(log_levels, queued=False)  # A forked worker has no listener thread of its own
+    _worker_logic = GameLogic(None)
+
+
+def build_puzzle(image, difficulty, seed, size):
+    """Run placement in a worker process; returns puzzle_state plus the composite as PNG"""
+    from PIL import Image
+    if image == "generated":
+        img = generate_background(seed, size)
+    else:
+        img = Image.open(image).convert("RGB")
+    composite = _worker_logic.prepare_round(img, difficulty, seed=seed)
+    png = io.BytesIO()
+    composite.save(png, "PNG")
+    state = _worker_logic.puzzle_state()
+    state["png"] = png.getvalue()
+    return state
+
+
+class PlayerUI:
+    """The slice of the GameUI surface GameLogic touches, for one remote player"""
+    def __init__(self, difficulty, overlay):
+        self.sound_on = False
+        self.window = None
+        self.points = 0
+        self.difficulty = Setting(difficulty)
+        self.current_story_difficulty = difficulty
+        self.overlay = overlay
+        self.last_message = ""
+        self.deadline = time.monotonic() + round_seconds(difficulty)
+        self.finished = False
+
+    @property
+    def time_left(self):
+        return max(0, self.deadline - time.monotonic())
+
+    @time_left.setter
+    def time_left(self, seconds):
+        self.deadline = time.monotonic() + seconds
+
+    @property
+    def timer_running(self):
+        return not self.finished and self.time_left > 0
+
+    def show_message(self, msg, success):
+        self.last_message = msg
+
+    def show_message_in_game(self, message):
+        self.last_message = message
+
+    def record_result(self, result):
+        self.finished = True
+
+    def update_points_display(self):
+        pass
+
+    def update_powerup_buttons(self):
+        pass
+
+    def update_timer_display(self):
+        pass
+
+
+class Hunt:
+    """One shared puzzle and the players on it"""
+    def __init__(self, name, state):
+        self.name = name
+        self.state = state
+        self.players = {}  # player id -> GameLogic
+
+
+class HuntServer:
+    def __init__(self, workers=None, size=(400, 300), image_dir=None, log_levels=None):
+        self.pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(log_levels,))
+        self.size = size
+        # Clients may only name images inside this directory; None serves generated backgrounds only
+        self.image_dir = os.path.realpath(image_dir) if image_dir else None
+        self.base_logic = GameLogic(None)  # Loaded once; players are shallow copies
+        self.overlay = CanvasOverlay(None)  # No canvas, so highlights and indicators are skipped
+        self.hunts = {}  # name -> Hunt
+        self.pending = {}  # name -> future while its puzzle is generated
+        self.player_ids = itertools.count(1)
+        self.seeds = itertools.count(int(time.time()))
+        self.clicks = 0
+
+    async def hunt(self, name, image, difficulty):
+        """The named hunt, generating its puzzle on the pool the first time it is asked for"""
+        if name in self.hunts:
+            return self.hunts[name]
+        if name not in self.pending:
+            if image != "generated":
+                image = self.image_path(image)
+            if difficulty not in self.base_logic.difficulty_settings:
+                raise ValueError(f"Unknown difficulty: {difficulty}")
+            loop = asyncio.get_running_loop()
+            self.pending[name] = loop.run_in_executor(self.pool, build_puzzle, image, difficulty,
+                                                      next(self.seeds) & 0xFFFFFFFF, self.size)
+        future = self.pending[name]
+        try:
+            state = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.pending.pop(name, None)
+        return self.hunts.setdefault(name, Hunt(name, state))
+
+    def image_path(self, image):
+        """The real path of a client-named image, refusing anything outside image_dir"""
+        if self.image_dir is not None and isinstance(image, str):
+            path = os.path.realpath(os.path.join(self.image_dir, image))
+            if path.startswith(self.image_dir + os.sep) and os.path.isfile(path):
+                return path
+        raise ValueError(f"Unknown image: {image}")
+
+    def join(self, hunt):
+        player = copy.copy(self.base_logic)
+        player.rng = random.Random()  # Scout picks draw from it; a shared one would couple the players
+        player.game_ui = PlayerUI(hunt.state["difficulty"], self.overlay)
+        player.load_puzzle(hunt.state)
+        player_id = next(self.player_ids)
+        hunt.players[player_id] = player
+        return player_id, player
+
+    def status(self, player):
+        ui = player.game_ui
+        if player.found:
+            state = "won"
+        elif player.round_reported:
+            state = "lost"
+        else:
+            state = "playing"
+        return {
+            "state": state,
+            "found": sum(player.found_chameleons),
+            "total": len(player.found_chameleons),
+            "clicks_left": max(0, player.max_clicks - player.click_count),
+            "time_left": round(ui.time_left, 1),
+            "points": ui.points,
+            "powerups": {"time": player.add_time_uses, "steps": player.add_steps_uses, "scout": player.scout_uses},
+        }
+
+    def click(self, player, x, y):
+        ui = player.game_ui
+        if ui.finished:
+            return {"message": "This hunt is over for you", **self.status(player)}
+        if ui.time_left <= 0:
+            ui.last_message = "Time's up! You missed some chameleons!"
+            player.report_round(False)
+            return {"message": ui.last_message, **self.status(player)}
+
+        before = list(player.found_chameleons)
+        handled_click = player.click_count < player.max_clicks
+        player.handle_click(SimpleNamespace(x=x, y=y))
+        self.clicks += 1
+        hit = next((i for i, (was, now) in enumerate(zip(before, player.found_chameleons)) if now and not was), -1)
+        reply = {"message": ui.last_message, "hit": hit, **self.status(player)}
+        if hit >= 0:
+            reply["rect"] = player.chameleon_positions[hit]
+        elif handled_click:
+            reply["tier"] = feedback_tier(player.calculate_distance(x, y), feedback_reference(player.chameleon_positions))
+        return reply
+
+    def powerup(self, player, kind):
+        if player.game_ui.finished:
+            return {"message": "This hunt is over for you", **self.status(player)}
+        if kind == "time":
+            player.use_add_time()
+        elif kind == "steps":
+            player.use_add_steps()
+        elif kind == "scout":
+            hint = player.use_scout()
+            return {"message": player.game_ui.last_message, "hint": hint, **self.status(player)}
+        else:
+            raise ValueError(f"Unknown powerup: {kind}")
+        return {"message": player.game_ui.last_message, **self.status(player)}
+
+    def standings(self, hunt):
+        players = [{"player": pid, **self.status(p)} for pid, p in hunt.players.items()]
+        players.sort(key=lambda p: (-p["found"], -p["points"]))
+        return {"hunt": hunt.name, "players": players}
+
+    async def handle_connection(self, reader, writer):
+        hunt = player = player_id = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests must be JSON objects")
+                    op = request.get("op")
+                    if op == "join":
+                        if hunt is not None:
+                            hunt.players.pop(player_id, None)
+                        hunt = await self.hunt(request.get("hunt", "lobby"), request.get("image", "generated"),
+                                               request.get("difficulty", "Medium"))
+                        player_id, player = self.join(hunt)
+                        log.info("Player joined", extra={"fields": {"player": player_id, "hunt": hunt.name,
+                                                                    "players": len(hunt.players)}})
+                        reply = {"player": player_id, "hunt": hunt.name, "difficulty": hunt.state["difficulty"],
+                                 "size": hunt.state["size"], "max_clicks": player.max_clicks, **self.status(player)}
+                    elif player is None:
+                        raise ValueError("Join a hunt first")
+                    elif op == "click":
+                        reply = self.click(player, int(request["x"]), int(request["y"]))
+                    elif op == "powerup":
+                        reply = self.powerup(player, request.get("kind"))
+                    elif op == "image":
+                        reply = {"png": base64.b64encode(hunt.state["png"]).decode("ascii")}
+                    elif op == "standings":
+                        reply = self.standings(hunt)
+                    else:
+                        raise ValueError(f"Unknown op: {op}")
+                except (ValueError, KeyError, TypeError, OSError, PlacementError) as e:
+                    # OSError: an image in --image-dir that cannot be read
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("Rejected request: %s", e, extra={"fields": {"player": player_id}})
+                    reply = {"error": str(e)}
+                if isinstance(request, dict) and "id" in request:
+                    reply["id"] = request["id"]
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if hunt is not None:
+                hunt.players.pop(player_id, None)
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=2 ** 20)
+        port = server.sockets[0].getsockname()[1]
+        print(f"Hunt server listening on {host}:{port}", flush=True)
+        # Stop cleanly on Ctrl+C / SIGTERM so the puzzle workers exit with us
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, server.close)
+            except NotImplementedError:  # Windows
+                pass
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host concurrent Chameleon Hunt sessions on shared puzzles")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=None, help="puzzle generation processes")
+    parser.add_argument("--size", default="400x300", help="generated background size, WIDTHxHEIGHT")
+    parser.add_argument("--image-dir", help="let clients pick images from this directory (off by default)")
+    parser.add_argument("--log", help="log levels, e.g. debug or server=info,placement=debug")
+    args = parser.parse_args()
+
+    configure_logging(args.log)
+    server = HuntServer(args.workers, tuple(int(v) for v in args.size.lower().split("x")), image_dir=args.image_dir,
+                        log_levels=args.log)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
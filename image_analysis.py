@@ -0,0 +1,152 @@
+import time
+
+import numpy as np
+from PIL import Image
+
+from game_functions import GameLogic
+from scout import block_means
+
+# Quick "hideability" check for an uploaded image, run on a downscaled copy so it
+# takes a few tens of milliseconds instead of a full placement. It applies the
+# same size and margin rules as placement, so an image that passes will not fail
+# for being too small, and judges hiding spots by the color variability of
+# chameleon-sized windows, the texture term of placement's hiding score.
+
+GAME_BOUNDS = (800, 600)  # prepare_round thumbnails every image to this
+SCALE = 4  # Analyze at 1/SCALE of the game size
+DIFFICULTY_ORDER = ("Easy", "Medium", "Hard", "Mimic")
+MIN_CHAMELEON = 12  # Chameleons narrower than this (game pixels) are too small to play
+TEXTURE_STD = 64.0  # Window color std that counts as fully textured
+FLAT_TEXTURE = 0.08  # Typical window texture below this: chameleons will stand out anywhere
+FEW_COLORS = 0.04  # Share of the 512 coarse RGB bins in use below this: nearly monochrome
+GOOD_HIDEABILITY = 0.6  # Spots must score at least this (0-1) for a difficulty to be suggested
+
+
+def game_size(size, bounds=GAME_BOUNDS):
+    """The size an image of this size has after thumbnail(bounds)"""
+    width, height = size
+    scale = min(1.0, bounds[0] / width, bounds[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def chameleon_size(size, settings, aspect):
+    width = int(min(size) * settings["size_factor"])
+    return width, int(width * aspect)
+
+
+def fits(size, settings, aspect):
+    """Whether chameleons of this difficulty are big enough and fit inside the placement margins"""
+    width, height = chameleon_size(size, settings, aspect)
+    margin = int(width * 0.2)
+    return (width >= MIN_CHAMELEON and height >= 1
+            and size[0] - width - margin >= margin and size[1] - height - margin >= margin)
+
+
+def spot_capacity(size, settings, aspect):
+    """Rough count of chameleons that fit at this difficulty's spacing"""
+    width, height = chameleon_size(size, settings, aspect)
+    margin = int(width * 0.2)
+    spacing = max(min(size) * settings["min_distance_factor"], width, height, 1)
+    usable_x = size[0] - width - 2 * margin
+    usable_y = size[1] - height - 2 * margin
+    if usable_x < 0 or usable_y < 0:
+        return 0
+    return int((usable_x // spacing + 1) * (usable_y // spacing + 1))
+
+
+def window_means(values, width, height):
+    """Mean of every width x height window of a 2D or 3D array, via a summed-area table"""
+    rows, cols = values.shape[0] - height + 1, values.shape[1] - width + 1
+    if rows < 1 or cols < 1:
+        return np.zeros((0, 0) + values.shape[2:])
+    sat = np.zeros((values.shape[0] + 1, values.shape[1] + 1) + values.shape[2:])
+    sat[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+    return (sat[height:, width:] - sat[:rows, width:] - sat[height:, :cols] + sat[:rows, :cols]) / (width * height)
+
+
+def window_std(pixels, width, height):
+    """Color std (mean over channels) of every width x height window"""
+    data = pixels.astype(np.float64)
+    mean = window_means(data, width, height)
+    if not mean.size:
+        return np.zeros((0, 0))
+    return np.sqrt(np.maximum(window_means(data * data, width, height) - mean * mean, 0)).mean(axis=2)
+
+
+def best_mean(values, count):
+    """Mean of the count highest values"""
+    return float(np.sort(values.ravel())[-count:].mean())
+
+
+def analyze_image(source, logic=None, complexity_map=None):
+    """Estimate how well chameleons can hide in source (a path or an image).
+
+    Returns a dict: "size" in game pixels, "texture" (typical window texture 0-1),
+    "colors" (share of coarse RGB bins used), per-difficulty "fits", "capacity"
+    and "hideability" (0-1 texture of the best spots), a "suggested" difficulty
+    or None, human-readable "warnings" and the time taken in "ms". Given the
+    image's complexity map at game size, each difficulty also gets "complexity",
+    the placement complexity term (0-1) of the best spots.
+    """
+    started = time.perf_counter()
+    logic = logic or GameLogic(None)
+    image = Image.open(source) if isinstance(source, str) else source
+    size = game_size(image.size)
+    small_size = (max(1, size[0] // SCALE), max(1, size[1] // SCALE))
+    if isinstance(source, str):
+        image.draft("RGB", small_size)  # JPEGs decode straight at reduced scale
+    pixels = np.asarray(image.convert("RGB").resize(small_size, Image.Resampling.BILINEAR))
+    aspect = logic.chameleon_height / logic.chameleon_width
+    if complexity_map is not None:
+        complexity_map = block_means(np.asarray(complexity_map, dtype=np.float64), SCALE)
+
+    bins = np.unique((pixels // 32).reshape(-1, 3).astype(np.int32) @ np.array([64, 8, 1]))
+    typical = window_std(pixels, max(2, small_size[0] // 16), max(2, small_size[1] // 16))
+
+    difficulties = {}
+    for name, settings in logic.difficulty_settings.items():
+        width, height = chameleon_size(size, settings, aspect)
+        result = {"fits": fits(size, settings, aspect), "capacity": spot_capacity(size, settings, aspect),
+                  "chameleon_px": width, "hideability": 0.0}
+        result["fits"] = result["fits"] and result["capacity"] >= settings["num_chameleons"]
+        spots = settings["num_chameleons"] * 3
+        window = (max(1, width // SCALE), max(1, height // SCALE))
+        stds = window_std(pixels, *window)
+        if stds.size:
+            result["hideability"] = round(min(1.0, best_mean(stds, spots) / TEXTURE_STD), 3)
+        if complexity_map is not None:
+            means = window_means(complexity_map, *window)
+            result["complexity"] = round(best_mean(means, spots), 3) if means.size else 0.0
+        difficulties[name] = result
+
+    analysis = {
+        "size": size,
+        "texture": round(min(1.0, float(np.median(typical)) / TEXTURE_STD), 3) if typical.size else 0.0,
+        "colors": round(len(bins) / 512, 3),
+        "difficulties": difficulties,
+    }
+    analysis["suggested"] = suggest_difficulty(difficulties)
+    analysis["warnings"] = warnings_for(analysis)
+    analysis["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return analysis
+
+
+def suggest_difficulty(difficulties):
+    """The hardest difficulty that fits with good hiding spots, else the easiest that fits"""
+    fitting = [name for name in DIFFICULTY_ORDER if difficulties.get(name, {}).get("fits")]
+    good = [name for name in fitting if difficulties[name]["hideability"] >= GOOD_HIDEABILITY]
+    if good:
+        return good[-1]
+    return fitting[0] if fitting else None
+
+
+def warnings_for(analysis):
+    warnings = []
+    if not any(d["fits"] for d in analysis["difficulties"].values()):
+        width, height = analysis["size"]
+        warnings.append(f"Image is too small ({width}x{height}) to hide chameleons at any difficulty.")
+    if analysis["texture"] < FLAT_TEXTURE:
+        warnings.append("Image is very flat: chameleons will be easy to spot.")
+    if analysis["colors"] < FEW_COLORS:
+        warnings.append("Image has very few colors: camouflage will look patchy.")
+    return warnings
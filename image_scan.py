@@ -0,0 +1,209 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from PIL import Image
+
+from game_functions import GameLogic
+from game_log import configure as configure_logging, get_logger
+from image_analysis import DIFFICULTY_ORDER, GAME_BOUNDS, analyze_image
+
+# Scans a directory tree of images in parallel and ranks them for custom image
+# packs, with the same analysis the start screen runs on an upload. Results go
+# to a cache directory that the game reads back: an upload that was scanned
+# skips the analysis, and its round skips the complexity map, which is most of
+# the cost of placement.
+#
+# Cache layout: index.json maps an image's absolute path to its file size,
+# mtime, analysis and the name of an .npz holding the complexity map of the
+# image as prepare_round resizes it (float64, so placement is identical with or
+# without the cache). An entry is only used while size and mtime still match.
+CACHE_DIR = "image_cache"
+INDEX_FILE = "index.json"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+log = get_logger("scan")
+
+_worker = None  # Per-process GameLogic used for the analysis
+
+
+def init_worker(log_levels):
+    global _worker
+    configure_logging(log_levels, queued=False)  # A forked worker has no listener thread of its own
+    _worker = GameLogic(None)
+
+
+def file_key(path):
+    stat = os.stat(path)
+    return {"bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def map_name(path):
+    return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16] + ".npz"
+
+
+def find_images(root):
+    """Absolute paths of every image file under root, in a stable order"""
+    found = []
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                found.append(os.path.abspath(os.path.join(folder, name)))
+    return found
+
+
+def scan_image(path, cache_dir):
+    """Analyze one image and write its complexity map to the cache; returns (path, entry or error)"""
+    try:
+        started = time.perf_counter()
+        key = file_key(path)
+        image = Image.open(path)
+        image.thumbnail(GAME_BOUNDS)  # Exactly what prepare_round does
+        complexity = _worker.calculate_complexity_map(image)
+        analysis = analyze_image(image, _worker, complexity)
+        np.savez_compressed(os.path.join(cache_dir, map_name(path)), complexity=complexity)
+        analysis["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return path, dict(key, analysis=analysis, map=map_name(path))
+    except Exception as e:
+        log.debug("Could not scan %s: %s", path, e)
+        return path, {"error": str(e)}
+
+
+def read_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(cache_dir, index):
+    # Write then rename, so a game reading the index never sees half of it
+    path = os.path.join(cache_dir, INDEX_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+class ImageCache:
+    """Read side of the scan cache, for the game. Re-reads the index when the scanner rewrites it."""
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index = {}
+        self.index_mtime = None
+
+    def entry(self, path):
+        """The cached entry for path if the file is unchanged since the scan, else None"""
+        try:
+            mtime = os.stat(os.path.join(self.cache_dir, INDEX_FILE)).st_mtime_ns
+            if mtime != self.index_mtime:
+                self.index, self.index_mtime = read_index(self.cache_dir), mtime
+            entry = self.index.get(os.path.abspath(path))
+            if entry and "analysis" in entry and file_key(path) == {k: entry[k] for k in ("bytes", "mtime_ns")}:
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def analysis(self, path):
+        entry = self.entry(path)
+        return entry["analysis"] if entry else None
+
+    def complexity_map(self, path):
+        """The cached complexity map for path, or None (missing, stale or unreadable)"""
+        entry = self.entry(path)
+        if entry is None:
+            return None
+        try:
+            with np.load(os.path.join(self.cache_dir, entry["map"])) as data:
+                return data["complexity"]
+        except (OSError, KeyError, ValueError) as e:
+            log.warning("Cached complexity map for %s is unreadable: %s", path, e)
+            return None
+
+
+def rank_key(item):
+    """Hardest suggested difficulty first, then the best hiding spots at that difficulty"""
+    analysis = item[1]["analysis"]
+    suggested = analysis["suggested"]
+    if suggested is None:
+        return (-1, 0.0, 0.0)
+    spots = analysis["difficulties"][suggested]
+    return (DIFFICULTY_ORDER.index(suggested), spots["hideability"], spots.get("complexity", 0.0))
+
+
+def report(ranked, path):
+    print(f"{'rank':>4} {'suggested':<9} {'hide':>5} {'complex':>7} {'texture':>7} {'colors':>6} {'size':>9}  image")
+    rows = []
+    for rank, (image, entry) in enumerate(ranked, 1):
+        analysis = entry["analysis"]
+        suggested = analysis["suggested"]
+        spots = analysis["difficulties"][suggested] if suggested else {}
+        hide, complexity = spots.get("hideability", 0.0), spots.get("complexity", 0.0)
+        size = "x".join(str(v) for v in analysis["size"])
+        print(f"{rank:>4} {suggested or '-':<9} {hide:>5.2f} {complexity:>7.2f} {analysis['texture']:>7.2f} "
+              f"{analysis['colors']:>6.2f} {size:>9}  {image}")
+        rows.append({"rank": rank, "image": image, "suggested": suggested or "", "hideability": hide,
+                     "complexity": complexity,
+                     "texture": analysis["texture"], "colors": analysis["colors"], "size": size,
+                     "fits": " ".join(name for name in DIFFICULTY_ORDER
+                                      if analysis["difficulties"].get(name, {}).get("fits")),
+                     "warnings": " ".join(analysis["warnings"])})
+    if path:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["rank", "image"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a directory of images for Chameleon Hunt and cache the analysis")
+    parser.add_argument("root", help="directory to scan (recursively)")
+    parser.add_argument("--cache", default=CACHE_DIR, help="cache directory the game reads")
+    parser.add_argument("--report", help="also write the ranking to this CSV file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="rescan images the cache already covers")
+    parser.add_argument("--log", help="log levels, e.g. scan=debug")
+    args = parser.parse_args()
+    configure_logging(args.log)
+
+    os.makedirs(args.cache, exist_ok=True)
+    index = read_index(args.cache)
+    images = find_images(args.root)
+    cache = ImageCache(args.cache)
+    todo = [path for path in images if args.force or cache.entry(path) is None]
+
+    start = time.perf_counter()
+    errors = {}
+    if todo:
+        with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.log,)) as pool:
+            futures = [pool.submit(scan_image, path, args.cache) for path in todo]
+            for done, future in enumerate(as_completed(futures), 1):
+                path, entry = future.result()
+                if "error" in entry:
+                    errors[path] = entry["error"]
+                    index.pop(path, None)
+                else:
+                    index[path] = entry
+                log.info("Scanned %d/%d %s", done, len(todo), path)
+        write_index(args.cache, index)
+    elapsed = time.perf_counter() - start
+
+    ranked = sorted(((path, index[path]) for path in images if path in index), key=rank_key, reverse=True)
+    report(ranked, args.report)
+    for path, error in errors.items():
+        print(f"skipped {path}: {error}")
+    scan_ms = [index[path]["analysis"]["ms"] for path in todo if path in index]
+    print(f"{len(images)} image(s), {len(todo) - len(errors)} scanned, {len(images) - len(todo)} from cache, "
+          f"{len(errors)} unreadable in {elapsed:.1f}s on {args.workers} worker(s)"
+          + (f"; {sum(scan_ms) / len(scan_ms):.0f} ms/image" if scan_ms else ""))
+
+
+if __name__ == "__main__":
+    main()
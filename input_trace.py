@@ -0,0 +1,216 @@
+import argparse
+import struct
+import time
+from types import SimpleNamespace
+
+# Trace file layout: MAGIC + version byte, then a stream of records.
+# Every record starts with (kind, t_ms) where t_ms counts from the start of recording.
+# Version 2 adds the points at round start, shop purchases and clock expiry, which
+# change points, powerup uses and what later clicks do; version 1 traces still replay.
+MAGIC = b"CHRT"
+VERSION = 2
+
+ROUND, MOTION, CLICK, POWERUP, PURCHASE, TIME_UP = 0, 1, 2, 3, 4, 5
+POWERUP_CODES = {"time": 0, "steps": 1, "scout": 2}
+POWERUP_NAMES = {code: name for name, code in POWERUP_CODES.items()}
+
+RECORD_HEAD = struct.Struct("<BI")
+POINT = struct.Struct("<hh")  # motion/click x, y; powerup/purchase code, 0; time up 0, 0
+ROUND_INFO = {1: struct.Struct("<IBB"), 2: struct.Struct("<IBBi")}  # seed, story flag, story level[, points]
+STRING_LEN = struct.Struct("<H")
+
+
+class InputRecorder:
+    """Append timestamped canvas input and round seeds to a compact binary trace"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + bytes([VERSION]))
+        self.start = time.monotonic()
+
+    def elapsed_ms(self):
+        return int((time.monotonic() - self.start) * 1000) & 0xFFFFFFFF
+
+    def round(self, seed, difficulty, image_file, story=False, level=0, points=0):
+        """Mark the start of a round so the replayer can regenerate the same puzzle and score"""
+        self.file.write(RECORD_HEAD.pack(ROUND, self.elapsed_ms()))
+        self.file.write(ROUND_INFO[VERSION].pack(seed & 0xFFFFFFFF, int(story), level, points))
+        for text in (difficulty, image_file or ""):
+            data = text.encode("utf-8")
+            self.file.write(STRING_LEN.pack(len(data)) + data)
+        self.file.flush()
+
+    def motion(self, x, y):
+        self.file.write(RECORD_HEAD.pack(MOTION, self.elapsed_ms()) + POINT.pack(x, y))
+
+    def click(self, x, y):
+        self.file.write(RECORD_HEAD.pack(CLICK, self.elapsed_ms()) + POINT.pack(x, y))
+
+    def powerup(self, kind):
+        self.file.write(RECORD_HEAD.pack(POWERUP, self.elapsed_ms()) + POINT.pack(POWERUP_CODES[kind], 0))
+
+    def purchase(self, kind):
+        self.file.write(RECORD_HEAD.pack(PURCHASE, self.elapsed_ms()) + POINT.pack(POWERUP_CODES[kind], 0))
+
+    def time_up(self):
+        self.file.write(RECORD_HEAD.pack(TIME_UP, self.elapsed_ms()) + POINT.pack(0, 0))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_trace(path):
+    """Decode a trace file into a list of (kind, t_ms, payload) tuples"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC or data[4] not in ROUND_INFO:
+        raise ValueError(f"{path} is not a version {'/'.join(map(str, ROUND_INFO))} input trace")
+    round_info = ROUND_INFO[data[4]]
+
+    records = []
+    offset = 5
+    while offset < len(data):
+        kind, t_ms = RECORD_HEAD.unpack_from(data, offset)
+        offset += RECORD_HEAD.size
+        if kind == ROUND:
+            seed, story, level, *points = round_info.unpack_from(data, offset)
+            offset += round_info.size
+            strings = []
+            for _ in range(2):
+                (length,) = STRING_LEN.unpack_from(data, offset)
+                offset += STRING_LEN.size
+                strings.append(data[offset:offset + length].decode("utf-8"))
+                offset += length
+            payload = {"seed": seed, "story": bool(story), "level": level, "points": points[0] if points else None,
+                       "difficulty": strings[0], "image_file": strings[1] or None}
+        else:
+            payload = POINT.unpack_from(data, offset)
+            offset += POINT.size
+        records.append((kind, t_ms, payload))
+    return records
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class TraceReplayer:
+    """Feed a recorded trace back into a game host and time each handled event"""
+    def __init__(self, host, records):
+        self.host = host  # GameUI or HeadlessUI
+        self.records = records
+        self.latencies = {"round": [], "motion": [], "click": [], "powerup": [], "purchase": [], "time_up": []}
+
+    def start_round(self, info):
+        host = self.host
+        started = self.start_puzzle(info)
+        if info["points"] is not None:
+            host.points = info["points"]  # The shop and miss points carry on from the recorded total
+        return started
+
+    def start_puzzle(self, info):
+        host = self.host
+        if hasattr(host, "start_round"):
+            return host.start_round(info["image_file"], info["difficulty"], info["story"], info["seed"])
+
+        # Tk host: go through the same entry points as a player would
+        host.puzzle_seed = info["seed"]
+        try:
+            if info["story"]:
+                host.story_images.current_level = info["level"]
+                host.start_story_level()
+            else:
+                host.image_file = info["image_file"]
+                host.difficulty.set(info["difficulty"])
+                host.start_game()
+            # Puzzles are built in the background; input only counts once the round is live
+            while getattr(host, "preparing", False):
+                host.window.update()
+                time.sleep(0.002)
+        finally:
+            host.puzzle_seed = None
+        return True
+
+    def dispatch(self, kind, payload):
+        if kind == ROUND:
+            self.start_round(payload)
+        elif kind == MOTION:
+            self.host.update_blur(SimpleNamespace(x=payload[0], y=payload[1]))
+        elif kind == CLICK:
+            self.host.game_logic.handle_click(SimpleNamespace(x=payload[0], y=payload[1]))
+        elif kind == POWERUP:
+            self.host.use_powerup(POWERUP_NAMES[payload[0]])
+        elif kind == PURCHASE:
+            self.host.buy_powerup(POWERUP_NAMES[payload[0]])
+        elif kind == TIME_UP:
+            if hasattr(self.host, "stop_timer"):
+                self.host.stop_timer()  # Tk host: expire on the recorded event, not its own clock
+            self.host.time_up()
+
+    def replay(self, realtime=False):
+        names = {ROUND: "round", MOTION: "motion", CLICK: "click", POWERUP: "powerup", PURCHASE: "purchase",
+                 TIME_UP: "time_up"}
+        window = getattr(self.host, "window", None)
+        start = time.monotonic()
+        for kind, t_ms, payload in self.records:
+            if realtime:
+                delay = t_ms / 1000.0 - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            began = time.perf_counter()
+            self.dispatch(kind, payload)
+            if window is not None:
+                window.update()  # Include the redraw in the measured latency
+            self.latencies[names[kind]].append((time.perf_counter() - began) * 1000)
+        return self.report()
+
+    def report(self):
+        """Per-event-kind latency statistics in milliseconds"""
+        stats = {}
+        for name, values in self.latencies.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            stats[name] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+            }
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Chameleon Hunt input trace and report latency")
+    parser.add_argument("trace", help="trace file written by UI_code.py --record")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing instead of replaying as fast as possible")
+    parser.add_argument("--display", action="store_true", help="replay into the Tk game window instead of the headless host")
+    parser.add_argument("--reveal", default="hard", choices=("hard", "feathered"), help="reveal style to render with")
+    args = parser.parse_args()
+
+    records = read_trace(args.trace)
+    if args.display:
+        import tkinter as tk
+        from UI_code import GameUI
+        window = tk.Tk()
+        host = GameUI(window)
+        host.set_reveal_style(args.reveal)
+    else:
+        from headless import HeadlessUI
+        host = HeadlessUI(reveal_style=args.reveal)
+
+    stats = TraceReplayer(host, records).replay(realtime=args.realtime)
+    print(f"Replayed {len(records)} records from {args.trace}")
+    for name, s in stats.items():
+        print(f"{name:>8}: n={s['count']:<6} mean={s['mean']:.2f}ms p50={s['p50']:.2f}ms "
+              f"p95={s['p95']:.2f}ms p99={s['p99']:.2f}ms max={s['max']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
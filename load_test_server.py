@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from input_trace import percentile
+
+# Ramps up concurrent clients against hunt_server.py and reports click round-trip
+# latency per stage. The largest stage whose p95 stays under --target-ms is the
+# number of sessions the server supports on this machine.
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+
+    async def request(self, **message):
+        self.next_id += 1
+        message["id"] = self.next_id
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        reply = json.loads(await self.reader.readline())
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+
+async def player(host, port, hunt, difficulty, stop_at, click_gap, latencies, rng):
+    """Join, click at random spots until the round ends, rejoin; repeat until stop_at"""
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 20)
+    client = Client(reader, writer)
+    rounds = 0
+    try:
+        while time.monotonic() < stop_at:
+            joined = await client.request(op="join", hunt=hunt, image="generated", difficulty=difficulty)
+            width, height = joined["size"]
+            rounds += 1
+            state = joined["state"]
+            while state == "playing" and time.monotonic() < stop_at:
+                await asyncio.sleep(click_gap * rng.uniform(0.5, 1.5))
+                start = time.perf_counter()
+                reply = await client.request(op="click", x=rng.randrange(width), y=rng.randrange(height))
+                latencies.append((time.perf_counter() - start) * 1000)
+                state = reply["state"]
+                if reply["clicks_left"] == 0 and state == "playing" and reply["powerups"]["steps"]:
+                    await client.request(op="powerup", kind="steps")
+    finally:
+        writer.close()
+    return rounds
+
+
+async def run_stage(host, port, sessions, hunts, difficulty, seconds, click_gap, seed):
+    latencies = []
+    rng = random.Random(seed)
+    stop_at = time.monotonic() + seconds
+    # Warm every hunt first so puzzle generation is not counted as click latency
+    await asyncio.gather(*(warm(host, port, f"load-{i}", difficulty) for i in range(hunts)))
+    tasks = [player(host, port, f"load-{i % hunts}", difficulty, stop_at, click_gap, latencies,
+                    random.Random(rng.random())) for i in range(sessions)]
+    rounds = sum(await asyncio.gather(*tasks))
+    return sorted(latencies), rounds
+
+
+async def warm(host, port, hunt, difficulty):
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 20)
+    await Client(reader, writer).request(op="join", hunt=hunt, image="generated", difficulty=difficulty)
+    writer.close()
+
+
+async def spawn_server(port, workers):
+    args = [sys.executable, "hunt_server.py", "--port", str(port)]
+    if workers:
+        args += ["--workers", str(workers)]
+    process = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE)
+    line = (await process.stdout.readline()).decode()
+    if "listening" not in line:
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+async def main_async(args):
+    process = None
+    port = args.port
+    if args.spawn:
+        process, port = await spawn_server(args.port, args.workers)
+    try:
+        supported = 0
+        print(f"{'sessions':>8} {'clicks':>8} {'clicks/s':>9} {'rounds':>7} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'max ms':>8}")
+        for sessions in args.sessions:
+            latencies, rounds = await run_stage(args.host, port, sessions, args.hunts, args.difficulty,
+                                                args.seconds, args.click_gap, sessions)
+            if not latencies:
+                print(f"{sessions:>8} no clicks completed")
+                continue
+            p95 = percentile(latencies, 0.95)
+            print(f"{sessions:>8} {len(latencies):>8} {len(latencies) / args.seconds:>9.0f} {rounds:>7} "
+                  f"{percentile(latencies, 0.5):>8.2f} {p95:>8.2f} {percentile(latencies, 0.99):>8.2f} "
+                  f"{latencies[-1]:>8.2f}")
+            if p95 <= args.target_ms:
+                supported = sessions
+        print(f"Sessions supported with p95 click latency <= {args.target_ms} ms: {supported}")
+    finally:
+        if process:
+            process.terminate()
+            await process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test hunt_server.py with concurrent local clients")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="start a server on a free port for the test")
+    parser.add_argument("--workers", type=int, help="puzzle workers for a spawned server")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 50, 100, 200, 400])
+    parser.add_argument("--hunts", type=int, default=4, help="shared puzzles the sessions are spread over")
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of each stage")
+    parser.add_argument("--click-gap", type=float, default=0.2, help="mean seconds between a player's clicks")
+    parser.add_argument("--target-ms", type=float, default=50)
+    args = parser.parse_args()
+    if args.spawn and args.port == 8765:
+        args.port = 0
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import collections
+import os
+import time
+
+from input_trace import percentile
+
+# Debug overlay with the numbers behind "the reveal lags": how long each reveal
+# frame takes to render, how late <Motion> events reach the handler, how many
+# frames are actually drawn per second, how long the last rounds took to
+# prepare and the process's resident memory. Toggled with F3.
+#
+# When it is off, the hot paths pay one attribute check: nothing is timed,
+# stored or drawn, and its refresh task is cancelled.
+
+WINDOW = 240  # Samples kept per metric for the rolling percentiles
+REFRESH_MS = 250
+
+
+def resident_mb():
+    """Resident set size in MB, or None where it cannot be read cheaply"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Peak, in KB on Linux
+    except (ImportError, OSError):
+        return None
+
+
+class PerfHud:
+    """Rolling frame-time, input-lag, frame-rate, preparation and memory stats drawn on the game canvas"""
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.enabled = False
+        self.canvas = None
+        self.items = None  # (background, text) canvas items while shown
+        self.task = None
+        self.extra_lines = None  # Optional callable returning more lines to show
+        self.reset()
+
+    def reset(self):
+        self.samples = {name: collections.deque(maxlen=WINDOW) for name in ("render", "lag", "prep")}
+        self.frames = collections.deque()  # perf_counter of frames drawn in the last second
+        self.lag_offset = None  # Smallest (local clock - event.time) seen: the zero-lag baseline
+
+    def toggle(self, canvas):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+            self.canvas = canvas
+            self.task = self.scheduler.every(REFRESH_MS, self.draw, group="hud")
+            self.draw()
+        else:
+            self.scheduler.cancel_group("hud")
+            self.task = None
+            self.hide()
+        return self.enabled
+
+    # --- Recording (callers check self.enabled first) ---
+
+    def record_frame(self, started):
+        """A reveal frame that began rendering at perf_counter() == started has been handed to Tk"""
+        now = time.perf_counter()
+        self.samples["render"].append((now - started) * 1000)
+        self.frames.append(now)
+
+    def record_event(self, event):
+        """Queue lag of an X/Tk event. event.time is on the server's clock, so lag is measured
+        against the quickest delivery seen (lag 0); only the variation is real"""
+        offset = time.monotonic() * 1000 - event.time
+        if self.lag_offset is None or offset < self.lag_offset:
+            self.lag_offset = offset
+        self.samples["lag"].append(offset - self.lag_offset)
+
+    def record_prepare(self, ms):
+        self.samples["prep"].append(ms)
+
+    # --- Display ---
+
+    def lines(self):
+        now = time.perf_counter()
+        while self.frames and now - self.frames[0] > 1.0:
+            self.frames.popleft()
+        text = [f"fps {len(self.frames):3d}"]
+        for name, label in (("render", "frame ms"), ("lag", "input lag ms")):
+            values = sorted(self.samples[name])
+            text.append(f"{label:<12} p50 {percentile(values, 0.5):5.1f}  p95 {percentile(values, 0.95):5.1f}  "
+                        f"max {values[-1] if values else 0.0:5.1f}")
+        prep = self.samples["prep"]
+        text.append(f"{'prepare ms':<12} last {prep[-1] if prep else 0.0:5.0f}  "
+                    f"p50 {percentile(sorted(prep), 0.5):5.0f}  ({len(prep)} rounds)")
+        memory = resident_mb()
+        text.append(f"{'memory':<12} {memory:.0f} MB" if memory is not None else f"{'memory':<12} n/a")
+        if self.extra_lines is not None:
+            text.extend(self.extra_lines())
+        return "\n".join(text)
+
+    def draw(self):
+        try:
+            if self.canvas is None or not self.canvas.winfo_exists():
+                return
+            if self.items is None:
+                text = self.canvas.create_text(8, 8, anchor="nw", font=("Courier", 10), fill="#00FF00", tags="hud")
+                background = self.canvas.create_rectangle(0, 0, 0, 0, fill="black", outline="", tags="hud")
+                self.items = (background, text)
+            background, text = self.items
+            self.canvas.itemconfig(text, text=self.lines())
+            x1, y1, x2, y2 = self.canvas.bbox(text)
+            self.canvas.coords(background, x1 - 4, y1 - 4, x2 + 4, y2 + 4)
+            # New canvas items (overlays, the image) may have been stacked above since the last draw
+            self.canvas.tag_raise(background)
+            self.canvas.tag_raise(text)
+        except Exception:
+            self.items = None  # The canvas was rebuilt; start over on the next draw
+
+    def hide(self):
+        if self.items is not None and self.canvas is not None:
+            try:
+                self.canvas.delete("hud")
+            except Exception:
+                pass
+        self.items = None
@@ -0,0 +1,230 @@
+import argparse
+import collections
+import logging
+import queue
+import random
+import threading
+import time
+
+from PIL import Image, ImageFilter
+
+from game_functions import GameLogic
+from game_log import configure as configure_logging, get_logger
+from image_scan import ImageCache
+from input_trace import percentile
+from puzzle_factory import generate_background
+from rendering import reveal_settings
+
+# Rounds prepared ahead of the player for endless time attack. Producer threads
+# each own a GameLogic and keep a bounded queue of ready rounds topped up, so
+# starting the next puzzle is a queue get instead of a placement.
+#
+# A source is an image path or GENERATED for a fresh procedural background.
+# Image sources are decoded and analyzed once per queue (or come from the
+# image_scan cache), so after the first lap a round costs only placement and
+# the blur.
+GENERATED = "generated"
+GENERATED_SIZE = (800, 600)
+STATS_WINDOW = 200  # Build and wait times kept for the percentiles
+
+log = get_logger("queue")
+
+
+class PuzzleQueue:
+    """Bounded queue of prepared rounds kept full by background producer threads.
+
+    A puzzle is a dict: "source", "state" (GameLogic.puzzle_state), the sharp
+    "composite", the "blurred" composite at blur_level and "build_ms".
+    """
+    def __init__(self, sources, difficulty, depth=3, producers=1, blur_level=None, seed=None, local_camouflage=False):
+        if not sources:
+            raise ValueError("PuzzleQueue needs at least one source")
+        self.sources = list(sources)
+        self.difficulty = difficulty
+        self.local_camouflage = local_camouflage
+        self.blur_level = blur_level if blur_level is not None else reveal_settings(difficulty)["blur_level"]
+        self.ready = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self.next_seed = seed if seed is not None else random.randrange(2**31)
+        self.backgrounds = {}  # image source -> (resized image, complexity map)
+        self.bad_sources = set()
+        self.image_cache = ImageCache()
+
+        # Stats
+        self.started = time.perf_counter()
+        self.produced = 0
+        self.failed = 0
+        self.served = 0
+        self.starved = 0  # Times the player found no puzzle ready
+        self.build_ms = collections.deque(maxlen=STATS_WINDOW)
+        self.wait_ms = collections.deque(maxlen=STATS_WINDOW)  # Consumer waits, 0 when a puzzle was ready
+        self.waiting_since = None
+
+        self.producers = [threading.Thread(target=self.produce, name=f"puzzle-producer-{i}", daemon=True)
+                          for i in range(producers)]
+        for producer in self.producers:
+            producer.start()
+
+    # --- Producers ---
+
+    def take_job(self):
+        """(seed, source) for the next puzzle, cycling through the usable sources"""
+        with self.lock:
+            usable = [source for source in self.sources if source not in self.bad_sources]
+            if not usable:
+                return None, None
+            seed = self.next_seed
+            self.next_seed += 1
+            return seed, usable[seed % len(usable)]
+
+    def background(self, logic, source, seed):
+        """The source resized for play and its complexity map, cached per image source"""
+        if source == GENERATED:
+            return generate_background(seed, GENERATED_SIZE), None  # prepare_round analyzes it
+        cached = self.backgrounds.get(source)
+        if cached is None:
+            image = Image.open(source)
+            image.thumbnail((800, 600))  # What prepare_round does
+            complexity = self.image_cache.complexity_map(source)
+            if complexity is None:
+                complexity = logic.calculate_complexity_map(image)
+            cached = self.backgrounds[source] = (image, complexity)
+        return cached
+
+    def build(self, logic, source, seed):
+        started = time.perf_counter()
+        image, complexity = self.background(logic, source, seed)
+        composite = logic.prepare_round(image.copy(), self.difficulty, seed=seed, complexity_map=complexity)
+        return {
+            "source": source,
+            "state": logic.puzzle_state(),
+            "composite": composite,
+            "blurred": composite.filter(ImageFilter.GaussianBlur(self.blur_level)),
+            "build_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def produce(self):
+        logic = GameLogic(None)
+        logic.local_camouflage = self.local_camouflage
+        while not self.stopped.is_set():
+            seed, source = self.take_job()
+            if source is None:
+                log.error("No usable puzzle sources left")
+                return
+            try:
+                puzzle = self.build(logic, source, seed)
+            except Exception as e:
+                # An image that cannot hold this difficulty (or cannot be read) is dropped from the rotation
+                log.warning("Dropping puzzle source %s: %s", source, e)
+                with self.lock:
+                    self.failed += 1
+                    if source != GENERATED:
+                        self.bad_sources.add(source)
+                continue
+            with self.lock:
+                self.produced += 1
+                self.build_ms.append(puzzle["build_ms"])
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Puzzle ready", extra={"fields": {"source": source, "seed": seed,
+                                                            "ms": round(puzzle["build_ms"], 1)}})
+            while not self.stopped.is_set():
+                try:
+                    self.ready.put(puzzle, timeout=0.1)  # Blocks while the queue is full
+                    break
+                except queue.Full:
+                    continue
+
+    # --- Consumer ---
+
+    def get_nowait(self):
+        """The next prepared puzzle, or None if none is ready yet; waits are timed across calls"""
+        try:
+            puzzle = self.ready.get_nowait()
+        except queue.Empty:
+            if self.waiting_since is None:
+                self.waiting_since = time.perf_counter()
+                self.starved += 1
+            return None
+        waited = 0.0 if self.waiting_since is None else (time.perf_counter() - self.waiting_since) * 1000
+        self.waiting_since = None
+        self.served += 1
+        self.wait_ms.append(waited)
+        return puzzle
+
+    def get(self, timeout=None):
+        """The next prepared puzzle, blocking up to timeout seconds; None on timeout"""
+        started = time.perf_counter()
+        if self.ready.empty():
+            self.starved += 1
+        try:
+            puzzle = self.ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.served += 1
+        self.wait_ms.append((time.perf_counter() - started) * 1000)
+        return puzzle
+
+    def stats(self):
+        with self.lock:
+            builds = sorted(self.build_ms)
+            produced, failed = self.produced, self.failed
+        waits = sorted(self.wait_ms)
+        elapsed = time.perf_counter() - self.started
+        return {
+            "produced": produced,
+            "failed": failed,
+            "served": self.served,
+            "starved": self.starved,
+            "queued": self.ready.qsize(),
+            "depth": self.ready.maxsize,
+            "per_minute": produced / elapsed * 60 if elapsed > 0 else 0.0,
+            "build_p50_ms": percentile(builds, 0.5),
+            "build_p95_ms": percentile(builds, 0.95),
+            "wait_p50_ms": percentile(waits, 0.5),
+            "wait_max_ms": waits[-1] if waits else 0.0,
+        }
+
+    def close(self):
+        """Stop the producers; puzzles still queued are dropped"""
+        self.stopped.set()
+        while True:
+            try:
+                self.ready.get_nowait()
+            except queue.Empty:
+                break
+
+
+def describe(stats):
+    return (f"{stats['produced']} built ({stats['per_minute']:.1f}/min, p50 {stats['build_p50_ms']:.0f} ms, "
+            f"p95 {stats['build_p95_ms']:.0f} ms), {stats['served']} served, queue {stats['queued']}/{stats['depth']}, "
+            f"waits p50 {stats['wait_p50_ms']:.0f} ms max {stats['wait_max_ms']:.0f} ms, {stats['starved']} starved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how well the producers keep up with a player clearing puzzles")
+    parser.add_argument("sources", nargs="*", default=["Level1.jpg", "Level2.jpg", "Level3.jpg", "Level4.jpg",
+                                                       "Level5.jpeg", GENERATED])
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--puzzles", type=int, default=30)
+    parser.add_argument("--play-ms", type=float, default=1500, help="simulated time the player spends per puzzle")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--producers", type=int, default=1)
+    parser.add_argument("--log", help="log levels, e.g. queue=debug")
+    args = parser.parse_args()
+    configure_logging(args.log)
+
+    puzzles = PuzzleQueue(args.sources, args.difficulty, depth=args.depth, producers=args.producers, seed=0)
+    start = time.perf_counter()
+    for _ in range(args.puzzles):
+        if puzzles.get(timeout=30) is None:
+            print("Timed out waiting for a puzzle")
+            break
+        time.sleep(args.play_ms / 1000)
+    elapsed = time.perf_counter() - start
+    puzzles.close()
+    print(f"{args.puzzles} puzzles in {elapsed:.1f}s with {args.play_ms:.0f} ms play each: {describe(puzzles.stats())}")
+
+
+if __name__ == "__main__":
+    main()
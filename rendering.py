@@ -0,0 +1,333 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageColor, ImageFont
+
+# Blur strength and clear-radius per difficulty; unknown tiers use the Hard values
+REVEAL_SETTINGS = {
+    "Easy": {"blur_level": 5, "clear_radius": 100},
+    "Medium": {"blur_level": 8, "clear_radius": 75},
+    "Hard": {"blur_level": 12, "clear_radius": 50},
+}
+
+# Opacity used to approximate Tk stipple patterns when drawing offscreen
+STIPPLE_ALPHA = {"": 1.0, "gray75": 0.75, "gray50": 0.5, "gray25": 0.25, "gray12": 0.125}
+
+
+def reveal_settings(difficulty):
+    return REVEAL_SETTINGS.get(difficulty, REVEAL_SETTINGS["Hard"])
+
+
+def compose_reveal(blurred, sharp, x, y, radius):
+    """Blurred frame with a hard-edged clear circle of the sharp image around (x, y)"""
+    frame = blurred.copy()
+    if sharp is None:
+        return frame
+    mask = Image.new('L', blurred.size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=255)
+    frame.paste(sharp, (0, 0), mask)
+    return frame
+
+
+class HardReveal:
+    """The original reveal: a hard-edged clear circle (see compose_reveal)"""
+    def render(self, blurred, sharp, x, y, radius):
+        return compose_reveal(blurred, sharp, x, y, radius)
+
+    def invalidate(self):
+        pass
+
+
+class FeatheredReveal:
+    """Blends sharp into blurred with a soft radial falloff, reusing one frame buffer.
+
+    The frame is an RGBA NumPy buffer wrapped (not copied) by the returned image.
+    Each call restores the previous reveal box from the blurred copy and blends
+    only the new box, in preallocated uint16 scratch buffers, so a frame costs
+    O(radius^2) and allocates nothing once the round's buffers exist. The
+    returned image is overwritten by the next call; copy it to keep it.
+    Call invalidate() when the blurred base changes in place (search trail).
+    """
+    def __init__(self, feather=0.35):
+        self.feather = feather  # Fraction of the radius that fades from sharp to blurred
+        self.blurred = None  # Source images the arrays below were taken from
+        self.sharp = None
+        self.base = None  # uint8 RGBA copies of the sources
+        self.detail = None
+        self.frame = None
+        self.image = None  # PIL view of self.frame
+        self.last_box = None
+        self.stale = False
+        self.weights = {}  # radius -> uint16 (sharp, blurred) weights summing to 256, shape (2r+1, 2r+1, 1)
+        self.mix = None  # uint16 scratch, sized for the largest radius so far
+        self.under = None
+
+    def invalidate(self):
+        self.stale = True
+
+    def falloff(self, radius):
+        weights = self.weights.get(radius)
+        if weights is None:
+            span = np.arange(-radius, radius + 1, dtype=np.float32)
+            distance = np.sqrt(span[None, :] ** 2 + span[:, None] ** 2)
+            inner = radius * (1 - self.feather)
+            t = np.clip((radius - distance) / max(radius - inner, 1e-6), 0, 1)
+            inside = np.rint(t * t * (3 - 2 * t) * 256).astype(np.uint16)[..., None]  # Smoothstep
+            weights = self.weights[radius] = (inside, 256 - inside)
+            side = 2 * radius + 1
+            if self.mix is None or self.mix.shape[0] < side:
+                self.mix = np.empty((side, side, 4), dtype=np.uint16)
+                self.under = np.empty((side, side, 4), dtype=np.uint16)
+        return weights
+
+    def sync(self, blurred, sharp):
+        """Take new source arrays when the round's images change"""
+        if blurred is self.blurred and sharp is self.sharp and not self.stale:
+            return
+        if sharp is not self.sharp:
+            self.detail = np.array(sharp.convert("RGBA"), dtype=np.uint8)
+            self.sharp = sharp
+        self.base = np.array(blurred.convert("RGBA"), dtype=np.uint8)
+        self.blurred = blurred
+        if self.frame is None or self.frame.shape != self.base.shape:
+            self.frame = np.empty_like(self.base)
+            self.image = Image.frombuffer("RGBA", blurred.size, self.frame, "raw", "RGBA", 0, 1)
+        np.copyto(self.frame, self.base)
+        self.last_box = None
+        self.stale = False
+
+    def render(self, blurred, sharp, x, y, radius):
+        if sharp is None or sharp.size != blurred.size:
+            return compose_reveal(blurred, sharp, x, y, radius)
+        radius = max(1, int(radius))
+        inside, outside = self.falloff(radius)
+        self.sync(blurred, sharp)
+
+        # Put back the blurred pixels under the previous reveal
+        if self.last_box is not None:
+            x1, y1, x2, y2 = self.last_box
+            self.frame[y1:y2, x1:x2] = self.base[y1:y2, x1:x2]
+
+        height, width = self.frame.shape[:2]
+        x, y = int(x), int(y)
+        x1, y1 = max(0, x - radius), max(0, y - radius)
+        x2, y2 = min(width, x + radius + 1), min(height, y + radius + 1)
+        if x1 >= x2 or y1 >= y2:
+            self.last_box = None
+            return self.image
+        rows = slice(y1 - (y - radius), y2 - (y - radius))
+        cols = slice(x1 - (x - radius), x2 - (x - radius))
+        mix = self.mix[:y2 - y1, :x2 - x1]
+        under = self.under[:y2 - y1, :x2 - x1]
+
+        # frame = (sharp * w + blurred * (256 - w)) >> 8, all in place
+        np.multiply(self.detail[y1:y2, x1:x2], inside[rows, cols], out=mix)
+        np.multiply(self.base[y1:y2, x1:x2], outside[rows, cols], out=under)
+        mix += under
+        np.right_shift(mix, 8, out=self.frame[y1:y2, x1:x2], casting="unsafe")
+        self.last_box = (x1, y1, x2, y2)
+        return self.image
+
+
+REVEAL_STYLES = {"hard": HardReveal, "feathered": FeatheredReveal}
+
+
+def reveal_renderer(style):
+    """A reveal renderer by style name; unknown names get the hard edge"""
+    return REVEAL_STYLES.get(style, HardReveal)()
+
+
+def preview_image(source, bounds=(800, 600), factor=8, blur=2):
+    """A quick, heavily blurred stand-in for source at the size the puzzle will have.
+
+    source is a path or an image. Paths are decoded at reduced scale (JPEG draft mode)
+    so the preview costs a fraction of a full load.
+    """
+    from PIL import ImageFilter
+    image = Image.open(source) if isinstance(source, str) else source
+    width, height = image.size
+    scale = min(1.0, bounds[0] / width, bounds[1] / height)  # Same fit as thumbnail(bounds)
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    small = (max(1, size[0] // factor), max(1, size[1] // factor))
+    if isinstance(source, str):
+        image.draft("RGB", small)
+    image = image.convert("RGB")
+    image = image.resize(small, Image.Resampling.BILINEAR) if image.size != small else image
+    return image.filter(ImageFilter.GaussianBlur(blur)).resize(size, Image.Resampling.BILINEAR)
+
+
+def reblur_regions(blurred_background, composite, rects, radius):
+    """GaussianBlur(radius) of composite, given the same blur of the background under it.
+
+    The two only differ near the pasted rects, so just those neighborhoods are
+    re-blurred, each from a crop wide enough that the result matches a full blur.
+    """
+    from PIL import ImageFilter
+    pad = int(4 * radius) + 2  # Beyond the reach of PIL's box-blur approximation
+    width, height = composite.size
+    regions = []
+    for x1, y1, x2, y2 in rects:
+        inner = (max(0, x1 - pad), max(0, y1 - pad), min(width, x2 + pad), min(height, y2 + pad))
+        outer = (max(0, inner[0] - pad), max(0, inner[1] - pad), min(width, inner[2] + pad), min(height, inner[3] + pad))
+        regions.append((inner, outer))
+
+    # With many large rects the crops cost more than blurring everything once
+    if sum((o[2] - o[0]) * (o[3] - o[1]) for _, o in regions) >= width * height / 2:
+        return composite.filter(ImageFilter.GaussianBlur(radius))
+
+    frame = blurred_background.copy()
+    for inner, outer in regions:
+        patch = composite.crop(outer).filter(ImageFilter.GaussianBlur(radius))
+        left, top = inner[0] - outer[0], inner[1] - outer[1]
+        frame.paste(patch.crop((left, top, left + inner[2] - inner[0], top + inner[3] - inner[1])), inner[:2])
+    return frame
+
+
+class TkBackend:
+    """Presents frames to a Tk canvas through PhotoImage"""
+    def photo(self, image):
+        from PIL import ImageTk
+        return ImageTk.PhotoImage(image)
+
+
+class OffscreenBackend:
+    """Keeps frames as PIL images for an OffscreenCanvas"""
+    def photo(self, image):
+        return image
+
+
+class OffscreenCanvas:
+    """In-memory canvas with the subset of the Tk canvas API the game draws with"""
+    def __init__(self, width=800, height=600, bg="white"):
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.items = {}  # item -> {"kind", "coords", "options", "tags"}
+        self.order = []  # stacking order, bottom first
+        self.bindings = {}
+        self.next_id = 1
+
+    # --- Tk canvas API ---
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def config(self, **options):
+        self.width = options.get("width", self.width)
+        self.height = options.get("height", self.height)
+
+    configure = config
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def unbind(self, sequence):
+        self.bindings.pop(sequence, None)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item]["coords"] = coords
+        return list(self.items[item]["coords"])
+
+    def itemconfig(self, item, **options):
+        entry = self.items.get(item)
+        if entry is None:
+            return
+        if "tags" in options:
+            entry["tags"] = self._tags(options.pop("tags"))
+        entry["options"].update(options)
+
+    itemconfigure = itemconfig
+
+    def tag_raise(self, item):
+        for target in self._resolve(item):
+            self.order.remove(target)
+            self.order.append(target)
+
+    def delete(self, item):
+        for target in self._resolve(item):
+            self.items.pop(target, None)
+            self.order.remove(target)
+
+    # --- Offscreen output ---
+
+    def item_count(self):
+        return len(self.items)
+
+    def render(self):
+        """Composite every visible item, bottom to top, into an RGB image"""
+        frame = Image.new("RGBA", (self.width, self.height), ImageColor.getrgb(self.bg) + (255,))
+        for item in self.order:
+            entry = self.items[item]
+            options = entry["options"]
+            if options.get("state") == "hidden":
+                continue
+            if entry["kind"] == "image":
+                image = options.get("image")
+                if image is not None:
+                    x, y = (int(v) for v in entry["coords"][:2])
+                    frame.paste(image.convert("RGBA"), (x, y))
+                continue
+            layer = Image.new("RGBA", frame.size, (0, 0, 0, 0))
+            self._draw(ImageDraw.Draw(layer), entry)
+            frame.alpha_composite(layer)
+        return frame.convert("RGB")
+
+    # --- Helpers ---
+
+    def _create(self, kind, coords, options):
+        item = self.next_id
+        self.next_id += 1
+        tags = self._tags(options.pop("tags", ()))
+        self.items[item] = {"kind": kind, "coords": coords, "options": dict(options), "tags": tags}
+        self.order.append(item)
+        return item
+
+    def _tags(self, tags):
+        return (tags,) if isinstance(tags, str) else tuple(tags)
+
+    def _resolve(self, item):
+        if item in self.items:
+            return [item]
+        return [i for i in list(self.order) if item in self.items[i]["tags"]]
+
+    def _color(self, color, alpha):
+        if not color:
+            return None
+        return ImageColor.getrgb(color)[:3] + (int(255 * alpha),)
+
+    def _draw(self, draw, entry):
+        options = entry["options"]
+        coords = [float(v) for v in entry["coords"]]
+        if entry["kind"] in ("oval", "rectangle"):
+            alpha = STIPPLE_ALPHA.get(options.get("outlinestipple", ""), 1.0)
+            shape = draw.ellipse if entry["kind"] == "oval" else draw.rectangle
+            shape(coords, outline=self._color(options.get("outline", "black"), alpha),
+                  fill=self._color(options.get("fill", ""), alpha), width=int(options.get("width", 1)))
+        elif entry["kind"] == "text":
+            alpha = STIPPLE_ALPHA.get(options.get("stipple", ""), 1.0)
+            font = options.get("font")
+            size = font[1] if isinstance(font, tuple) and len(font) > 1 else 12
+            try:
+                pil_font = ImageFont.load_default(size)
+            except TypeError:  # Pillow < 10.1 has a single fixed-size default font
+                pil_font = ImageFont.load_default()
+            draw.text(coords[:2], options.get("text", ""), fill=self._color(options.get("fill", "black"), alpha),
+                      font=pil_font, anchor="mm")
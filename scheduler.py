@@ -0,0 +1,244 @@
+import logging
+import math
+import time
+
+from game_log import get_logger
+
+log = get_logger("scheduler")
+
+
+class Task:
+    """A callback the scheduler runs at `due` (monotonic seconds); repeats when it has an interval"""
+    def __init__(self, due, callback, args=(), interval=None, group=None, widget=None):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.group = group
+        self.widget = widget  # Dropped once this widget is destroyed
+        self.paused_at = None
+        self.cancelled = False
+
+    def shift(self, delta):
+        """Move the task later by delta seconds (after a pause)"""
+        self.due += delta
+
+    def fire(self, now):
+        """Run the callback; return True while the task should stay scheduled"""
+        self.callback(*self.args)
+        if self.interval is None:
+            return False
+        # Fixed cadence from the original due time; skip beats missed while the app was busy
+        self.due += self.interval
+        if self.due <= now:
+            self.due += math.ceil((now - self.due) / self.interval) * self.interval
+        return True
+
+
+class Animation(Task):
+    """Calls step(progress) every frame for duration seconds, then done()"""
+    def __init__(self, now, duration, step, done, frame, group, widget):
+        super().__init__(now, step, interval=frame, group=group, widget=widget)
+        self.start = now
+        self.duration = duration
+        self.done = done
+
+    def shift(self, delta):
+        super().shift(delta)
+        self.start += delta
+
+    def fire(self, now):
+        progress = min(1.0, (now - self.start) / self.duration) if self.duration > 0 else 1.0
+        self.callback(progress)
+        if progress >= 1.0:
+            if self.done:
+                self.done()
+            return False
+        self.due = now + self.interval
+        return True
+
+
+class Countdown(Task):
+    """Whole-second countdown measured against a deadline, so late ticks never accumulate.
+
+    on_tick(seconds_left) runs as each second passes and on_done() when it reaches zero.
+    """
+    def __init__(self, now, seconds, on_tick, on_done, group, widget):
+        super().__init__(now, on_tick, group=group, widget=widget)
+        self.deadline = now + seconds
+        self.on_done = on_done
+        self.shown = math.ceil(seconds)
+        self.due = self.next_due()
+
+    def shift(self, delta):
+        super().shift(delta)
+        self.deadline += delta
+
+    def left(self, now=None):
+        """Whole seconds remaining (frozen while paused)"""
+        now = self.paused_at if self.paused_at is not None else (now or time.monotonic())
+        return max(0, math.ceil(self.deadline - now - 1e-6))
+
+    def set_left(self, seconds, now=None):
+        now = self.paused_at if self.paused_at is not None else (now or time.monotonic())
+        self.deadline = now + seconds
+        self.shown = math.ceil(seconds)
+        self.due = self.next_due()
+
+    def next_due(self):
+        # The moment the displayed value drops by one
+        return self.deadline - max(self.shown - 1, 0)
+
+    def fire(self, now):
+        left = self.left(now)
+        if left != self.shown:
+            self.shown = left
+            self.callback(left)
+        if left <= 0:
+            if self.on_done:
+                self.on_done()
+            return False
+        self.due = self.next_due()
+        return True
+
+
+class Scheduler:
+    """Drives every timed task in the game from one monotonic-clock tick on the Tk loop.
+
+    Tasks belong to groups that can be paused, resumed or cancelled together. Each
+    tick runs due tasks oldest first and stops once budget_ms is spent, leaving the
+    rest for the next tick so a burst of work never stalls input handling.
+    Without a window (headless) call tick() yourself.
+    """
+    def __init__(self, window, frame_ms=16, budget_ms=8):
+        self.window = window
+        self.frame = frame_ms / 1000.0
+        self.budget = budget_ms / 1000.0
+        self.tasks = []
+        self.paused_groups = {}  # group -> monotonic time it was paused
+        self.after_id = None
+        self.wake_at = None
+        self.overruns = 0  # Ticks that hit the budget with work left
+
+    # --- Scheduling ---
+
+    def add(self, task):
+        if task.group in self.paused_groups:
+            task.paused_at = self.paused_groups[task.group]
+        self.tasks.append(task)
+        self.arm()
+        return task
+
+    def call_later(self, delay_ms, callback, *args, group=None, widget=None):
+        return self.add(Task(time.monotonic() + delay_ms / 1000.0, callback, args, group=group, widget=widget))
+
+    def every(self, interval_ms, callback, *args, group=None, widget=None):
+        interval = interval_ms / 1000.0
+        return self.add(Task(time.monotonic() + interval, callback, args, interval, group, widget))
+
+    def animate(self, duration_ms, step, done=None, group=None, widget=None):
+        return self.add(Animation(time.monotonic(), duration_ms / 1000.0, step, done, self.frame, group, widget))
+
+    def countdown(self, seconds, on_tick, on_done=None, group=None, widget=None):
+        return self.add(Countdown(time.monotonic(), seconds, on_tick, on_done, group, widget))
+
+    def cancel(self, task):
+        if task is None:
+            return
+        task.cancelled = True
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def cancel_group(self, group):
+        for task in [t for t in self.tasks if t.group == group]:
+            self.cancel(task)
+        self.paused_groups.pop(group, None)
+
+    # --- Pause / resume ---
+
+    def pause(self, group):
+        if group in self.paused_groups:
+            return
+        now = time.monotonic()
+        self.paused_groups[group] = now
+        for task in self.tasks:
+            if task.group == group:
+                task.paused_at = now
+
+    def resume(self, group):
+        started = self.paused_groups.pop(group, None)
+        if started is None:
+            return
+        delta = time.monotonic() - started
+        for task in self.tasks:
+            if task.group == group and task.paused_at is not None:
+                task.paused_at = None
+                task.shift(delta)
+        self.arm()
+
+    def is_paused(self, group):
+        return group in self.paused_groups
+
+    # --- Tick ---
+
+    def tick(self):
+        self.after_id = None
+        self.wake_at = None
+        began = time.perf_counter()
+        now = time.monotonic()
+        due = sorted((t for t in self.tasks if t.paused_at is None and t.due <= now), key=lambda t: t.due)
+        for task in due:
+            if task.cancelled:
+                continue
+            if time.perf_counter() - began > self.budget:
+                self.overruns += 1
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Tick over budget", extra={"fields": {
+                        "overruns": self.overruns, "ms": round((time.perf_counter() - began) * 1000, 2)}})
+                break
+            if task.widget is not None and not widget_alive(task.widget):
+                self.cancel(task)
+                continue
+            try:
+                keep = task.fire(now)
+            except Exception as e:
+                log.exception("Error in scheduled task %s: %s", getattr(task.callback, '__name__', task.callback), e)
+                keep = False
+            if not keep and not task.cancelled:
+                self.cancel(task)
+        self.arm()
+
+    def arm(self):
+        """Make sure the Tk loop wakes us for the next due task"""
+        if self.window is None:
+            return
+        pending = [t.due for t in self.tasks if t.paused_at is None]
+        if not pending:
+            self.disarm()
+            return
+        wake = min(pending)
+        if self.after_id is not None and self.wake_at <= wake:
+            return
+        self.disarm()
+        delay = max(1, int((wake - time.monotonic()) * 1000))
+        try:
+            self.after_id = self.window.after(delay, self.tick)
+            self.wake_at = wake
+        except Exception:
+            self.after_id = None  # Window already destroyed
+
+    def disarm(self):
+        if self.after_id is not None:
+            try:
+                self.window.after_cancel(self.after_id)
+            except Exception:
+                pass
+        self.after_id = None
+        self.wake_at = None
+
+
+def widget_alive(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
@@ -0,0 +1,160 @@
+import queue
+import sqlite3
+import threading
+import time
+
+from game_log import get_logger, timed
+
+log = get_logger("scores")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    image TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    story INTEGER NOT NULL,
+    seed INTEGER,
+    found INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    max_clicks INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    efficiency REAL NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_leaderboard ON rounds (image, difficulty, won, points DESC, efficiency DESC);
+CREATE INDEX IF NOT EXISTS rounds_difficulty ON rounds (difficulty, won, points DESC, efficiency DESC);
+CREATE TABLE IF NOT EXISTS purchases (
+    id INTEGER PRIMARY KEY,
+    bought_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    cost INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+INSERT_ROUND = ("INSERT INTO rounds (played_at, image, difficulty, story, seed, found, total, clicks, max_clicks, "
+                "won, points, efficiency, duration_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_PURCHASE = "INSERT INTO purchases (bought_at, kind, cost) VALUES (?, ?, ?)"
+SET_PROFILE = "INSERT INTO profile (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")  # Readers never wait for the writer thread
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ScoreStore:
+    """Local SQLite store for rounds, points, story progress and purchases.
+
+    Writes are queued and committed in batches by a background thread, so recording
+    a result costs the caller one queue put. Reads use their own connection and see
+    everything that has been flushed; call flush() first when they must be current.
+    """
+    def __init__(self, path="chameleon_hunt.db", batch_size=64, flush_ms=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self.reader = connect(path)
+        self.reader.executescript(SCHEMA)
+        self.reader.commit()
+        row = self.reader.execute("SELECT value FROM profile WHERE key = 'points'").fetchone()
+        self.points = row[0] if row else 0  # Mirrors the queued value so reads never wait on the writer
+        row = self.reader.execute("SELECT value FROM profile WHERE key = 'story_levels_completed'").fetchone()
+        self.levels_completed = row[0] if row else 0  # Mirrored the same way
+        self.writes = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, name="score-store", daemon=True)
+        self.writer.start()
+
+    # --- Writes (queued) ---
+
+    def record_round(self, result):
+        """Queue one finished round; result is the dict from GameLogic.round_result"""
+        self.writes.put((INSERT_ROUND, (time.time(), result["image"], result["difficulty"], int(result["story"]),
+                                        result["seed"], result["found"], result["total"], result["clicks"],
+                                        result["max_clicks"], int(result["won"]), result["points"],
+                                        result["efficiency"], result["duration_ms"])))
+
+    def save_points(self, points):
+        if points != self.points:
+            self.points = points
+            self.writes.put((SET_PROFILE, ("points", points)))
+
+    def save_story_progress(self, levels_completed):
+        """Levels completed in the current playthrough; a restarted story saves lower values again"""
+        if levels_completed != self.levels_completed:
+            self.levels_completed = levels_completed
+            self.writes.put((SET_PROFILE, ("story_levels_completed", levels_completed)))
+
+    def record_purchase(self, kind, cost):
+        self.writes.put((INSERT_PURCHASE, (time.time(), kind, cost)))
+
+    def write_loop(self):
+        conn = connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self.writes.get()]
+            # Collect whatever else arrives within the flush window, up to a batch
+            deadline = time.monotonic() + self.flush_ms / 1000
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.writes.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            statements = [item for item in batch if item is not None]
+            stopping = len(statements) < len(batch)
+            try:
+                with timed(log, "Committed batch", writes=len(statements)), conn:  # One transaction per batch
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+            except sqlite3.Error as e:
+                log.error("Error saving scores: %s", e)
+            finally:
+                for _ in batch:
+                    self.writes.task_done()
+        conn.close()
+
+    def flush(self):
+        """Block until every queued write is committed"""
+        self.writes.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join()
+        self.reader.close()
+
+    # --- Reads ---
+
+    def leaderboard(self, image=None, difficulty=None, limit=10):
+        """Best winning rounds by points then efficiency, optionally for one image and/or difficulty"""
+        where, params = ["won = 1"], []
+        if image is not None:
+            where.append("image = ?")
+            params.append(image)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        sql = (f"SELECT played_at, image, difficulty, points, efficiency, clicks, duration_ms FROM rounds "
+               f"WHERE {' AND '.join(where)} ORDER BY points DESC, efficiency DESC LIMIT ?")
+        return self.reader.execute(sql, params + [limit]).fetchall()
+
+    def story_levels_completed(self):
+        return self.levels_completed
+
+    def purchase_counts(self):
+        return dict(self.reader.execute("SELECT kind, count(*) FROM purchases GROUP BY kind"))
+
+    def stats(self, difficulty=None):
+        """(rounds played, rounds won) overall or for one difficulty"""
+        sql = "SELECT count(*), coalesce(sum(won), 0) FROM rounds"
+        if difficulty is None:
+            return self.reader.execute(sql).fetchone()
+        return self.reader.execute(sql + " WHERE difficulty = ?", (difficulty,)).fetchone()
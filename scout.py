@@ -0,0 +1,59 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+# The scout powerup circles a region that holds an unfound chameleon. Hints are
+# worked out once per round, right after placement, from the complexity map the
+# placement already computed: textured ground near a chameleon is where a player
+# would expect one to hide, so the circle is centered on such a spot rather than
+# on the chameleon itself. Using the powerup just picks a precomputed hint.
+
+CELL = 4  # Likelihood maps are built on a grid of CELL x CELL pixel blocks
+
+
+def block_means(values, cell):
+    """Downscale a 2D map by averaging cell x cell blocks (edges that do not fill a block are dropped)"""
+    h, w = values.shape[0] // cell, values.shape[1] // cell
+    return values[:h * cell, :w * cell].reshape(h, cell, w, cell).mean(axis=(1, 3))
+
+
+def scout_hints(complexity_map, positions, fuzz, rng):
+    """One (x, y, radius) circle per chameleon rect, each containing its whole chameleon.
+
+    fuzz is the circle radius in chameleon sizes; larger means vaguer hints. The
+    center is drawn from the complexity map times a blurred occupancy map of all
+    the chameleons, limited to where the circle still covers the chameleon.
+    """
+    if not positions:
+        return []
+    complexity = block_means(np.asarray(complexity_map, dtype=np.float32), CELL)
+    rows, cols = complexity.shape
+
+    # Occupancy of every chameleon, blurred out to about the hint radius
+    sizes = [max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in positions]
+    occupancy = Image.new("L", (cols, rows), 0)
+    draw = ImageDraw.Draw(occupancy)
+    for x1, y1, x2, y2 in positions:
+        draw.rectangle((x1 // CELL, y1 // CELL, x2 // CELL, y2 // CELL), fill=255)
+    spread = fuzz * sum(sizes) / len(sizes) / CELL / 2
+    occupancy = occupancy.filter(ImageFilter.GaussianBlur(max(1.0, spread)))
+    likelihood = complexity * (np.asarray(occupancy, dtype=np.float32) / 255) + 1e-6
+
+    hints = []
+    for (x1, y1, x2, y2), size in zip(positions, sizes):
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        radius = fuzz * size
+        reach = max(0.0, radius - size / 2 * 1.42)  # How far the center may move with the rect still inside
+        c1, c2 = max(0, int((cx - reach) // CELL)), min(cols, int((cx + reach) // CELL) + 1)
+        r1, r2 = max(0, int((cy - reach) // CELL)), min(rows, int((cy + reach) // CELL) + 1)
+        gx = (np.arange(c1, c2) + 0.5) * CELL
+        gy = (np.arange(r1, r2) + 0.5) * CELL
+        inside = (gx[None, :] - cx) ** 2 + (gy[:, None] - cy) ** 2 <= reach * reach
+        weights = (likelihood[r1:r2, c1:c2] * inside).ravel()
+        if weights.size == 0 or weights.sum() <= 0:
+            hints.append((int(cx), int(cy), int(radius)))
+            continue
+        cumulative = np.cumsum(weights)
+        pick = min(int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side="right")), weights.size - 1)
+        row, col = divmod(pick, c2 - c1)
+        hints.append((int(gx[col]), int(gy[row]), int(radius) + 2))  # Margin for the rounding
+    return hints
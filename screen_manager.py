@@ -0,0 +1,39 @@
+import tkinter as tk
+
+
+class ScreenManager:
+    """Builds each screen frame once and switches screens by packing/unpacking them"""
+    def __init__(self, parent, bg="#ADD8E6"):
+        self.parent = parent
+        self.bg = bg
+        self.builders = {}  # name -> build(frame), called once per screen
+        self.updaters = {}  # name -> update(**state), called on every show
+        self.screens = {}  # name -> built frame
+        self.current = None
+
+    def register(self, name, build, update=None):
+        self.builders[name] = build
+        if update:
+            self.updaters[name] = update
+
+    def get(self, name):
+        """Return the screen frame, building it the first time it is needed"""
+        frame = self.screens.get(name)
+        if frame is None or not frame.winfo_exists():
+            frame = tk.Frame(self.parent, bg=self.bg)
+            self.screens[name] = frame
+            self.builders[name](frame)
+        return frame
+
+    def show(self, name, **state):
+        """Refresh the screen's dynamic widgets and make it the visible screen"""
+        frame = self.get(name)
+        if name in self.updaters:
+            self.updaters[name](**state)
+        if self.current != name:
+            current = self.screens.get(self.current)
+            if current is not None and current.winfo_exists():
+                current.pack_forget()
+            frame.pack(expand=True, fill="both")
+            self.current = name
+        return frame
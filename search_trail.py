@@ -0,0 +1,95 @@
+import numpy as np
+from PIL import Image, ImageColor
+
+
+class SearchTrail:
+    """Persistent record of where the player has searched, drawn over the blurred puzzle.
+
+    Every click splats its feedback color into float accumulation buffers; older
+    splats fade by `decay` per click. Decay is kept as one running scale factor
+    instead of touching the buffers, so a click costs one splat, and render()
+    recomposites only the regions that changed. The whole frame is redrawn only
+    once the fading since the last full draw becomes visible, so the cost does
+    not grow with the number of clicks in a round.
+    """
+    def __init__(self, size, radius=22, strength=0.8, decay=0.93, max_alpha=0.5, refresh=0.75):
+        width, height = size
+        self.size = (width, height)
+        self.radius = radius
+        self.strength = strength
+        self.decay = decay
+        self.max_alpha = max_alpha
+        self.refresh = refresh  # Redraw everything once old splats have faded to this fraction
+        self.weight = np.zeros((height, width), dtype=np.float32)  # Stored divided by self.scale
+        self.color = np.zeros((height, width, 3), dtype=np.float32)  # Weight-weighted color sums
+        self.scale = 1.0
+        self.drawn_scale = 1.0  # self.scale at the last full draw
+        self.kernel = self._kernel(radius)
+        self.frame = None  # Last composited frame
+        self.base = None  # The image that frame was composited over
+        self.dirty = None  # Bounding box of splats since the last render
+        self.clicks = 0
+
+    @staticmethod
+    def _kernel(radius):
+        span = np.arange(-radius, radius + 1, dtype=np.float32)
+        d2 = span[None, :] ** 2 + span[:, None] ** 2
+        kernel = np.exp(-d2 / (2 * (radius / 2.0) ** 2))
+        kernel[d2 > radius * radius] = 0
+        return kernel
+
+    def splat(self, x, y, color):
+        """Record a click at (x, y) in the given color ("#rrggbb" or an RGB tuple)"""
+        rgb = np.array(ImageColor.getrgb(color)[:3] if isinstance(color, str) else color[:3], dtype=np.float32)
+        self.clicks += 1
+        self.scale *= self.decay
+        if self.scale < 1e-4:
+            # Fold the scale back into the buffers before float32 runs out of range
+            self.weight *= self.scale
+            self.color *= self.scale
+            self.drawn_scale /= self.scale
+            self.scale = 1.0
+
+        width, height = self.size
+        r = self.radius
+        x, y = int(x), int(y)
+        x1, y1, x2, y2 = max(0, x - r), max(0, y - r), min(width, x + r + 1), min(height, y + r + 1)
+        if x1 >= x2 or y1 >= y2:
+            return
+        k = self.kernel[y1 - (y - r):y2 - (y - r), x1 - (x - r):x2 - (x - r)] * (self.strength / self.scale)
+        self.weight[y1:y2, x1:x2] += k
+        self.color[y1:y2, x1:x2] += k[..., None] * rgb
+        box = (x1, y1, x2, y2)
+        if self.dirty is None:
+            self.dirty = box
+        else:
+            d = self.dirty
+            self.dirty = (min(d[0], x1), min(d[1], y1), max(d[2], x2), max(d[3], y2))
+
+    def render(self, base):
+        """base with the trail composited over it; reuses the previous frame where nothing changed"""
+        if base.size != self.size:
+            return base
+        if self.frame is None or base is not self.base or self.scale < self.drawn_scale * self.refresh:
+            self.base = base
+            self.frame = base.convert("RGB") if base.mode != "RGB" else base.copy()
+            self.drawn_scale = self.scale
+            self.dirty = None
+            if self.clicks:
+                self._draw((0, 0) + self.size)
+        elif self.dirty is not None:
+            self._draw(self.dirty)
+            self.dirty = None
+        return self.frame
+
+    def _draw(self, box):
+        x1, y1, x2, y2 = box
+        weight = self.weight[y1:y2, x1:x2]
+        alpha = np.minimum(weight * np.float32(self.scale * self.max_alpha), np.float32(self.max_alpha))
+        # Mean splat color, then blended over the base by alpha, in place to keep it to a few passes
+        out = self.color[y1:y2, x1:x2] / np.maximum(weight, np.float32(1e-12))[..., None]
+        under = np.asarray(self.base.crop(box).convert("RGB"), dtype=np.float32)
+        out -= under
+        out *= alpha[..., None]
+        out += under
+        self.frame.paste(Image.fromarray(out.astype(np.uint8), "RGB"), box[:2])
@@ -0,0 +1,255 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from game_functions import FEEDBACK_BANDS, PlacementError, feedback_reference
+from game_log import configure as configure_logging
+from headless import HeadlessUI
+from input_trace import percentile
+from puzzle_factory import generate_background, generate_puzzle
+
+# Plays thousands of seeded puzzles per difficulty preset with scripted players
+# so difficulty_settings can be tuned from win rates instead of guesswork.
+BOTS = ("random", "complexity", "heatmap")
+
+_worker = None  # Per-process state: one headless host plus cached backgrounds
+
+
+def init_worker(size, images, cache_maps, local_camouflage, log_levels):
+    global _worker
+    configure_logging(log_levels, queued=False)  # A forked worker has no listener thread of its own
+    _worker = SimpleNamespace(ui=HeadlessUI(), size=size, images=images, cache_maps=cache_maps, backgrounds={})
+    _worker.ui.game_logic.local_camouflage = local_camouflage
+
+
+def background(index):
+    """Background image and its complexity map, built once per worker"""
+    cached = _worker.backgrounds.get(index)
+    if cached is None:
+        if _worker.images:
+            img = Image.open(_worker.images[index % len(_worker.images)]).convert("RGB")
+            img.thumbnail(_worker.size)
+        else:
+            img = generate_background(index, _worker.size)
+        complexity = _worker.ui.game_logic.calculate_complexity_map(img) if _worker.cache_maps else None
+        cached = _worker.backgrounds[index] = (img, complexity)
+    return cached
+
+
+class Bot:
+    """Picks click positions; subclasses decide how. Clicks are grid points a stride apart."""
+    def __init__(self, logic, visible_complexity, rng):
+        self.logic = logic
+        self.rng = rng
+        self.ref = feedback_reference(logic.chameleon_positions)  # Players learn the size from the difficulty
+        self.stride = max(2, int(self.ref / 3))
+        xs = np.arange(self.stride // 2, logic.img_width, self.stride)
+        ys = np.arange(self.stride // 2, logic.img_height, self.stride)
+        self.gx, self.gy = np.meshgrid(xs, ys)
+        self.alive = np.ones(self.gx.shape, dtype=bool)
+        self.weights = self.initial_weights(visible_complexity)
+
+    def initial_weights(self, visible_complexity):
+        return np.ones(self.gx.shape)
+
+    def exclude(self, x, y, radius):
+        self.alive &= (self.gx - x) ** 2 + (self.gy - y) ** 2 >= radius ** 2
+
+    def exclude_rect(self, rect):
+        x1, y1, x2, y2 = rect
+        self.alive &= ~((self.gx >= x1) & (self.gx <= x2) & (self.gy >= y1) & (self.gy <= y2))
+
+    def sample(self, mask):
+        weights = np.where(mask, self.weights, 0).ravel()
+        if weights.sum() <= 0:
+            weights = mask.ravel().astype(float)
+            if weights.sum() <= 0:
+                weights = np.ones(weights.shape)
+        index = self.rng.choice(weights.size, p=weights / weights.sum())
+        return int(self.gx.flat[index]), int(self.gy.flat[index])
+
+    def next_click(self):
+        return self.sample(self.alive)
+
+    def observe(self, x, y, tier, found_rect):
+        # A miss only rules out the spot itself
+        if found_rect is not None:
+            self.exclude_rect(found_rect)
+        else:
+            self.exclude(x, y, self.ref / 2)
+
+
+class RandomBot(Bot):
+    """Clicks anywhere it has not clicked before"""
+
+
+class ComplexityBot(Bot):
+    """Prefers busy regions of the visible image, where placement hides chameleons"""
+    def initial_weights(self, visible_complexity):
+        return visible_complexity[self.gy, self.gx] ** 2 + 1e-6
+
+
+class HeatmapBot(ComplexityBot):
+    """Uses the heatmap feedback: rules out disks and searches inside the warm ring"""
+    def __init__(self, logic, visible_complexity, rng):
+        super().__init__(logic, visible_complexity, rng)
+        self.ring = None
+        self.found_centers = []
+
+    def next_click(self):
+        if self.ring is not None and (self.ring & self.alive).any():
+            return self.sample(self.ring & self.alive)
+        return self.sample(self.alive)
+
+    def observe(self, x, y, tier, found_rect):
+        if found_rect is not None:
+            x1, y1, x2, y2 = found_rect
+            self.found_centers.append(((x1 + x2) / 2, (y1 + y2) / 2))
+            self.exclude_rect(found_rect)
+            self.ring = None
+            return
+        if tier is None:
+            self.exclude(x, y, self.ref / 2)
+            return
+
+        # Nothing, found or not, sits closer than the band's lower edge
+        low = FEEDBACK_BANDS[tier - 1] * self.ref if tier > 0 else 0
+        self.exclude(x, y, max(low, self.ref / 2))
+        if tier >= len(FEEDBACK_BANDS) - 1:
+            return  # Cool/freezing: no usable upper bound
+        high = FEEDBACK_BANDS[tier] * self.ref
+        if any(np.hypot(cx - x, cy - y) < high for cx, cy in self.found_centers):
+            return  # The feedback may be about a chameleon already found
+
+        # Keep narrowing while consecutive clicks stay warm
+        d2 = (self.gx - x) ** 2 + (self.gy - y) ** 2
+        ring = (d2 >= low ** 2) & (d2 < high ** 2)
+        if self.ring is not None and (self.ring & ring & self.alive).any():
+            ring &= self.ring
+        self.ring = ring
+
+
+BOT_CLASSES = {"random": RandomBot, "complexity": ComplexityBot, "heatmap": HeatmapBot}
+
+
+def play(logic, bot_name, visible_complexity, seed):
+    """Click until every chameleon is found or the clicks run out.
+
+    Clicks are scored with evaluate_clicks, the same hit test and feedback bands as
+    handle_click, without the messages, sounds and reveal redraws of a real round.
+    """
+    bot = BOT_CLASSES[bot_name](logic, visible_complexity, np.random.default_rng(seed))
+    positions = logic.chameleon_positions
+    found = [False] * len(positions)
+    found_at = []
+    clicks = 0
+    while not all(found) and clicks < logic.max_clicks:
+        x, y = bot.next_click()
+        clicks += 1
+        result = logic.evaluate_clicks([x], [y])
+        hit = int(result["hits"][0])
+        if hit < 0:
+            bot.observe(x, y, int(result["tiers"][0]), None)
+        elif not found[hit]:
+            found[hit] = True
+            found_at.append(clicks)
+            bot.observe(x, y, None, positions[hit])
+        else:
+            bot.observe(x, y, None, None)  # Already found: no feedback, like the game's message
+    logic.click_count = clicks
+    logic.found_chameleons = found
+    logic.found = all(found)
+    return found_at
+
+
+def run_chunk(preset, bots, seeds, backgrounds):
+    """Generate each puzzle once and let every bot play it; one result dict per (seed, bot)"""
+    ui = _worker.ui
+    logic = ui.game_logic
+    results = []
+    for seed in seeds:
+        img, complexity = background(seed % backgrounds)
+        start = time.perf_counter()
+        try:
+            composite = generate_puzzle(logic, img, preset, seed, complexity)
+        except PlacementError:
+            results.append({"preset": preset, "bot": None, "failed": True})
+            continue
+        gen_ms = (time.perf_counter() - start) * 1000
+        visible = logic.calculate_complexity_map(composite)  # What a player sees, chameleons included
+        for bot_name in bots:
+            # Every bot gets the same puzzle from a fresh start
+            found_at = play(logic, bot_name, visible, seed)
+            results.append({"preset": preset, "bot": bot_name, "failed": False, "gen_ms": gen_ms,
+                            "won": logic.found, "found": len(found_at), "total": len(logic.chameleon_positions),
+                            "clicks": logic.click_count, "found_at": found_at})
+    return results
+
+
+def summarize(results, presets, bots):
+    print(f"{'preset':<8} {'bot':<11} {'games':>6} {'win %':>6} {'found %':>8} "
+          f"{'clicks/find':>11} {'1st find':>9} {'gen p50 ms':>11} {'gen p95 ms':>11}")
+    for preset in presets:
+        rows = [r for r in results if r["preset"] == preset]
+        failed = sum(1 for r in rows if r["failed"])
+        gen = sorted(r["gen_ms"] for r in rows if not r["failed"] and r["bot"] == bots[0])
+        for bot in bots:
+            games = [r for r in rows if r["bot"] == bot]
+            if not games:
+                continue
+            won = sum(r["won"] for r in games) / len(games) * 100
+            found = sum(r["found"] for r in games) / sum(r["total"] for r in games) * 100
+            finds = sum(r["found"] for r in games)
+            per_find = sum(r["clicks"] for r in games) / finds if finds else float("inf")
+            first = [r["found_at"][0] for r in games if r["found_at"]]
+            first_mean = sum(first) / len(first) if first else float("inf")
+            print(f"{preset:<8} {bot:<11} {len(games):>6} {won:>6.1f} {found:>8.1f} "
+                  f"{per_find:>11.2f} {first_mean:>9.2f} {percentile(gen, 0.5):>11.1f} {percentile(gen, 0.95):>11.1f}")
+        if failed:
+            print(f"{preset:<8} {failed} puzzle(s) could not be placed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded Chameleon Hunt puzzles with bots to calibrate difficulty")
+    parser.add_argument("--puzzles", type=int, default=500, help="puzzles per preset")
+    parser.add_argument("--presets", nargs="+", help="difficulty presets (default: all)")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS), choices=BOTS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--size", default="400x300", help="generated background size, WIDTHxHEIGHT")
+    parser.add_argument("--backgrounds", type=int, default=50, help="distinct backgrounds to cycle through")
+    parser.add_argument("--images", nargs="+", help="use these images instead of generated backgrounds")
+    parser.add_argument("--seed", type=int, default=0, help="first puzzle seed")
+    parser.add_argument("--chunk", type=int, default=25, help="puzzles per worker task")
+    parser.add_argument("--no-cache", action="store_true", help="recompute complexity maps for every puzzle")
+    parser.add_argument("--local-camouflage", action="store_true",
+                        help="blend tiers without their own camouflage toward the pixels underneath")
+    parser.add_argument("--log", help="log levels, e.g. placement=debug")
+    args = parser.parse_args()
+    configure_logging(args.log)
+
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    presets = args.presets or list(HeadlessUI().game_logic.difficulty_settings)
+    backgrounds = len(args.images) if args.images else args.backgrounds
+    seeds = list(range(args.seed, args.seed + args.puzzles))
+    chunks = [(preset, args.bots, seeds[i:i + args.chunk], backgrounds)
+              for preset in presets for i in range(0, len(seeds), args.chunk)]
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(args.workers, initializer=init_worker,
+                             initargs=(size, args.images, not args.no_cache, args.local_camouflage, args.log)) as pool:
+        for chunk in pool.map(run_chunk, *zip(*chunks)):
+            results.extend(chunk)
+    elapsed = time.perf_counter() - start
+
+    summarize(results, presets, args.bots)
+    print(f"{args.puzzles * len(presets)} puzzles, {len(results)} games in {elapsed:.1f}s on {args.workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
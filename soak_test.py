@@ -0,0 +1,250 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+from game_log import configure as configure_logging
+from StoryImages_Class import StoryImages
+
+# Long-session soak test: plays every story level, replays and menu returns for
+# hundreds of cycles and checks that retained memory stops growing. Memory is
+# traced with tracemalloc and snapshotted after a warm-up, once caches, pools
+# and lazily loaded modules have settled; each allocation still alive at the
+# end is charged to the innermost game module on its traceback, so growth is
+# reported per subsystem (game_functions, search_trail, canvas_overlay, ...)
+# rather than per library. Exits with 1 when retained growth passes --max-kb.
+#
+#   python soak_test.py                    headless host, 100 cycles
+#   python soak_test.py --tk --cycles 20   the real GameUI (needs a display)
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+TRACE_FRAMES = 30
+
+
+def subsystem(traceback):
+    """Innermost game module on an allocation's traceback, else the library that made it"""
+    for frame in reversed(traceback):
+        if frame.filename.startswith("<"):
+            continue  # Frozen and generated code
+        filename = os.path.abspath(frame.filename)
+        if os.path.dirname(filename) == REPO and filename != os.path.abspath(__file__):
+            return os.path.splitext(os.path.basename(filename))[0]
+    filename = traceback[-1].filename.replace("\\", "/")
+    for library in ("PIL", "numpy", "tkinter", "pygame", "logging", "concurrent"):
+        if f"/{library}/" in filename:
+            return library
+    return "other"
+
+
+def snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def growth_by_subsystem(before, after):
+    totals = {}
+    for diff in after.compare_to(before, "traceback"):
+        if diff.size_diff:
+            name = subsystem(diff.traceback)
+            size, count = totals.get(name, (0, 0))
+            totals[name] = (size + diff.size_diff, count + diff.count_diff)
+    return sorted(totals.items(), key=lambda item: -item[1][0])
+
+
+# --- Hosts ---
+
+class HeadlessHost:
+    """Drives HeadlessUI through the story, replay and menu flow"""
+    name = "headless"
+
+    def __init__(self, reveal):
+        from headless import HeadlessUI
+        self.ui = HeadlessUI(reveal_style=reveal)
+
+    def story_level(self, level, seed):
+        return self.ui.start_round(level["image_data"], level["difficulty"], story=True, seed=seed)
+
+    def replay(self, level, seed):
+        return self.ui.start_round(level["image_data"], level["difficulty"], seed=seed)
+
+    def menu(self):
+        self.ui.return_to_menu()
+
+    def move(self, x, y):
+        self.ui.update_blur(SimpleNamespace(x=x, y=y, time=0))
+
+    def click(self, x, y):
+        self.ui.game_logic.handle_click(SimpleNamespace(x=x, y=y))
+
+    def powerup(self, kind):
+        self.ui.use_powerup(kind)
+
+    def logic(self):
+        return self.ui.game_logic
+
+    def canvas_items(self):
+        return len(self.ui.game_canvas.items)
+
+    def images(self):
+        return None
+
+
+class TkHost:
+    """Drives the real GameUI on a Tk window, pumping its event loop while rounds are prepared"""
+    name = "tk"
+
+    def __init__(self, reveal):
+        import tkinter as tk
+        from UI_code import GameUI
+        self.window = tk.Tk()
+        self.ui = GameUI(self.window)
+        self.ui.sound_on = False
+        self.ui.set_reveal_style(reveal)
+
+    def pump(self, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        self.window.update()
+        while self.ui.preparing and time.monotonic() < deadline:
+            time.sleep(0.002)
+            self.window.update()
+        return not self.ui.preparing
+
+    def story_level(self, level, seed):
+        self.ui.story_images.current_level = self.ui.story_images.story_levels.index(level)
+        self.ui.puzzle_seed = seed
+        self.ui.start_story_level()
+        return self.pump()
+
+    def replay(self, level, seed):
+        self.ui.stop_timer()
+        self.ui.game_logic.story_mode = False
+        self.ui.image_file = level["image_data"]
+        self.ui.difficulty.set(level["difficulty"])
+        self.ui.puzzle_seed = seed
+        self.ui.start_game()
+        return self.pump()
+
+    def menu(self):
+        self.ui.return_to_main_menu()
+        self.window.update()
+
+    def move(self, x, y):
+        self.ui.update_blur(SimpleNamespace(x=x, y=y, time=0))
+
+    def click(self, x, y):
+        self.ui.on_canvas_click(SimpleNamespace(x=x, y=y))
+        self.window.update()
+
+    def powerup(self, kind):
+        self.ui.use_powerup(kind)
+
+    def logic(self):
+        return self.ui.game_logic
+
+    def canvas_items(self):
+        return len(self.ui.game_canvas.find_all())
+
+    def images(self):
+        return len(self.window.tk.call("image", "names"))
+
+
+def play(host, rng, win):
+    """Sweep the reveal, use a scout, miss a few times and, if win, click every chameleon"""
+    logic = host.logic()
+    width, height = logic.img_width, logic.img_height
+    for _ in range(20):
+        host.move(int(rng.integers(0, width)), int(rng.integers(0, height)))
+    host.powerup("scout")
+    for _ in range(min(3, logic.max_clicks - 1)):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        if not any(x1 <= x <= x2 and y1 <= y <= y2 for x1, y1, x2, y2 in logic.chameleon_positions):
+            host.click(x, y)
+    if win:
+        for x1, y1, x2, y2 in list(logic.chameleon_positions):
+            host.click((x1 + x2) // 2, (y1 + y2) // 2)
+
+
+def cycle(host, levels, index, rng, win):
+    """Every story level, a replay of one of them, then back to the menu"""
+    seed = index * 100
+    for number, level in enumerate(levels):
+        if host.story_level(level, seed + number):
+            play(host, rng, win)
+    level = levels[index % len(levels)]
+    if host.replay(level, seed + 99):
+        play(host, rng, win)
+    host.menu()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cycle story levels, replays and menu returns and check memory stays flat")
+    parser.add_argument("--cycles", type=int, default=100, help="measured cycles (each plays every story level once)")
+    parser.add_argument("--warmup", type=int, default=3, help="cycles before the baseline snapshot")
+    parser.add_argument("--checkpoints", type=int, default=10, help="memory readings over the measured cycles")
+    parser.add_argument("--max-kb", type=float, default=1024, help="fail if retained memory grows by more than this")
+    parser.add_argument("--top", type=int, default=8, help="subsystems to list")
+    parser.add_argument("--reveal", default="hard", help="reveal style")
+    parser.add_argument("--tk", action="store_true", help="drive the real Tk GameUI instead of the headless host")
+    parser.add_argument("--log", help="log levels, e.g. game=info")
+    args = parser.parse_args()
+    configure_logging(args.log, queued=False)
+
+    tracemalloc.start(TRACE_FRAMES)
+    host = TkHost(args.reveal) if args.tk else HeadlessHost(args.reveal)
+    levels = StoryImages().story_levels
+    rng = np.random.default_rng(0)
+    win = not args.tk  # A won story round in Tk hands over to dialogs and timed screens; keep the loop in our hands
+
+    start = time.perf_counter()
+    for index in range(args.warmup):
+        cycle(host, levels, index, rng, win)
+    baseline = snapshot()
+    base_bytes = tracemalloc.get_traced_memory()[0]
+    print(f"{host.name} host, {len(levels)} story levels + 1 replay + menu per cycle; "
+          f"baseline after {args.warmup} warm-up cycle(s): {base_bytes / 1024:.0f} KB traced")
+    print(f"{'cycle':>6} {'traced KB':>10} {'growth KB':>10} {'objects':>8} {'items':>6} {'images':>6} {'s/cycle':>8}")
+
+    every = max(1, args.cycles // max(1, args.checkpoints))
+    last = time.perf_counter()
+    readings = []  # (cycles done, traced bytes)
+    for index in range(args.warmup, args.warmup + args.cycles):
+        cycle(host, levels, index, rng, win)
+        done = index - args.warmup + 1
+        if done % every == 0 or done == args.cycles:
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0]
+            readings.append((done, traced))
+            images = host.images()
+            now = time.perf_counter()
+            print(f"{done:>6} {traced / 1024:>10.0f} {(traced - base_bytes) / 1024:>10.0f} {len(gc.get_objects()):>8} "
+                  f"{host.canvas_items():>6} {images if images is not None else '-':>6} {(now - last) / every:>8.2f}")
+            last = now
+
+    final = snapshot()
+    growth = sum(stat.size for stat in final.statistics("filename")) - sum(
+        stat.size for stat in baseline.statistics("filename"))
+    print(f"\nRetained growth by subsystem over {args.cycles} cycles:")
+    for name, (size, count) in growth_by_subsystem(baseline, final)[:args.top]:
+        print(f"  {name:<18} {size / 1024:>9.1f} KB {count:>+8d} blocks")
+    # Caches fill up early and then stay flat; a leak keeps the slope up to the end
+    middle = ([(0, base_bytes)] + readings)[len(readings) // 2]
+    if readings[-1][0] > middle[0]:
+        print(f"Second-half trend: {(readings[-1][1] - middle[1]) / 1024 / (readings[-1][0] - middle[0]):+.2f} KB/cycle")
+    elapsed = time.perf_counter() - start
+    ok = growth <= args.max_kb * 1024
+    print(f"Total retained growth {growth / 1024:.1f} KB (limit {args.max_kb:.0f} KB) in {elapsed:.0f}s: "
+          f"{'PASS' if ok else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
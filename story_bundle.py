@@ -0,0 +1,179 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from game_log import get_logger
+
+# Story asset bundle: every story level pre-decoded and pre-analyzed in one
+# uncompressed file that is memory-mapped at startup.
+#
+# Layout: MAGIC, a little-endian u32 header length and a JSON header, then raw
+# layers, each starting on a 64-byte boundary. Image layers are RGBA rows so PIL
+# can wrap the mapping without copying; complexity maps are float64 (the dtype
+# calculate_complexity_map returns) so placement is identical with or without
+# the bundle.
+MAGIC = b"CHSB"
+VERSION = 1
+ALIGN = 64
+BUNDLE_PATH = "story_assets.bundle"
+HEADER_LEN = struct.Struct("<I")
+BLUR_LEVELS = (5, 8, 12)  # The reveal blur levels in rendering.REVEAL_SETTINGS
+
+log = get_logger("bundle")
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def build_bundle(levels, path=BUNDLE_PATH, blur_levels=BLUR_LEVELS):
+    """Decode, resize, analyze and blur every level's image and write the bundle"""
+    from game_functions import GameLogic
+    analyzer = GameLogic(None)
+    layers = []  # (level index, name, bytes)
+    header = {"version": VERSION, "levels": []}
+    for index, level in enumerate(levels):
+        source = level["image_data"]
+        # Exactly what prepare_round does to a story image
+        image = Image.open(source)
+        image.thumbnail((800, 600))
+        image = image.convert("RGB")
+        entry = {
+            "meta": level,
+            "source": {"file": source, "size": os.path.getsize(source), "sha1": file_digest(source)},
+            "size": list(image.size),
+            "layers": {},
+        }
+        header["levels"].append(entry)
+        layers.append((index, "image", image.convert("RGBA").tobytes()))
+        for blur in blur_levels:
+            blurred = image.filter(ImageFilter.GaussianBlur(blur))
+            layers.append((index, f"blur_{blur}", blurred.convert("RGBA").tobytes()))
+        complexity = np.ascontiguousarray(analyzer.calculate_complexity_map(image), dtype="<f8")
+        layers.append((index, "complexity", complexity.tobytes()))
+
+    # Offsets depend on the header length, so size the header with placeholder offsets first
+    def place(start):
+        offset = start
+        for index, name, data in layers:
+            offset = -(-offset // ALIGN) * ALIGN
+            header["levels"][index]["layers"][name] = {"offset": offset, "nbytes": len(data)}
+            offset += len(data)
+
+    place(0)
+    head = json.dumps(header).encode("utf-8")
+    data_start = -(-(len(MAGIC) + HEADER_LEN.size + len(head) + 64) // ALIGN) * ALIGN
+    place(data_start)
+    head = json.dumps(header).encode("utf-8")
+    assert len(MAGIC) + HEADER_LEN.size + len(head) <= data_start
+
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(MAGIC + HEADER_LEN.pack(len(head)) + head)
+        for index, name, data in layers:
+            f.seek(header["levels"][index]["layers"][name]["offset"])
+            f.write(data)
+    os.replace(temp, path)  # Never leave a half-written bundle where the game looks for it
+    return path
+
+
+class StoryBundle:
+    """Read-only view of a story bundle; layers are served straight from the mapping"""
+    def __init__(self, path=BUNDLE_PATH):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a story bundle")
+            (length,) = HEADER_LEN.unpack_from(self.map, len(MAGIC))
+            start = len(MAGIC) + HEADER_LEN.size
+            self.header = json.loads(self.map[start:start + length])
+            if self.header.get("version") != VERSION:
+                raise ValueError(f"{path} has unsupported version {self.header.get('version')}")
+        except Exception:
+            self.close()
+            raise
+        self.levels = self.header["levels"]
+        self.view = memoryview(self.map)
+
+    def layer(self, index, name):
+        entry = self.levels[index]["layers"].get(name)
+        if entry is None:
+            return None
+        return self.view[entry["offset"]:entry["offset"] + entry["nbytes"]]
+
+    def image(self, index, name="image"):
+        """An RGBA image over the mapped bytes (read-only; PIL copies on first write)"""
+        data = self.layer(index, name)
+        if data is None:
+            return None
+        return Image.frombuffer("RGBA", tuple(self.levels[index]["size"]), data, "raw", "RGBA", 0, 1)
+
+    def blurred(self, index, blur_level):
+        return self.image(index, f"blur_{blur_level}")
+
+    def complexity(self, index):
+        data = self.layer(index, "complexity")
+        width, height = self.levels[index]["size"]
+        return np.frombuffer(data, dtype="<f8").reshape(height, width)
+
+    def matches(self, levels):
+        """True when the bundle was built from these levels and their current image files"""
+        if len(levels) != len(self.levels):
+            return False
+        for level, entry in zip(levels, self.levels):
+            source = entry["source"]
+            if level != entry["meta"] or level["image_data"] != source["file"]:
+                return False
+            if not os.path.exists(source["file"]) or os.path.getsize(source["file"]) != source["size"]:
+                return False
+            if file_digest(source["file"]) != source["sha1"]:
+                return False
+        return True
+
+    def close(self):
+        self.view = None
+        if getattr(self, "map", None) is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # Images still point into it; the mapping goes away with them
+        self.file.close()
+
+
+def open_bundle(levels, path=BUNDLE_PATH):
+    """The bundle for these levels, or None when it is missing, unreadable or out of date"""
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = StoryBundle(path)
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring story bundle: %s", e)
+        return None
+    if not bundle.matches(levels):
+        log.warning("Ignoring story bundle: %s is out of date, rebuild it with story_bundle.py", path)
+        bundle.close()
+        return None
+    log.debug("Opened story bundle", extra={"fields": {"path": path, "levels": len(bundle.levels)}})
+    return bundle
+
+
+def main():
+    from StoryImages_Class import StoryImages
+    parser = argparse.ArgumentParser(description="Build the memory-mapped story asset bundle")
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    args = parser.parse_args()
+    path = build_bundle(StoryImages().story_levels, args.output)
+    print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()